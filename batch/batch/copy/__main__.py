@@ -3,7 +3,7 @@ import sys
 import json
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from hailtop.aiotools.fs import RouterAsyncFS, LocalAsyncFS, Transfer
+from hailtop.aiotools.fs import RouterAsyncFS, LocalAsyncFS, Transfer, CopyTuner
 from hailtop.aiogoogle import GoogleStorageAsyncFS
 
 
@@ -14,9 +14,11 @@ async def copy(requester_pays_project: Optional[str], transfer: Union[Transfer,
         params = None
     with ThreadPoolExecutor() as thread_pool:
         async with RouterAsyncFS('file', [LocalAsyncFS(thread_pool), GoogleStorageAsyncFS(params=params)]) as fs:
-            sema = asyncio.Semaphore(50)
+            # the tuner bounds the concurrent reads and writes, the
+            # semaphore only the tasks listing and scheduling them
+            sema = asyncio.Semaphore(CopyTuner.MAX_PARALLELISM)
             async with sema:
-                copy_report = await fs.copy(sema, transfer)
+                copy_report = await fs.copy(sema, transfer, sync=True, tuner=CopyTuner())
                 copy_report.summarize()
 
 
@@ -5,6 +5,7 @@ from . import methods_benchmarks
 from . import linalg_benchmarks
 from . import shuffle_benchmarks
 from . import combiner_benchmarks
+from . import python_benchmarks
 
 __all__ = [
     'run_all',
@@ -16,4 +17,5 @@ __all__ = [
     'linalg_benchmarks',
     'methods_benchmarks',
     'shuffle_benchmarks',
-    'combiner_benchmarks']
+    'combiner_benchmarks',
+    'python_benchmarks']
@@ -0,0 +1,17 @@
+import subprocess
+import sys
+
+from .utils import benchmark
+
+
+@benchmark()
+def import_hail():
+    # a fresh interpreter, as in short-lived jobs that only import hail
+    subprocess.run([sys.executable, '-c', 'import hail'], check=True)
+
+
+@benchmark()
+def import_hail_and_build_expressions():
+    subprocess.run([sys.executable, '-c',
+                    'import hail as hl; hl.agg.count(); hl.struct(a=hl.range(10).map(lambda x: x * 2))'],
+                   check=True)
@@ -20,6 +20,25 @@ else:
 
 __pip_version__ = pkg_resources.resource_string(__name__, 'hail_pip_version').decode().strip()
 del pkg_resources
+
+# Submodules that are slow to import, pulling in scipy, pandas or bokeh, and
+# that most pipelines do not need are imported on first attribute access.
+_lazy_submodules = frozenset(['stats', 'linalg', 'plot', 'experimental'])
+
+
+def __getattr__(name):
+    if name in _lazy_submodules:
+        import importlib
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    # set and sorted are shadowed by the expression functions below; dir sorts
+    return frozenset(globals()) | _lazy_submodules
+
+
+_eager_submodules = sys.version_info < (3, 7)  # module __getattr__ (PEP 562) is new in 3.7
 del sys
 
 __doc__ = r"""
@@ -49,20 +68,21 @@ from .methods import *  # noqa: F401,F403,E402
 from . import expr  # noqa: E402
 from . import genetics  # noqa: E402
 from . import methods  # noqa: E402
-from . import stats  # noqa: E402
-from . import linalg  # noqa: E402
-from . import plot  # noqa: E402
-from . import experimental  # noqa: E402
 from . import ir  # noqa: E402
 from . import backend  # noqa: E402
 from . import nd  # noqa: E402
+from .profiling import profile, Profiler  # noqa: E402
+
+if _eager_submodules:
+    from . import stats, linalg, plot, experimental  # noqa: F401,E402
+del _eager_submodules
 from hail.expr import aggregators as agg  # noqa: E402
 from hail.utils import (Struct, Interval, hadoop_copy, hadoop_open, hadoop_ls,  # noqa: E402
                         hadoop_stat, hadoop_exists, hadoop_is_file,
                         hadoop_is_dir, copy_log)
 
 from .context import (init, init_local, stop, spark_context, tmp_dir, default_reference,  # noqa: E402
-                      get_reference, set_global_seed, _set_flags, _get_flags, current_backend,
+                      get_reference, set_global_seed, _set_flags, _get_flags, _set_result_cache, current_backend,
                       debug_info, citation, cite_hail, cite_hail_bibtex, version, TemporaryFilename,
                       TemporaryDirectory)
 
@@ -81,6 +101,9 @@ __all__ = [
     'set_global_seed',
     '_set_flags',
     '_get_flags',
+    '_set_result_cache',
+    'profile',
+    'Profiler',
     'Table',
     'GroupedTable',
     'MatrixTable',
@@ -125,9 +148,6 @@ import builtins  # noqa: E402
 __all__.extend([x for x in expr.__all__ if not hasattr(builtins, x)])
 del builtins
 
-ir.register_functions()
-ir.register_aggregators()
-
 __version__ = None  # set in hail.init()
 
 import warnings  # noqa: E402
@@ -1,26 +1,91 @@
 import abc
+from .. import profiling
 from ..fs.fs import FS
 
 
 class Backend(abc.ABC):
+    # Types of table, matrix and block matrix IR computed by the backend, keyed
+    # on the IR. Only readers of external data need the backend to compute
+    # their types, and those may change when files are written, so the cache
+    # is cleared whenever the backend executes a query.
+    _type_cache = None
+
+    # Optional on-disk cache of query results, see
+    # :class:`.result_cache.ResultCache`.
+    _result_cache = None
+
     @abc.abstractmethod
     def stop(self):
         pass
 
-    @abc.abstractmethod
     def execute(self, ir, timed=False):
+        with profiling.phase('execute', ir=ir):
+            key, found, value = self._lookup_result(ir, timed)
+            if not found:
+                value = self._execute(ir, timed)
+                self._store_result(key, ir, value)
+            return value
+
+    def _lookup_result(self, ir, timed):
+        """Look up the result of `ir` in the result cache.
+
+        Returns the cache key, ``None`` if the result is not to be cached,
+        whether the result was found, and the result.
+        """
+        cache = self._result_cache
+        if cache is None or timed:
+            return None, False, None
+        with profiling.phase('result_cache_lookup'):
+            key = cache.key(ir, self.fs)
+            found, value = (False, None) if key is None else cache.get(key, ir.typ)
+        return key, found, value
+
+    def _store_result(self, key, ir, value):
+        if key is not None:
+            self._result_cache.put(key, ir.typ, value)
+
+    @abc.abstractmethod
+    def _execute(self, ir, timed=False):
         pass
 
     @abc.abstractmethod
     def value_type(self, ir):
         pass
 
-    @abc.abstractmethod
     def table_type(self, tir):
+        return self._cached_type(tir, self._table_type)
+
+    def matrix_type(self, mir):
+        return self._cached_type(mir, self._matrix_type)
+
+    def blockmatrix_type(self, bmir):
+        return self._cached_type(bmir, self._blockmatrix_type)
+
+    def _cached_type(self, ir, compute):
+        # another thread may clear the cache meanwhile, so hold on to this one
+        cache = self._type_cache
+        if cache is None:
+            cache = self._type_cache = {}
+        typ = cache.get(ir)
+        if typ is None:
+            with profiling.phase('type', ir=ir):
+                typ = compute(ir)
+            cache[ir] = typ
+        return typ
+
+    def _clear_type_cache(self):
+        self._type_cache = None
+
+    @abc.abstractmethod
+    def _table_type(self, tir):
         pass
 
     @abc.abstractmethod
-    def matrix_type(self, mir):
+    def _matrix_type(self, mir):
+        pass
+
+    @abc.abstractmethod
+    def _blockmatrix_type(self, bmir):
         pass
 
     @abc.abstractmethod
@@ -17,6 +17,7 @@ from hail.ir import JavaIR
 from hail.ir.renderer import CSERenderer
 from hail.utils.java import scala_package_object, scala_object
 from .py4j_backend import Py4JBackend, handle_java_exception
+from .. import profiling
 from ..fs.local_fs import LocalFS
 from ..hail_logging import Logger
 from hailtop.utils import find_spark_home
@@ -114,7 +115,7 @@ class Log4jLogger(Logger):
 
 class LocalBackend(Py4JBackend):
     def __init__(self, tmpdir, log, quiet, append, branching_factor,
-                 skip_logging_configuration, optimizer_iterations):
+                 skip_logging_configuration, optimizer_iterations, binary_transport=False):
         spark_home = find_spark_home()
         hail_jar_path = os.environ.get('HAIL_JAR')
         if hail_jar_path is None:
@@ -157,6 +158,7 @@ class LocalBackend(Py4JBackend):
 
         self._fs = LocalFS()
         self._logger = None
+        self._binary_transport = binary_transport
 
         if not quiet:
             connect_logger(self._utils_package_object, 'localhost', 12888)
@@ -173,6 +175,7 @@ class LocalBackend(Py4JBackend):
     def stop(self):
         self._jhc.stop()
         self._jhc = None
+        self._fs.close()
         # FIXME stop gateway?
         uninstall_exception_handler()
 
@@ -204,8 +207,11 @@ class LocalBackend(Py4JBackend):
     def _to_java_ir(self, ir, parse):
         if not hasattr(ir, '_jir'):
             r = CSERenderer(stop_at_jir=True)
-            # FIXME parse should be static
-            ir._jir = parse(r(ir), ir_map=r.jirs)
+            with profiling.phase('render', ir=ir):
+                code = r(ir)
+            with profiling.phase('parse', code_size=len(code)):
+                # FIXME parse should be static
+                ir._jir = parse(code, ir_map=r.jirs)
         return ir._jir
 
     def _to_java_value_ir(self, ir):
@@ -224,15 +230,15 @@ class LocalBackend(Py4JBackend):
         jir = self._to_java_value_ir(ir)
         return dtype(jir.typ().toString())
 
-    def table_type(self, tir):
+    def _table_type(self, tir):
         jir = self._to_java_table_ir(tir)
         return ttable._from_java(jir.typ())
 
-    def matrix_type(self, mir):
+    def _matrix_type(self, mir):
         jir = self._to_java_matrix_ir(mir)
         return tmatrix._from_java(jir.typ())
 
-    def blockmatrix_type(self, bmir):
+    def _blockmatrix_type(self, bmir):
         jir = self._to_java_blockmatrix_ir(bmir)
         return tblockmatrix._from_java(jir.typ())
 
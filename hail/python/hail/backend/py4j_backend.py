@@ -4,8 +4,11 @@ import json
 import py4j
 
 import hail
+from hail.expr.binary_decoder import DEFAULT_BUFFER_SPEC, decode_result
+from hail.expr.types import tvoid
 from hail.ir.renderer import CSERenderer
 from hail.utils.java import FatalError, Env, HailUserError
+from hail import profiling
 from .backend import Backend
 
 
@@ -39,6 +42,10 @@ def handle_java_exception(f):
 
 
 class Py4JBackend(Backend):
+    # when set, results are returned from the JVM in Hail's binary encoding
+    # instead of as JSON
+    _binary_transport = False
+
     @abc.abstractmethod
     def jvm(self):
         pass
@@ -67,13 +74,25 @@ class Py4JBackend(Backend):
             return_type._parsable_string(),
             jbody)
 
-    def execute(self, ir, timed=False):
+    def _execute(self, ir, timed=False):
+        self._clear_type_cache()
         jir = self._to_java_value_ir(ir)
         # print(self._hail_package.expr.ir.Pretty.apply(jir, True, -1))
         try:
-            result = json.loads(self._jhc.backend().executeJSON(jir))
-            value = ir.typ._from_json(result['value'])
-            timings = result['timings']
+            if self._binary_transport and ir.typ != tvoid:
+                with profiling.phase('jvm') as span:
+                    result = self._jhc.backend().executeEncode(jir, DEFAULT_BUFFER_SPEC)
+                    timings = json.loads(result._3())
+                with profiling.phase('decode', bytes=len(result._2())):
+                    value = decode_result(ir.typ, result._1(), result._2())
+            else:
+                with profiling.phase('jvm') as span:
+                    result = json.loads(self._jhc.backend().executeJSON(jir))
+                    timings = result['timings']
+                with profiling.phase('decode'):
+                    value = ir.typ._from_json(result['value'])
+            if span is not None:
+                span.args['jvm_timings'] = timings
 
             return (value, timings) if timed else value
         except FatalError as e:
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+from typing import Optional, Tuple, Any
+
+from hail.expr.types import tvoid
+from hail.ir import TableRead, MatrixRead, BlockMatrixRead, JavaIR, JavaTable, JavaMatrix, \
+    JavaMatrixVectorRef, JavaBlockMatrix
+from hail.ir.blockmatrix_reader import BlockMatrixPersistReader
+
+_session_local_irs = (JavaIR, JavaTable, JavaMatrix, JavaMatrixVectorRef, JavaBlockMatrix)
+_read_irs = (TableRead, MatrixRead, BlockMatrixRead)
+
+
+class ResultCache(object):
+    """On-disk cache of query results.
+
+    Entries are keyed on the rendered query together with the path, size and
+    modification time of every file or directory it reads, so a result is
+    recomputed whenever one of its inputs is rewritten. Queries with side
+    effects, queries referring to objects that only live in the current
+    session, and queries whose inputs cannot be listed are never cached.
+
+    Results are stored as JSON, one file per entry. When the cache grows
+    beyond `max_bytes`, the least recently used entries are removed.
+
+    Parameters
+    ----------
+    directory : :class:`str`
+        Local directory holding the cache. Created if it does not exist.
+    max_bytes : :obj:`int`
+        Upper bound on the total size of the cached results.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError(f'result cache size must be positive, found {max_bytes}')
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, ir, fs) -> Optional[str]:
+        """Cache key of `ir`, or ``None`` if its result must not be cached."""
+        if ir.typ == tvoid:
+            return None
+        paths = set()
+        for node in ir.base_search(lambda _: True):
+            if node.is_effectful() or isinstance(node, _session_local_irs):
+                return None
+            if isinstance(node, _read_irs):
+                if isinstance(node.reader, BlockMatrixPersistReader):
+                    return None
+                node_paths = node.reader._input_paths()
+                if node_paths is None:
+                    return None
+                paths.update(node_paths)
+        fingerprints = []
+        for path in sorted(paths):
+            fingerprint = _fingerprint(fs, path)
+            if fingerprint is None:
+                return None
+            fingerprints.append(fingerprint)
+        h = hashlib.sha256()
+        h.update(str(ir).encode('utf-8'))
+        h.update(ir.typ._parsable_string().encode('utf-8'))
+        h.update(json.dumps(fingerprints).encode('utf-8'))
+        return h.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key: str, typ) -> Tuple[bool, Any]:
+        """Look up `key`, returning whether it was found and the cached value
+        of type `typ`."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return False, None
+        if entry.get('type') != typ._parsable_string():
+            self.misses += 1
+            return False, None
+        os.utime(path)
+        self.hits += 1
+        return True, typ._convert_from_json_na(entry['value'])
+
+    def put(self, key: str, typ, value):
+        try:
+            data = json.dumps({'type': typ._parsable_string(),
+                               'value': typ._convert_to_json_na(value)})
+        except (TypeError, ValueError):
+            return
+        if len(data) > self.max_bytes:
+            return
+        path = self._entry_path(key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.name.endswith('.json'):
+                    st = e.stat()
+                    entries.append((st.st_mtime, st.st_size, e.path))
+                    total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.name.endswith('.json'):
+                    os.remove(e.path)
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses}
+
+
+def _fingerprint(fs, path):
+    try:
+        stat = fs.stat(path)
+        fingerprint = [[stat['path'], stat['size_bytes'], stat['modification_time']]]
+        if stat['is_dir']:
+            fingerprint.extend(sorted([e['path'], e['size_bytes'], e['modification_time']]
+                                      for e in fs.ls(path)))
+    except Exception:  # pylint: disable=broad-except
+        # globs and missing files
+        return None
+    return fingerprint
@@ -1,4 +1,5 @@
 from typing import Optional
+import asyncio
 import os
 import aiohttp
 import json
@@ -12,10 +13,12 @@ from hail.expr.blockmatrix_type import tblockmatrix
 
 from hailtop.config import get_deploy_config, get_user_config, DeployConfig
 from hailtop.auth import service_auth_headers
-from hailtop.utils import async_to_blocking, retry_transient_errors, secret_alnum_string, TransientError
-from hail.ir.renderer import CSERenderer
+from hailtop.utils import (async_to_blocking, bounded_gather2, retry_transient_errors,
+                           secret_alnum_string, TransientError)
+from hail.ir.renderer import CSERenderer, RenderCache
 
 from .backend import Backend
+from .. import profiling
 from ..hail_logging import PythonOnlyLogger
 from ..fs.google_fs import GoogleCloudStorageFS
 
@@ -66,8 +69,11 @@ class ServiceSocket:
                 raise FatalError(f'Error from server: {result["value"]}')
             return result['value']
 
+    async def async_request_with_retries(self, endpoint, **data):
+        return await retry_transient_errors(self.async_request, endpoint, **data)
+
     def request(self, endpoint, **data):
-        return async_to_blocking(retry_transient_errors(self.async_request, endpoint, **data))
+        return async_to_blocking(self.async_request_with_retries(endpoint, **data))
 
 
 class ServiceBackend(Backend):
@@ -100,6 +106,7 @@ class ServiceBackend(Backend):
         self._logger = PythonOnlyLogger(skip_logging_configuration)
 
         self.socket = ServiceSocket(deploy_config=deploy_config)
+        self._render_cache = RenderCache()
 
     @property
     def logger(self):
@@ -114,45 +121,98 @@ class ServiceBackend(Backend):
 
     def stop(self):
         self.socket.close()
+        self._render_cache.clear()
+        if self._fs is not None:
+            self._fs.close()
+            self._fs = None
 
     def _render(self, ir):
-        r = CSERenderer()
+        r = CSERenderer(cache=self._render_cache)
         assert len(r.jirs) == 0
         return r(ir)
 
-    def execute(self, ir, timed=False):
-        resp = self.socket.request('execute',
-                                   code=self._render(ir),
-                                   billing_project=self._billing_project,
-                                   bucket=self._bucket)
+    def _execute(self, ir, timed=False):
+        return async_to_blocking(self._execute_async(ir, timed))
+
+    async def execute_async(self, ir, timed=False):
+        """Asynchronous :meth:`execute`, sharing its result cache."""
+        with profiling.phase('execute', ir=ir):
+            key, found, value = self._lookup_result(ir, timed)
+            if not found:
+                value = await self._execute_async(ir, timed)
+                self._store_result(key, ir, value)
+            return value
+
+    async def _execute_async(self, ir, timed=False):
+        self._clear_type_cache()
+        with profiling.phase('render', ir=ir):
+            code = self._render(ir)
+        with profiling.phase('request', code_size=len(code)):
+            resp = await self.socket.async_request_with_retries(
+                'execute',
+                code=code,
+                billing_project=self._billing_project,
+                bucket=self._bucket)
         typ = dtype(resp['type'])
         if typ == tvoid:
             value = None
         else:
-            value = typ._convert_from_json_na(resp['value'])
+            with profiling.phase('decode'):
+                value = typ._convert_from_json_na(resp['value'])
         # FIXME put back timings
 
         return (value, None) if timed else value
 
-    def _request_type(self, ir, kind):
+    def execute_many(self, irs, timed=False, parallelism=10):
+        """Execute several independent queries concurrently.
+
+        Results are returned in the order of `irs`. At most `parallelism`
+        requests are in flight at once, sharing the socket's HTTP session.
+        """
+        return async_to_blocking(self.execute_many_async(irs, timed, parallelism))
+
+    async def execute_many_async(self, irs, timed=False, parallelism=10):
+        sema = asyncio.Semaphore(parallelism)
+        return await bounded_gather2(sema, *[self.execute_async(ir, timed) for ir in irs],
+                                     cancel_on_error=True)
+
+    async def _request_type_async(self, ir, kind):
         code = self._render(ir)
-        return self.socket.request(f'type/{kind}', code=code)
+        return await self.socket.async_request_with_retries(f'type/{kind}', code=code)
+
+    async def _cached_type_async(self, ir, kind, from_json):
+        cache = self._type_cache
+        if cache is None:
+            cache = self._type_cache = {}
+        if ir in cache:
+            return cache[ir]
+        typ = from_json(await self._request_type_async(ir, kind))
+        cache[ir] = typ
+        return typ
 
     def value_type(self, ir):
-        resp = self._request_type(ir, 'value')
-        return dtype(resp)
+        return async_to_blocking(self.value_type_async(ir))
+
+    async def value_type_async(self, ir):
+        return dtype(await self._request_type_async(ir, 'value'))
+
+    def _table_type(self, tir):
+        return async_to_blocking(self._cached_type_async(tir, 'table', ttable._from_json))
+
+    async def table_type_async(self, tir):
+        return await self._cached_type_async(tir, 'table', ttable._from_json)
+
+    def _matrix_type(self, mir):
+        return async_to_blocking(self._cached_type_async(mir, 'matrix', tmatrix._from_json))
 
-    def table_type(self, tir):
-        resp = self._request_type(tir, 'table')
-        return ttable._from_json(resp)
+    async def matrix_type_async(self, mir):
+        return await self._cached_type_async(mir, 'matrix', tmatrix._from_json)
 
-    def matrix_type(self, mir):
-        resp = self._request_type(mir, 'matrix')
-        return tmatrix._from_json(resp)
+    def _blockmatrix_type(self, bmir):
+        return async_to_blocking(self._cached_type_async(bmir, 'blockmatrix', tblockmatrix._from_json))
 
-    def blockmatrix_type(self, bmir):
-        resp = self._request_type(bmir, 'blockmatrix')
-        return tblockmatrix._from_json(resp)
+    async def blockmatrix_type_async(self, bmir):
+        return await self._cached_type_async(bmir, 'blockmatrix', tblockmatrix._from_json)
 
     def add_reference(self, config):
         raise NotImplementedError("ServiceBackend does not support 'add_reference'")
@@ -19,6 +19,7 @@ from hail.table import Table
 from hail.matrixtable import MatrixTable
 
 from .py4j_backend import Py4JBackend, handle_java_exception
+from .. import profiling
 from ..hail_logging import Logger
 
 
@@ -119,7 +120,8 @@ class Log4jLogger(Logger):
 class SparkBackend(Py4JBackend):
     def __init__(self, idempotent, sc, spark_conf, app_name, master,
                  local, log, quiet, append, min_block_size,
-                 branching_factor, tmpdir, local_tmpdir, skip_logging_configuration, optimizer_iterations):
+                 branching_factor, tmpdir, local_tmpdir, skip_logging_configuration, optimizer_iterations,
+                 binary_transport=False):
         if pkg_resources.resource_exists(__name__, "hail-all-spark.jar"):
             hail_jar_path = pkg_resources.resource_filename(__name__, "hail-all-spark.jar")
             assert os.path.exists(hail_jar_path), f'{hail_jar_path} does not exist'
@@ -196,6 +198,7 @@ class SparkBackend(Py4JBackend):
 
         self._fs = None
         self._logger = None
+        self._binary_transport = binary_transport
 
         if not quiet:
             sys.stderr.write('Running on Apache Spark version {}\n'.format(self.sc.version))
@@ -254,8 +257,11 @@ class SparkBackend(Py4JBackend):
     def _to_java_ir(self, ir, parse):
         if not hasattr(ir, '_jir'):
             r = CSERenderer(stop_at_jir=True)
-            # FIXME parse should be static
-            ir._jir = parse(r(ir), ir_map=r.jirs)
+            with profiling.phase('render', ir=ir):
+                code = r(ir)
+            with profiling.phase('parse', code_size=len(code)):
+                # FIXME parse should be static
+                ir._jir = parse(code, ir_map=r.jirs)
         return ir._jir
 
     def _to_java_value_ir(self, ir):
@@ -274,11 +280,11 @@ class SparkBackend(Py4JBackend):
         jir = self._to_java_value_ir(ir)
         return dtype(jir.typ().toString())
 
-    def table_type(self, tir):
+    def _table_type(self, tir):
         jir = self._to_java_table_ir(tir)
         return ttable._from_java(jir.typ())
 
-    def matrix_type(self, mir):
+    def _matrix_type(self, mir):
         jir = self._to_java_matrix_ir(mir)
         return tmatrix._from_java(jir.typ())
 
@@ -297,7 +303,7 @@ class SparkBackend(Py4JBackend):
     def unpersist_block_matrix(self, id):
         self._jhc.backend().unpersist(id)
 
-    def blockmatrix_type(self, bmir):
+    def _blockmatrix_type(self, bmir):
         jir = self._to_java_blockmatrix_ir(bmir)
         return tblockmatrix._from_java(jir.typ())
 
@@ -310,9 +316,6 @@ class SparkBackend(Py4JBackend):
             t = t.flatten()
         return pyspark.sql.DataFrame(self._jbackend.pyToDF(self._to_java_table_ir(t._tir)), Env.spark_session()._wrapped)
 
-    def to_pandas(self, t, flatten):
-        return self.to_spark(t, flatten).toPandas()
-
     def from_pandas(self, df, key):
         return Table.from_spark(Env.spark_session().createDataFrame(df), key)
 
@@ -8,7 +8,7 @@ from pyspark import SparkContext
 
 import hail
 from hail.genetics.reference_genome import ReferenceGenome
-from hail.typecheck import nullable, typecheck, typecheck_method, enumeration, dictof
+from hail.typecheck import nullable, typecheck, typecheck_method, enumeration, dictof, _set_typecheck_mode
 from hail.utils import get_env_or_default
 from hail.utils.java import Env, FatalError, warning
 from hail.backend import Backend
@@ -126,7 +126,9 @@ class HailContext(object):
            spark_conf=nullable(dictof(str, str)),
            skip_logging_configuration=bool,
            local_tmpdir=nullable(str),
-           _optimizer_iterations=nullable(int))
+           typecheck=enumeration('fast', 'off'),
+           _optimizer_iterations=nullable(int),
+           _binary_transport=bool)
 def init(sc=None, app_name='Hail', master=None, local='local[*]',
          log=None, quiet=False, append=False,
          min_block_size=0, branching_factor=50, tmp_dir=None,
@@ -135,7 +137,9 @@ def init(sc=None, app_name='Hail', master=None, local='local[*]',
          spark_conf=None,
          skip_logging_configuration=False,
          local_tmpdir=None,
-         _optimizer_iterations=None):
+         typecheck='fast',
+         _optimizer_iterations=None,
+         _binary_transport=False):
     """Initialize Hail and Spark.
 
     Examples
@@ -217,6 +221,13 @@ def init(sc=None, app_name='Hail', master=None, local='local[*]',
     local_tmpdir : :class:`str`, optional
         Local temporary directory.  Used on driver and executor nodes.
         Must use the file scheme.  Defaults to TMPDIR, or /tmp.
+    typecheck : :class:`str`
+        Argument checking of Hail functions and methods. ``'fast'`` checks
+        every argument. ``'off'`` skips checks that only validate arguments,
+        still converting arguments that need it, such as Python values passed
+        where expressions are expected. Invalid arguments may then fail later
+        and with less helpful errors, so only use ``'off'`` for pipelines
+        that are known to work.
     """
     if Env._hc:
         if idempotent:
@@ -225,6 +236,8 @@ def init(sc=None, app_name='Hail', master=None, local='local[*]',
             warning('Hail has already been initialized. If this call was intended to change configuration,'
                     ' close the session with hl.stop() first.')
 
+    _set_typecheck_mode(typecheck)
+
     if os.environ.get('HAIL_QUERY_BACKEND') == 'service':
         return init_service(
             log=log,
@@ -234,7 +247,8 @@ def init(sc=None, app_name='Hail', master=None, local='local[*]',
             local_tmpdir=local_tmpdir,
             default_reference=default_reference,
             global_seed=global_seed,
-            skip_logging_configuration=skip_logging_configuration)
+            skip_logging_configuration=skip_logging_configuration,
+            typecheck=typecheck)
 
     from hail.backend.spark_backend import SparkBackend
 
@@ -246,7 +260,7 @@ def init(sc=None, app_name='Hail', master=None, local='local[*]',
     backend = SparkBackend(
         idempotent, sc, spark_conf, app_name, master, local, log,
         quiet, append, min_block_size, branching_factor, tmpdir, local_tmpdir,
-        skip_logging_configuration, optimizer_iterations)
+        skip_logging_configuration, optimizer_iterations, _binary_transport)
 
     if not backend.fs.exists(tmpdir):
         backend.fs.mkdir(tmpdir)
@@ -266,7 +280,8 @@ def init(sc=None, app_name='Hail', master=None, local='local[*]',
     local_tmpdir=nullable(str),
     default_reference=enumeration('GRCh37', 'GRCh38', 'GRCm38', 'CanFam3'),
     global_seed=nullable(int),
-    skip_logging_configuration=bool)
+    skip_logging_configuration=bool,
+    typecheck=enumeration('fast', 'off'))
 def init_service(
         billing_project: str = None,
         bucket: str = None,
@@ -277,7 +292,9 @@ def init_service(
         local_tmpdir=None,
         default_reference='GRCh37',
         global_seed=6348563392232659379,
-        skip_logging_configuration=False):
+        skip_logging_configuration=False,
+        typecheck='fast'):
+    _set_typecheck_mode(typecheck)
     from hail.backend.service_backend import ServiceBackend
     backend = ServiceBackend(billing_project, bucket, skip_logging_configuration=skip_logging_configuration)
 
@@ -301,7 +318,9 @@ def init_service(
     default_reference=enumeration('GRCh37', 'GRCh38', 'GRCm38', 'CanFam3'),
     global_seed=nullable(int),
     skip_logging_configuration=bool,
-    _optimizer_iterations=nullable(int))
+    typecheck=enumeration('fast', 'off'),
+    _optimizer_iterations=nullable(int),
+    _binary_transport=bool)
 def init_local(
         log=None,
         quiet=False,
@@ -311,7 +330,10 @@ def init_local(
         default_reference='GRCh37',
         global_seed=6348563392232659379,
         skip_logging_configuration=False,
-        _optimizer_iterations=None):
+        typecheck='fast',
+        _optimizer_iterations=None,
+        _binary_transport=False):
+    _set_typecheck_mode(typecheck)
     from hail.backend.local_backend import LocalBackend
 
     log = _get_log(log)
@@ -320,7 +342,7 @@ def init_local(
 
     backend = LocalBackend(
         tmpdir, log, quiet, append, branching_factor,
-        skip_logging_configuration, optimizer_iterations)
+        skip_logging_configuration, optimizer_iterations, _binary_transport)
 
     if not backend.fs.exists(tmpdir):
         backend.fs.mkdir(tmpdir)
@@ -585,6 +607,24 @@ def _get_flags(*flags):
     return {flag: Env.backend()._jhc.flags().get(flag) for flag in flags}
 
 
+@typecheck(max_size=nullable(int), directory=nullable(str))
+def _set_result_cache(max_size, directory=None):
+    """Cache query results on local disk, up to `max_size` bytes.
+
+    Results are reused until one of the files read by the query changes.
+    `directory` defaults to ``hail-result-cache`` in the local temporary
+    directory. Pass ``None`` as `max_size` to disable the cache.
+    """
+    from hail.backend.result_cache import ResultCache
+    backend = Env.backend()
+    if max_size is None:
+        backend._result_cache = None
+        return
+    if directory is None:
+        directory = os.path.join(urlparse(Env.hc()._local_tmpdir).path, 'hail-result-cache')
+    backend._result_cache = ResultCache(directory, max_size)
+
+
 def debug_info():
     from hail.backend.spark_backend import SparkBackend
     hail_jar_path = None
@@ -23,6 +23,12 @@ def main():
                             'Affects how the genome is partitioned on input.')
     group.add_argument('--import-interval-size', type=int,
                        help='Interval size for partitioning the reference genome for GVCF import.')
+    group.add_argument('--density-intervals', action='store_true',
+                       help='Partition the reference genome for GVCF import by the density of records '
+                            'in a sample of the GVCFs.')
+    group.add_argument('--existing-mt',
+                       help='Sparse matrix table written by the combiner to add the samples in the sample map to. '
+                            'The GVCFs are partitioned like it.')
     parser.add_argument('--log', help='Hail log path.')
     parser.add_argument('--header',
                         help='External header, must be readable by all executors. '
@@ -35,27 +41,43 @@ def main():
     parser.add_argument('--overwrite', help='overwrite the output path', action='store_true')
     parser.add_argument('--key-by-locus-and-alleles', help='Key by both locus and alleles in the final output.', action='store_true')
     parser.add_argument('--reference-genome', default='GRCh38', help='Reference genome.')
+    parser.add_argument('--resume', action='store_true',
+                        help='Record progress under tmp_path and continue a previous run with the same arguments.')
+    parser.add_argument('--max-concurrent-jobs', type=int, default=1,
+                        help='Maximum number of jobs of a phase to run at the same time.')
+    parser.add_argument('--balance-plan', action='store_true',
+                        help='Treat the branch factor and batch size as upper bounds and even out merge and job sizes.')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the plan and predicted partition sizes without combining.')
     args = parser.parse_args()
     hl.init(log=args.log)
 
-    if not args.overwrite and hl.utils.hadoop_exists(args.out_file):
+    if not args.overwrite and not args.resume and not args.dry_run and hl.utils.hadoop_exists(args.out_file):
         raise FileExistsError(f"path '{args.out_file}' already exists, use --overwrite to overwrite this path")
 
     sample_names, sample_paths = parse_sample_mapping(args.sample_map)
-    run_combiner(sample_paths,
-                 args.out_file,
-                 args.tmp_path,
-                 header=args.header,
-                 sample_names=sample_names,
-                 batch_size=args.batch_size,
-                 branch_factor=args.branch_factor,
-                 target_records=args.target_records,
-                 import_interval_size=args.import_interval_size,
-                 use_genome_default_intervals=args.genomes,
-                 use_exome_default_intervals=args.exomes,
-                 overwrite=args.overwrite,
-                 reference_genome=args.reference_genome,
-                 key_by_locus_and_alleles=args.key_by_locus_and_alleles)
+    report = run_combiner(sample_paths,
+                          args.out_file,
+                          args.tmp_path,
+                          header=args.header,
+                          sample_names=sample_names,
+                          batch_size=args.batch_size,
+                          branch_factor=args.branch_factor,
+                          target_records=args.target_records,
+                          import_interval_size=args.import_interval_size,
+                          use_genome_default_intervals=args.genomes,
+                          use_exome_default_intervals=args.exomes,
+                          use_density_intervals=args.density_intervals,
+                          overwrite=args.overwrite,
+                          reference_genome=args.reference_genome,
+                          key_by_locus_and_alleles=args.key_by_locus_and_alleles,
+                          resume=args.resume,
+                          max_concurrent_jobs=args.max_concurrent_jobs,
+                          balance_plan=args.balance_plan,
+                          dry_run=args.dry_run,
+                          existing_mt=args.existing_mt)
+    if report is not None:
+        print(report)
 
 
 if __name__ == '__main__':
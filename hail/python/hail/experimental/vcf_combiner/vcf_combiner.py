@@ -1,7 +1,13 @@
 """An experimental library for combining (g)VCFS into sparse matrix tables"""
 # these are necessary for the diver script included at the end of this file
+import gzip
+import hashlib
+import json
 import math
+import os
+import random
 import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Optional, List, Tuple, Dict
 
 import hail as hl
@@ -10,8 +16,8 @@ from hail.expr import StructExpression
 from hail.expr.expressions import expr_bool, expr_str
 from hail.genetics.reference_genome import reference_genome_type
 from hail.ir import Apply, TableMapRows, MatrixKeyRowsBy, TopLevelReference
-from hail.typecheck import oneof, sequenceof, typecheck
-from hail.utils.java import info, warning
+from hail.typecheck import oneof, sequenceof, typecheck, nullable, dictof
+from hail.utils.java import Env, info, warning
 
 _transform_rows_function_map = {}
 _merge_function_map = {}
@@ -378,21 +384,228 @@ def calculate_even_genome_partitioning(reference_genome, interval_size) -> List[
 
         return intervals
 
+    intervals = []
+    for ctg in _combiner_contigs(reference_genome):
+        intervals.extend(calc_parts(ctg))
+    return intervals
+
+
+def _combiner_contigs(reference_genome) -> List[str]:
     if reference_genome.name == 'GRCh37':
-        contigs = [f'{i}' for i in range(1, 23)] + ['X', 'Y', 'MT']
+        return [f'{i}' for i in range(1, 23)] + ['X', 'Y', 'MT']
     elif reference_genome.name == 'GRCh38':
-        contigs = [f'chr{i}' for i in range(1, 23)] + ['chrX', 'chrY', 'chrM']
+        return [f'chr{i}' for i in range(1, 23)] + ['chrX', 'chrY', 'chrM']
     else:
         raise ValueError(
             f"Unsupported reference genome '{reference_genome.name}', "
             "only 'GRCh37' and 'GRCh38' are supported")
 
+
+class GVCFDensity(object):
+    """Estimated number of records per GVCF in each bin of `bin_size` bases,
+    as computed by :func:`.sample_gvcf_density`.
+
+    `counts` maps each contig to a list of record counts, one per bin.
+    """
+
+    def __init__(self, bin_size: int, counts: Dict[str, List[float]]):
+        self.bin_size = bin_size
+        self.counts = counts
+
+    def records(self, contig: str, start: int, end: int) -> float:
+        """Estimated number of records per GVCF between positions `start` and
+        `end` of `contig`, inclusive."""
+        bins = self.counts.get(contig)
+        if not bins:
+            return 0.0
+        total = 0.0
+        first = (start - 1) // self.bin_size
+        last = (end - 1) // self.bin_size
+        for b in range(first, min(last, len(bins) - 1) + 1):
+            bin_start = b * self.bin_size + 1
+            bin_end = bin_start + self.bin_size - 1
+            overlap = min(end, bin_end) - max(start, bin_start) + 1
+            total += bins[b] * overlap / self.bin_size
+        return total
+
+
+@typecheck(sample_paths=sequenceof(str),
+           reference_genome=reference_genome_type,
+           n_samples=int,
+           bin_size=int,
+           contig_recoding=nullable(dictof(str, str)),
+           header=nullable(str),
+           sample_names=nullable(sequenceof(str)),
+           seed=int)
+def sample_gvcf_density(sample_paths, reference_genome, n_samples=5, bin_size=100_000,
+                        contig_recoding=None, header=None, sample_names=None, seed=0) -> GVCFDensity:
+    """Estimate the number of records per GVCF along the genome from a random
+    sample of the inputs.
+
+    The record counts of the sampled GVCFs are averaged and scaled by the
+    ratio between the mean file size of all inputs and that of the sampled
+    ones, as the number of records in a GVCF is roughly proportional to its
+    size.
+
+    Parameters
+    ----------
+    sample_paths : :obj:`list` of :class:`str`
+        Paths to all input GVCFs.
+    reference_genome: :class:`str` or :class:`.ReferenceGenome`
+        Reference genome of the GVCFs.
+    n_samples : :obj:`int`
+        Number of GVCFs to read.
+    bin_size : :obj:`int`
+        Number of bases in each bin.
+    contig_recoding: :obj:`dict` of (:class:`str`, :obj:`str`), optional
+        Mapping from contig name in gVCFs to contig name the reference genome.
+    header : :class:`str` or None
+        External header file to use as GVCF header for all inputs. If defined, `sample_names` must be defined as well.
+    sample_names: list of :class:`str` or None
+        Sample names, to be used with `header`.
+    seed : :obj:`int`
+        Seed for choosing the sampled GVCFs.
+
+    Returns
+    -------
+    :class:`.GVCFDensity`
+    """
+    if header is not None:
+        assert sample_names is not None
+        assert len(sample_names) == len(sample_paths)
+    rng = random.Random(seed)
+    sampled = sorted(rng.sample(range(len(sample_paths)), min(n_samples, len(sample_paths))))
+    sizes = [s['size_bytes'] for s in Env.fs().stat_many(sample_paths)]
+    mean_size = sum(sizes) / len(sizes)
+    sampled_mean_size = sum(sizes[i] for i in sampled) / len(sampled)
+    scale = mean_size / sampled_mean_size / len(sampled) if sampled_mean_size > 0 else 0.0
+
+    import_intervals = calculate_even_genome_partitioning(reference_genome,
+                                                          CombinerConfig.default_genome_interval_size)
+    mts = hl.import_gvcfs([sample_paths[i] for i in sampled], import_intervals,
+                          reference_genome=reference_genome, contig_recoding=contig_recoding,
+                          array_elements_required=False,
+                          _external_header=header,
+                          _external_sample_ids=[[sample_names[i]] for i in sampled] if header is not None else None)
+    counts = {contig: [0.0] * ((reference_genome.lengths[contig] - 1) // bin_size + 1)
+              for contig in _combiner_contigs(reference_genome)}
+    for mt in mts:
+        rows = mt.rows()
+        bin_counts = rows.aggregate(hl.agg.counter(
+            hl.tuple([rows.locus.contig, (rows.locus.position - 1) // bin_size])))
+        for (contig, b), n in bin_counts.items():
+            if contig in counts:
+                counts[contig][b] += n * scale
+    return GVCFDensity(bin_size, counts)
+
+
+@typecheck(density=GVCFDensity, target_records=int, reference_genome=reference_genome_type)
+def calculate_density_intervals(density, target_records, reference_genome) -> List[hl.utils.Interval]:
+    """Create a list of locus intervals for importing GVCFs, each holding about
+    `target_records` records per GVCF according to `density`.
+
+    Unlike :func:`.calculate_even_genome_partitioning`, intervals are short
+    where records are dense, such as in exons, and long where they are sparse,
+    so the partitions take similar amounts of work.
+
+    Parameters
+    ----------
+    density : :class:`.GVCFDensity`
+        Density of records, from :func:`.sample_gvcf_density`.
+    target_records : :obj:`int`
+        Target number of records per GVCF in each interval.
+    reference_genome: :class:`str` or :class:`.ReferenceGenome`,
+        Reference genome to use. NOTE: only GRCh37 and GRCh38 references
+        are supported.
+
+    Returns
+    -------
+    :obj:`List[Interval]`
+    """
+    def locus_interval(contig, start, end):
+        return hl.Interval(
+            start=hl.Locus(contig=contig, position=start, reference_genome=reference_genome),
+            end=hl.Locus(contig=contig, position=end, reference_genome=reference_genome),
+            includes_end=True)
+
     intervals = []
-    for ctg in contigs:
-        intervals.extend(calc_parts(ctg))
+    for contig in _combiner_contigs(reference_genome):
+        contig_length = reference_genome.lengths[contig]
+        bins = density.counts.get(contig, [])
+        start = 1
+        records = 0.0
+        for b, n in enumerate(bins):
+            records += n
+            end = min((b + 1) * density.bin_size, contig_length)
+            if records >= target_records and end < contig_length:
+                intervals.append(locus_interval(contig, start, end))
+                start = end + 1
+                records = 0.0
+        intervals.append(locus_interval(contig, start, contig_length))
     return intervals
 
 
+@typecheck(path=str, reference_genome=reference_genome_type)
+def calculate_existing_intervals(path, reference_genome) -> List[hl.utils.Interval]:
+    """Create a list of locus intervals matching the partitioning of the
+    sparse matrix table at `path`.
+
+    The intervals cover the whole reference genome. Each one runs from the
+    first locus of a partition to the first locus of the next, so GVCFs
+    imported with them are partitioned like the matrix table, and reading the
+    matrix table with them reads its partitions unchanged.
+
+    Parameters
+    ----------
+    path : :class:`str`
+        Path to a matrix table keyed by ``locus``, or by ``locus`` and
+        ``alleles``, such as the output of :func:`.run_combiner`.
+    reference_genome: :class:`str` or :class:`.ReferenceGenome`,
+        Reference genome of the matrix table.
+
+    Returns
+    -------
+    :obj:`List[Interval]`
+    """
+    with hl.hadoop_open(os.path.join(path, 'rows', 'rows', 'metadata.json.gz'), 'rb') as f:
+        metadata = f.read()
+    if metadata[:2] == b'\x1f\x8b':
+        metadata = gzip.decompress(metadata)
+    return _tile_range_bounds(_spec_range_bounds(json.loads(metadata)), reference_genome)
+
+
+def _spec_range_bounds(spec):
+    # IndexedRVDSpec2 and OrderedRVDSpec2, written by current versions of
+    # Hail, serialize the partition bounds as _jRangeBounds, older specs as
+    # jRangeBounds
+    if '_jRangeBounds' in spec:
+        return spec['_jRangeBounds']
+    return spec['jRangeBounds']
+
+
+def _tile_range_bounds(range_bounds, reference_genome) -> List[hl.utils.Interval]:
+    starts = []
+    for bounds in range_bounds:
+        locus = bounds['start']['locus']
+        start = (locus['contig'], locus['position'])
+        # partitions of a table keyed by locus and alleles may start at the same locus
+        if not starts or starts[-1] != start:
+            starts.append(start)
+    if not starts:
+        raise ValueError('matrix table has no partitions to align to')
+
+    first_contig = reference_genome.contigs[0]
+    last_contig = reference_genome.contigs[-1]
+    starts[0] = (first_contig, 1)
+    ends = starts[1:] + [(last_contig, reference_genome.lengths[last_contig])]
+
+    def locus(contig, position):
+        return hl.Locus(contig=contig, position=position, reference_genome=reference_genome)
+
+    return [hl.Interval(start=locus(*start), end=locus(*end), includes_end=(i == len(starts) - 1))
+            for i, (start, end) in enumerate(zip(starts, ends))]
+
+
 # END OF VCF COMBINER LIBRARY, BEGINNING OF BEST PRACTICES SCRIPT #
 
 
@@ -424,6 +637,31 @@ class CombinerPlan(object):
         self.merge_per_phase = len(file_size[0])
         self.total_merge = self.merge_per_phase * len(phases)
 
+    def to_json(self) -> dict:
+        return {'file_size': self.file_size,
+                'phases': [[[[m.inputs, m.input_total_size] for m in job.merges]
+                            for job in phase.jobs]
+                           for phase in self.phases]}
+
+    @staticmethod
+    def from_json(config: dict) -> 'CombinerPlan':
+        phases = [Phase([Job([Merge(inputs, size) for inputs, size in job])
+                         for job in phase])
+                  for phase in config['phases']]
+        return CombinerPlan(config['file_size'], phases)
+
+
+def _tree_height(n_inputs: int, branch_factor: int) -> int:
+    """Number of phases merging `n_inputs` files `branch_factor` at a time.
+
+    A single input still takes a phase, to transform it."""
+    height = 1
+    n = branch_factor
+    while n < n_inputs:
+        n *= branch_factor
+        height += 1
+    return height
+
 
 class CombinerConfig(object):
     default_branch_factor = 100
@@ -437,6 +675,10 @@ class CombinerConfig(object):
     default_genome_interval_size = 1_200_000
     default_exome_interval_size = 60_000_000
 
+    # Records per GVCF in each import interval computed from the sampled
+    # density of records.
+    default_import_target_records = 10_000
+
     def __init__(self,
                  branch_factor: int = default_branch_factor,
                  batch_size: int = default_batch_size,
@@ -449,18 +691,45 @@ class CombinerConfig(object):
     def default(cls) -> 'CombinerConfig':
         return CombinerConfig()
 
-    def plan(self, n_inputs: int) -> CombinerPlan:
+    @classmethod
+    def balanced(cls,
+                 n_inputs: int,
+                 max_branch_factor: int = default_branch_factor,
+                 max_batch_size: int = default_batch_size,
+                 target_records: int = default_target_records) -> 'CombinerConfig':
+        """Configuration combining `n_inputs` files in as few phases as
+        `max_branch_factor` allows, with merges and jobs of even sizes.
+
+        For example, 150 inputs with a maximum branch factor of 100 take two
+        phases either way, but rather than merging 100 and then 50 files into
+        two intermediates, 12 merges of 13 files are followed by one merge of
+        12.
+
+        Only the number of inputs is taken into account. Inputs are assumed to
+        take similar amounts of work to merge, whatever the density of their
+        records.
+        """
         assert n_inputs > 0
+        tree_height = _tree_height(n_inputs, max_branch_factor)
+        branch_factor = max_branch_factor
+        while branch_factor > 2 and _tree_height(n_inputs, branch_factor - 1) == tree_height:
+            branch_factor -= 1
+        n_merges = -(-n_inputs // branch_factor)
+        n_jobs = -(-n_merges // max_batch_size)
+        batch_size = -(-n_merges // n_jobs)
+        return CombinerConfig(branch_factor=branch_factor,
+                              batch_size=batch_size,
+                              target_records=target_records)
 
-        def int_ceil(x):
-            return int(math.ceil(x))
+    def plan(self, n_inputs: int) -> CombinerPlan:
+        assert n_inputs > 0
 
-        tree_height = int_ceil(math.log(n_inputs, self.branch_factor))
+        tree_height = _tree_height(n_inputs, self.branch_factor)
         phases: List[Phase] = []
         file_size: List[List[int]] = []  # List of file size per phase
 
         file_size.append([1 for _ in range(n_inputs)])
-        while len(file_size[-1]) > 1:
+        while len(file_size[-1]) > 1 or not phases:
             last_stage_files = file_size[-1]
             n = len(last_stage_files)
             i = 0
@@ -514,6 +783,8 @@ def run_combiner(sample_paths: List[str],
                  import_interval_size: Optional[int] = None,
                  use_genome_default_intervals: bool = False,
                  use_exome_default_intervals: bool = False,
+                 use_density_intervals: bool = False,
+                 import_target_records: int = CombinerConfig.default_import_target_records,
                  header: Optional[str] = None,
                  sample_names: Optional[List[str]] = None,
                  branch_factor: int = CombinerConfig.default_branch_factor,
@@ -522,13 +793,18 @@ def run_combiner(sample_paths: List[str],
                  overwrite: bool = False,
                  reference_genome: str = 'default',
                  contig_recoding: Optional[Dict[str, str]] = None,
-                 key_by_locus_and_alleles: bool = False):
+                 key_by_locus_and_alleles: bool = False,
+                 resume: bool = False,
+                 max_concurrent_jobs: int = 1,
+                 balance_plan: bool = False,
+                 dry_run: bool = False,
+                 existing_mt: Optional[str] = None):
     """Run the Hail VCF combiner, performing a hierarchical merge to create a combined sparse matrix table.
 
     **Partitioning**
 
     The partitioning of input GVCFs, which determines the maximum parallelism per file,
-    is determined the four parameters below. One of these parameters must be passed to
+    is determined the five parameters below. One of these parameters must be passed to
     this function.
 
     - `intervals` -- User-supplied intervals.
@@ -537,13 +813,46 @@ def run_combiner(sample_paths: List[str],
       genome GVCFs.
     - `use_exome_default_intervals` -- Use intervals of typical uniform size for exome
       GVCFs.
+    - `use_density_intervals` -- Use intervals holding about `import_target_records`
+      records per GVCF, according to the density of records in a few sampled GVCFs.
 
     It is recommended that new users include either `use_genome_default_intervals` or
-    `use_exome_default_intervals`.
+    `use_exome_default_intervals`. None of them is needed with `existing_mt`.
 
     Note also that the partitioning of the final, combined matrix table does not depend
     the GVCF input partitioning.
 
+    **Planning**
+
+    With `balance_plan`, `branch_factor` and `batch_size` are upper bounds, and
+    the combiner picks the smallest values that need as few phases, so that
+    merges and jobs have even sizes. They are chosen from the number of
+    inputs only, not from the density of their records.
+
+    With `dry_run`, nothing is written. The combiner samples the density of
+    records in the inputs, predicts the number of records in each partition of
+    the first phase, logs a summary of the plan, and returns it.
+
+    **Adding samples**
+
+    With `existing_mt`, the GVCFs in `sample_paths` are added to a sparse
+    matrix table written by an earlier run of the combiner, and the result is
+    written to `out_file`. Only the new GVCFs are transformed and merged; the
+    existing matrix table is read once, in the last phase, and its columns
+    come first in the output. The GVCFs are imported with the partitioning of
+    the existing matrix table, and every phase keeps that partitioning, so
+    `target_records` is not used and no partitioning argument is needed. The
+    new GVCFs must have the same ``FORMAT`` and ``INFO`` fields as the ones
+    already combined, and `out_file` must differ from `existing_mt`.
+
+    **Resuming**
+
+    With `resume`, the combiner writes its plan and a marker for every finished
+    job to a directory under `tmp_path` determined by the arguments. Running
+    the combiner again with the same arguments skips the finished jobs, so an
+    interrupted combine restarts from the last job it finished rather than from
+    the beginning. Intermediate files are not removed when the combine finishes.
+
     Parameters
     ----------
     sample_paths : :obj:`list` of :class:`str`
@@ -562,6 +871,12 @@ def run_combiner(sample_paths: List[str],
     use_exome_default_intervals : :obj:`bool`
         Import GVCFs with uniform partition intervals of default size for
         exome data.
+    use_density_intervals : :obj:`bool`
+        Import GVCFs with partition intervals computed from the density of
+        records in a sample of the inputs.
+    import_target_records : :obj:`int`
+        Target records per GVCF in each partition interval, with
+        `use_density_intervals`.
     header : :class:`str` or None
         External header file to use as GVCF header for all inputs. If defined, `sample_names` must be defined as well.
     sample_names: list of :class:`str` or None
@@ -583,13 +898,38 @@ def run_combiner(sample_paths: List[str],
         differently-formatted data onto known references.
     key_by_locus_and_alleles : :obj:`bool`
         Key by both locus and alleles in the final output.
+    resume : :obj:`bool`
+        Persist progress under `tmp_path`, and continue from a previous run
+        with the same arguments if there is one.
+    max_concurrent_jobs : :obj:`int`
+        Maximum number of jobs of a phase to run at the same time.
+    balance_plan : :obj:`bool`
+        Treat `branch_factor` and `batch_size` as upper bounds and even out
+        the sizes of merges and jobs.
+    dry_run : :obj:`bool`
+        Only plan the combine, and return the plan with predicted partition
+        sizes.
+    existing_mt : :class:`str` or None
+        Path to a sparse matrix table written by the combiner, to add the
+        samples in `sample_paths` to.
 
     Returns
     -------
-    None
+    :class:`.Struct` or None
+        With `dry_run`, a summary of the plan.
 
     """
-    tmp_path += f'/combiner-temporary/{uuid.uuid4()}/'
+    if max_concurrent_jobs < 1:
+        raise ValueError(f"'run_combiner': 'max_concurrent_jobs' must be positive, found {max_concurrent_jobs}")
+    if resume:
+        run_id = _combiner_run_id(sample_paths, out_file, intervals, import_interval_size,
+                                  use_genome_default_intervals, use_exome_default_intervals,
+                                  use_density_intervals, import_target_records, header,
+                                  sample_names, branch_factor, batch_size, target_records, reference_genome,
+                                  contig_recoding, key_by_locus_and_alleles, balance_plan, existing_mt)
+    else:
+        run_id = str(uuid.uuid4())
+    tmp_path += f'/combiner-temporary/{run_id}/'
     if header is not None:
         assert sample_names is not None
         assert len(sample_names) == len(sample_paths)
@@ -597,17 +937,32 @@ def run_combiner(sample_paths: List[str],
     n_partition_args = (int(intervals is not None)
                         + int(import_interval_size is not None)
                         + int(use_genome_default_intervals)
-                        + int(use_exome_default_intervals))
-
-    if n_partition_args == 0:
+                        + int(use_exome_default_intervals)
+                        + int(use_density_intervals))
+
+    if existing_mt is not None:
+        if existing_mt.rstrip('/') == out_file.rstrip('/'):
+            raise ValueError("'run_combiner': 'out_file' must differ from 'existing_mt'")
+        if n_partition_args > 0:
+            warning("'run_combiner': partitioning arguments are ignored with 'existing_mt',"
+                    " the partitioning of the existing matrix table is used")
+    elif n_partition_args == 0:
         raise ValueError("'run_combiner': require one argument from 'intervals', 'import_interval_size', "
-                         "'use_genome_default_intervals', or 'use_exome_default_intervals' to choose GVCF partitioning")
-    if n_partition_args > 1:
+                         "'use_genome_default_intervals', 'use_exome_default_intervals', or 'use_density_intervals' "
+                         "to choose GVCF partitioning")
+    elif n_partition_args > 1:
         warning("'run_combiner': multiple colliding arguments found from 'intervals', 'import_interval_size', "
-                "'use_genome_default_intervals', or 'use_exome_default_intervals'."
+                "'use_genome_default_intervals', 'use_exome_default_intervals', or 'use_density_intervals'."
                 "\n  The argument found first in the list in this warning will be used, and others ignored.")
 
-    if intervals is not None:
+    existing_samples = None
+    if existing_mt is not None:
+        intervals = calculate_existing_intervals(existing_mt, reference_genome)
+        existing_samples = set(hl.read_matrix_table(existing_mt).s.collect())
+        if sample_names is not None:
+            _check_new_samples(existing_mt, existing_samples, sample_names)
+        info(f"Using the {len(intervals)} partitions of '{existing_mt}' as partitioning for GVCF import")
+    elif intervals is not None:
         info(f"Using {len(intervals)} user-supplied intervals as partitioning for GVCF import")
     elif import_interval_size is not None:
         intervals = calculate_even_genome_partitioning(reference_genome, import_interval_size)
@@ -623,85 +978,275 @@ def run_combiner(sample_paths: List[str],
         intervals = calculate_even_genome_partitioning(reference_genome, size)
         info(f"Using {len(intervals)} intervals with default exome size"
              f" {size} as partitioning for GVCF import")
+    elif use_density_intervals:
+        density = sample_gvcf_density(sample_paths, reference_genome, contig_recoding=contig_recoding,
+                                      header=header, sample_names=sample_names)
+        intervals = calculate_density_intervals(density, import_target_records, reference_genome)
+        info(f"Using {len(intervals)} intervals with about {import_target_records} records per GVCF"
+             f" as partitioning for GVCF import")
 
     assert intervals is not None
 
-    config = CombinerConfig(branch_factor=branch_factor,
-                            batch_size=batch_size,
-                            target_records=target_records)
-    plan = config.plan(len(sample_paths))
+    if balance_plan:
+        config = CombinerConfig.balanced(len(sample_paths),
+                                         max_branch_factor=branch_factor,
+                                         max_batch_size=batch_size,
+                                         target_records=target_records)
+    else:
+        config = CombinerConfig(branch_factor=branch_factor,
+                                batch_size=batch_size,
+                                target_records=target_records)
+
+    if dry_run:
+        if existing_mt is not None or not use_density_intervals:
+            density = sample_gvcf_density(sample_paths, reference_genome, contig_recoding=contig_recoding,
+                                          header=header, sample_names=sample_names)
+        return _combiner_dry_run(config, config.plan(len(sample_paths)), intervals, density, reference_genome)
+
+    progress = _CombinerProgress(tmp_path) if resume else None
+    plan = progress.load_plan() if progress is not None else None
+    if plan is None:
+        plan = config.plan(len(sample_paths))
+        if progress is not None:
+            progress.save_plan(plan)
+    else:
+        info(f"Resuming GVCF combiner run from '{tmp_path}'")
 
     files_to_merge = sample_paths
     n_phases = len(plan.phases)
     total_ops = len(files_to_merge) * n_phases
     total_work_done = 0
-    for phase_i, phase in enumerate(plan.phases):
-        phase_i += 1  # used for info messages, 1-indexed for readability
-
-        n_jobs = len(phase.jobs)
-        merge_str = 'input GVCFs' if phase_i == 1 else 'intermediate sparse matrix tables'
-        job_str = hl.utils.misc.plural('job', n_jobs)
-        info(f"Starting phase {phase_i}/{n_phases}, merging {len(files_to_merge)} {merge_str} in {n_jobs} {job_str}.")
-
-        if phase_i > 1:
-            intervals = calculate_new_intervals(hl.read_matrix_table(files_to_merge[0]).rows(),
-                                                config.target_records,
-                                                reference_genome=reference_genome)
-
-        new_files_to_merge = []
-
-        for job_i, job in enumerate(phase.jobs):
-            job_i += 1  # used for info messages, 1-indexed for readability
-
-            n_merges = len(job.merges)
-            merge_str = hl.utils.misc.plural('file', n_merges)
-            pct_total = 100 * job.input_total_size / total_ops
-            info(
-                f"Starting phase {phase_i}/{n_phases}, job {job_i}/{len(phase.jobs)} to create {n_merges} merged {merge_str}, corresponding to ~{pct_total:.1f}% of total I/O.")
-            merge_mts: List[MatrixTable] = []
-            for merge in job.merges:
-                inputs = [files_to_merge[i] for i in merge.inputs]
-
-                if phase_i == 1:
-                    mts = [transform_gvcf(vcf)
-                           for vcf in hl.import_gvcfs(inputs, intervals, array_elements_required=False,
-                                                      _external_header=header,
-                                                      _external_sample_ids=[[sample_names[i]] for i in
-                                                                            merge.inputs] if header is not None else None,
-                                                      reference_genome=reference_genome,
-                                                      contig_recoding=contig_recoding)]
+    # threads start on the first submitted job, none are used for serial runs
+    with ThreadPoolExecutor(max_workers=max_concurrent_jobs) as executor:
+        for phase_i, phase in enumerate(plan.phases):
+            phase_i += 1  # used for info messages, 1-indexed for readability
+
+            n_jobs = len(phase.jobs)
+            merge_str = 'input GVCFs' if phase_i == 1 else 'intermediate sparse matrix tables'
+            job_str = hl.utils.misc.plural('job', n_jobs)
+            info(f"Starting phase {phase_i}/{n_phases}, merging {len(files_to_merge)} {merge_str} in {n_jobs} {job_str}.")
+
+            # samples added to an existing matrix table keep its partitioning throughout
+            phase_intervals = intervals if phase_i == 1 or existing_mt is not None else None
+
+            new_files_to_merge = []
+            running = {}
+
+            def finish(done):
+                nonlocal total_work_done
+                for future in done:
+                    job_i, job = running.pop(future)
+                    if future.exception() is not None:
+                        # let the other jobs finish writing, and record them, before failing
+                        wait(running)
+                        if progress is not None:
+                            for other, (other_i, _) in running.items():
+                                if other.exception() is None:
+                                    progress.mark_done(phase_i, other_i)
+                        raise future.exception()
+                    # markers are written from this thread only
+                    if progress is not None:
+                        progress.mark_done(phase_i, job_i)
+                    total_work_done += job.input_total_size
+                    info(
+                        f"Finished {phase_i}/{n_phases}, job {job_i}/{len(phase.jobs)}, {100 * total_work_done / total_ops:.1f}% of total I/O finished.")
+
+            for job_i, job in enumerate(phase.jobs):
+                job_i += 1  # used for info messages, 1-indexed for readability
+
+                n_merges = len(job.merges)
+                if phase_i == n_phases:  # final merge!
+                    assert n_jobs == 1
+                    assert n_merges == 1
+                    new_files_to_merge = [out_file]
                 else:
-                    mts = [hl.read_matrix_table(path, _intervals=intervals) for path in inputs]
+                    tmp = f'{tmp_path}_phase{phase_i}_job{job_i}/'
+                    pad = len(str(n_merges))
+                    new_files_to_merge.extend(tmp + str(n).zfill(pad) + '.mt' for n in range(n_merges))
+
+                if progress is not None and progress.is_done(phase_i, job_i):
+                    total_work_done += job.input_total_size
+                    info(f"Skipping phase {phase_i}/{n_phases}, job {job_i}/{len(phase.jobs)}, finished by a previous run.")
+                    continue
+
+                if phase_intervals is None:
+                    phase_intervals = calculate_new_intervals(hl.read_matrix_table(files_to_merge[0]).rows(),
+                                                              config.target_records,
+                                                              reference_genome=reference_genome)
+
+                merge_str = hl.utils.misc.plural('file', n_merges)
+                pct_total = 100 * job.input_total_size / total_ops
+                info(
+                    f"Starting phase {phase_i}/{n_phases}, job {job_i}/{len(phase.jobs)} to create {n_merges} merged {merge_str}, corresponding to ~{pct_total:.1f}% of total I/O.")
+                merge_mts: List[MatrixTable] = []
+                for merge in job.merges:
+                    inputs = [files_to_merge[i] for i in merge.inputs]
+
+                    if phase_i == 1:
+                        mts = [transform_gvcf(vcf)
+                               for vcf in hl.import_gvcfs(inputs, phase_intervals, array_elements_required=False,
+                                                          _external_header=header,
+                                                          _external_sample_ids=[[sample_names[i]] for i in
+                                                                                merge.inputs] if header is not None else None,
+                                                          reference_genome=reference_genome,
+                                                          contig_recoding=contig_recoding)]
+                    else:
+                        mts = [hl.read_matrix_table(path, _intervals=phase_intervals) for path in inputs]
+
+                    if phase_i == n_phases and existing_mt is not None:
+                        # sample names may come from the GVCF headers, so check the merged columns too
+                        _check_new_samples(existing_mt, existing_samples, [s for mt in mts for s in mt.s.collect()])
+                        mts = [_read_existing_mt(existing_mt, phase_intervals)] + mts
+
+                    merge_mts.append(combine_gvcfs(mts))
+
+                if phase_i == n_phases:
+                    [final_mt] = merge_mts
+
+                    if key_by_locus_and_alleles:
+                        final_mt = MatrixTable(MatrixKeyRowsBy(final_mt._mir, ['locus', 'alleles'], is_sorted=True))
+                    if progress is not None:
+                        if progress.is_started(phase_i, job_i) and hl.hadoop_exists(out_file):
+                            # a previous run was cut off while writing the output
+                            info(f"Removing partial output '{out_file}' of a previous run")
+                            Env.fs().rmtree(out_file)
+                        progress.mark_started(phase_i, job_i)
+                    final_mt.write(out_file, overwrite=overwrite)
+                    if progress is not None:
+                        progress.mark_done(phase_i, job_i)
+                    info(f"Finished phase {phase_i}/{n_phases}, job {job_i}/{len(phase.jobs)}, 100% of total I/O finished.")
+                    break
+
+                if max_concurrent_jobs == 1:
+                    hl.experimental.write_matrix_tables(merge_mts, tmp, overwrite=True)
+                    if progress is not None:
+                        progress.mark_done(phase_i, job_i)
+                    total_work_done += job.input_total_size
+                    info(
+                        f"Finished {phase_i}/{n_phases}, job {job_i}/{len(phase.jobs)}, {100 * total_work_done / total_ops:.1f}% of total I/O finished.")
+                else:
+                    if len(running) >= max_concurrent_jobs:
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        finish(done)
+                    future = executor.submit(hl.experimental.write_matrix_tables, merge_mts, tmp, overwrite=True)
+                    running[future] = (job_i, job)
+
+            if running:
+                done, _ = wait(running)
+                finish(done)
 
-                merge_mts.append(combine_gvcfs(mts))
+            info(f"Finished phase {phase_i}/{n_phases}.")
 
-            if phase_i == n_phases:  # final merge!
-                assert n_jobs == 1
-                assert len(merge_mts) == 1
-                [final_mt] = merge_mts
+            files_to_merge = new_files_to_merge
 
-                if key_by_locus_and_alleles:
-                    final_mt = MatrixTable(MatrixKeyRowsBy(final_mt._mir, ['locus', 'alleles'], is_sorted=True))
-                final_mt.write(out_file, overwrite=overwrite)
-                new_files_to_merge = [out_file]
-                info(f"Finished phase {phase_i}/{n_phases}, job {job_i}/{len(phase.jobs)}, 100% of total I/O finished.")
-                break
+    assert files_to_merge == [out_file]
 
-            tmp = f'{tmp_path}_phase{phase_i}_job{job_i}/'
-            hl.experimental.write_matrix_tables(merge_mts, tmp, overwrite=True)
-            pad = len(str(len(merge_mts)))
-            new_files_to_merge.extend(tmp + str(n).zfill(pad) + '.mt' for n in range(len(merge_mts)))
-            total_work_done += job.input_total_size
-            info(
-                f"Finished {phase_i}/{n_phases}, job {job_i}/{len(phase.jobs)}, {100 * total_work_done / total_ops:.1f}% of total I/O finished.")
+    info("Finished!")
 
-        info(f"Finished phase {phase_i}/{n_phases}.")
 
-        files_to_merge = new_files_to_merge
+def _combiner_dry_run(config, plan, intervals, density, reference_genome) -> hl.Struct:
+    rg = hl.get_reference(reference_genome) if isinstance(reference_genome, str) else reference_genome
+    records = sorted(_interval_records(density, interval, rg) for interval in intervals)
+    n = len(records)
+    partition_records = hl.Struct(min=records[0],
+                                  median=records[n // 2],
+                                  max=records[-1],
+                                  mean=sum(records) / n)
+    phases = [hl.Struct(n_jobs=len(phase.jobs), n_outputs=len(plan.file_size[i + 1]))
+              for i, phase in enumerate(plan.phases)]
+    info(f"GVCF combiner dry run:\n"
+         f"    {n} import intervals with predicted records per GVCF per partition:"
+         f" min {partition_records.min:.0f}, median {partition_records.median:.0f},"
+         f" mean {partition_records.mean:.0f}, max {partition_records.max:.0f}\n"
+         f"    Up to {config.branch_factor} GVCFs per merge, so up to"
+         f" {config.branch_factor * partition_records.max:.0f} records per partition in the first phase")
+    return hl.Struct(branch_factor=config.branch_factor,
+                     batch_size=config.batch_size,
+                     phases=phases,
+                     n_intervals=n,
+                     partition_records=partition_records)
+
+
+def _interval_records(density, interval, reference_genome) -> float:
+    """Estimated records per GVCF in `interval`, which may span contigs."""
+    start, end = interval.start, interval.end
+    if start.contig == end.contig:
+        return density.records(start.contig, start.position, end.position)
+    contigs = reference_genome.contigs
+    total = density.records(start.contig, start.position, reference_genome.lengths[start.contig])
+    for contig in contigs[contigs.index(start.contig) + 1:contigs.index(end.contig)]:
+        total += density.records(contig, 1, reference_genome.lengths[contig])
+    return total + density.records(end.contig, 1, end.position)
+
+
+def _check_new_samples(existing_mt, existing_samples, new_samples):
+    duplicates = existing_samples.intersection(new_samples)
+    if duplicates:
+        raise ValueError(f"'run_combiner': samples already in '{existing_mt}': {sorted(duplicates)}")
+
+
+def _read_existing_mt(path, intervals) -> MatrixTable:
+    mt = hl.read_matrix_table(path, _intervals=intervals)
+    if list(mt.row_key) != ['locus']:
+        # written with key_by_locus_and_alleles, merges are keyed by locus alone
+        mt = MatrixTable(MatrixKeyRowsBy(mt._mir, ['locus'], is_sorted=True))
+    return mt
 
-    assert files_to_merge == [out_file]
 
-    info("Finished!")
+def _combiner_run_id(*args) -> str:
+    """Identifier of a combiner run, the same for runs with the same arguments."""
+    h = hashlib.sha256()
+    h.update(json.dumps([str(arg) if not isinstance(arg, (list, dict)) else repr(arg)
+                         for arg in args]).encode('utf-8'))
+    return h.hexdigest()[:32]
+
+
+class _CombinerProgress(object):
+    """Plan and finished jobs of a resumable combiner run, stored under
+    `path`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.plan_path = os.path.join(path, 'plan.json')
+        self.markers_path = os.path.join(path, 'done')
+        fs = Env.fs()
+        if fs.is_dir(self.markers_path):
+            self.done = {os.path.basename(f['path'].rstrip('/')) for f in fs.ls(self.markers_path)}
+        else:
+            self.done = set()
+
+    def load_plan(self) -> Optional[CombinerPlan]:
+        if not hl.hadoop_exists(self.plan_path):
+            return None
+        with hl.hadoop_open(self.plan_path) as f:
+            return CombinerPlan.from_json(json.load(f))
+
+    def save_plan(self, plan: CombinerPlan):
+        Env.fs().mkdir(self.path)
+        with hl.hadoop_open(self.plan_path, 'w') as f:
+            json.dump(plan.to_json(), f)
+
+    @staticmethod
+    def _marker(phase_i: int, job_i: int) -> str:
+        return f'phase{phase_i}_job{job_i}'
+
+    def is_done(self, phase_i: int, job_i: int) -> bool:
+        return self._marker(phase_i, job_i) in self.done
+
+    def is_started(self, phase_i: int, job_i: int) -> bool:
+        return self._marker(phase_i, job_i) + '.started' in self.done
+
+    def mark_started(self, phase_i: int, job_i: int):
+        self._write_marker(self._marker(phase_i, job_i) + '.started')
+
+    def mark_done(self, phase_i: int, job_i: int):
+        self._write_marker(self._marker(phase_i, job_i))
+
+    def _write_marker(self, marker: str):
+        Env.fs().mkdir(self.markers_path)
+        with hl.hadoop_open(os.path.join(self.markers_path, marker), 'w'):
+            pass
+        self.done.add(marker)
 
 
 def parse_sample_mapping(sample_map_path: str) -> Tuple[List[str], List[str]]:
@@ -0,0 +1,333 @@
+import math
+import struct
+
+import numpy as np
+from parsimonious import Grammar, NodeVisitor
+
+from hail import genetics
+from hail.utils.java import unescape_parsable
+from . import types
+
+DEFAULT_BUFFER_SPEC = '{"name":"BlockingBufferSpec","blockSize":65536,"child":{"name":"StreamBlockBufferSpec"}}'
+
+etype_grammar = Grammar(
+    r"""
+    etype = required (ebasestruct / earray / endarray / eboolean / eint32 / eint64 / efloat32 / efloat64 / ebinary)
+    required = "+"?
+    ebasestruct = "EBaseStruct{" efields? "}"
+    efields = efield ("," efield)*
+    efield = identifier ":" etype
+    earray = "EArray[" etype "]"
+    endarray = "ENDArrayColumnMajor[" etype "," nat "]"
+    eboolean = "EBoolean"
+    eint32 = "EInt32"
+    eint64 = "EInt64"
+    efloat32 = "EFloat32"
+    efloat64 = "EFloat64"
+    ebinary = "EBinary"
+    nat = ~"[0-9]+"
+    identifier = simple_identifier / escaped_identifier
+    simple_identifier = ~"\w+"
+    escaped_identifier = ~"`([^`\\\\]|\\\\.)*`"
+    """)
+
+
+class EType(object):
+    """Python-side description of an encoded type, as printed by the JVM's
+    ``EType.parsableString``."""
+
+    def __init__(self, name, required, element_type=None, fields=None, ndim=None):
+        self.name = name
+        self.required = required
+        self.element_type = element_type
+        self.fields = fields
+        self.ndim = ndim
+
+
+class ETypeConstructor(NodeVisitor):
+    def generic_visit(self, node, visited_children):
+        return visited_children
+
+    def visit_etype(self, node, visited_children):
+        required, [et] = visited_children
+        et.required = required
+        return et
+
+    def visit_required(self, node, visited_children):
+        return node.text == '+'
+
+    def visit_ebasestruct(self, node, visited_children):
+        _, fields, _ = visited_children
+        return EType('EBaseStruct', False, fields=fields[0] if fields else [])
+
+    def visit_efields(self, node, visited_children):
+        first, rest = visited_children
+        return [first] + [f for _, f in rest]
+
+    def visit_efield(self, node, visited_children):
+        name, _, et = visited_children
+        return (name, et)
+
+    def visit_earray(self, node, visited_children):
+        _, et, _ = visited_children
+        return EType('EArray', False, element_type=et)
+
+    def visit_endarray(self, node, visited_children):
+        _, et, _, ndim, _ = visited_children
+        return EType('ENDArrayColumnMajor', False, element_type=et, ndim=ndim)
+
+    def visit_nat(self, node, visited_children):
+        return int(node.text)
+
+    def visit_identifier(self, node, visited_children):
+        [name] = visited_children
+        return name
+
+    def visit_simple_identifier(self, node, visited_children):
+        return node.text
+
+    def visit_escaped_identifier(self, node, visited_children):
+        return unescape_parsable(node.text[1:-1])
+
+    def _primitive(self, node, visited_children):
+        return EType(node.text, False)
+
+    visit_eboolean = visit_eint32 = visit_eint64 = visit_efloat32 = visit_efloat64 = visit_ebinary = _primitive
+
+
+etype_node_visitor = ETypeConstructor()
+
+
+def parse_etype(s):
+    return etype_node_visitor.visit(etype_grammar.parse(s))
+
+
+_int32 = struct.Struct('<i')
+_int64 = struct.Struct('<q')
+
+# struct format character and width of each fixed-size encoded type
+_primitive_formats = {
+    'EBoolean': ('?', 1),
+    'EInt32': ('i', 4),
+    'EInt64': ('q', 8),
+    'EFloat32': ('f', 4),
+    'EFloat64': ('d', 8),
+}
+
+_numpy_dtypes = {
+    'EBoolean': np.dtype('?'),
+    'EInt32': np.dtype('<i4'),
+    'EInt64': np.dtype('<i8'),
+    'EFloat32': np.dtype('<f4'),
+    'EFloat64': np.dtype('<f8'),
+}
+
+
+def _isqrt(n):
+    # math.isqrt is new in Python 3.8
+    r = int(math.sqrt(n))
+    while r * r > n:
+        r -= 1
+    while (r + 1) * (r + 1) <= n:
+        r += 1
+    return r
+
+
+def _call_from_int(c):
+    phased = (c & 1) == 1
+    ploidy = (c >> 1) & 0x3
+    ar = c >> 3
+    if ploidy == 0:
+        alleles = []
+    elif ploidy == 1:
+        alleles = [ar]
+    else:
+        k = (_isqrt(8 * ar + 1) - 1) // 2
+        j = ar - k * (k + 1) // 2
+        alleles = [j, k - j] if phased else [j, k]
+    return genetics.Call(alleles, phased=phased)
+
+
+def _unpack_missing(buf, off, n):
+    """Missing bits for `n` values starting at `off`, as a boolean array."""
+    n_bytes = (n + 7) >> 3
+    bits = np.unpackbits(np.frombuffer(buf, dtype=np.uint8, count=n_bytes, offset=off), bitorder='little')
+    return bits[:n].astype(bool), off + n_bytes
+
+
+def _compile_primitive(et, t):
+    fmt, width = _primitive_formats[et.name]
+    s = struct.Struct('<' + fmt)
+    unpack_from = s.unpack_from
+    if t == types.tcall:
+        def decode(buf, off):
+            return _call_from_int(unpack_from(buf, off)[0]), off + width
+    else:
+        def decode(buf, off):
+            return unpack_from(buf, off)[0], off + width
+    return decode
+
+
+def _decode_binary(buf, off):
+    n = _int32.unpack_from(buf, off)[0]
+    off += 4
+    return buf[off:off + n].decode('utf-8'), off + n
+
+
+def _compile_struct(et, field_types, construct):
+    if len(et.fields) != len(field_types):
+        raise ValueError(f'encoded struct has {len(et.fields)} fields, expected {len(field_types)}')
+    layout = []
+    n_missing = 0
+    for (_, fet), ft in zip(et.fields, field_types):
+        if fet.required:
+            layout.append((compile_decoder(fet, ft), -1))
+        else:
+            layout.append((compile_decoder(fet, ft), n_missing))
+            n_missing += 1
+    layout = tuple(layout)
+    n_missing_bytes = (n_missing + 7) >> 3
+
+    def decode(buf, off):
+        missing = buf[off:off + n_missing_bytes]
+        off += n_missing_bytes
+        values = []
+        append = values.append
+        for dec, m in layout:
+            if m >= 0 and (missing[m >> 3] >> (m & 7)) & 1:
+                append(None)
+            else:
+                v, off = dec(buf, off)
+                append(v)
+        return construct(values), off
+    return decode
+
+
+def _compile_array(et, element_type, construct):
+    eet = et.element_type
+    element_required = eet.required
+
+    if eet.name in _primitive_formats and element_type != types.tcall:
+        fmt, width = _primitive_formats[eet.name]
+
+        def decode(buf, off):
+            n = _int32.unpack_from(buf, off)[0]
+            off += 4
+            if element_required:
+                n_present = n
+            else:
+                missing, off = _unpack_missing(buf, off, n)
+                n_present = n - int(missing.sum())
+            values = struct.unpack_from(f'<{n_present}{fmt}', buf, off)
+            off += n_present * width
+            if element_required:
+                return construct(list(values)), off
+            it = iter(values)
+            return construct([None if m else next(it) for m in missing.tolist()]), off
+        return decode
+
+    decode_element = compile_decoder(eet, element_type)
+
+    def decode(buf, off):
+        n = _int32.unpack_from(buf, off)[0]
+        off += 4
+        values = []
+        append = values.append
+        if element_required:
+            for _ in range(n):
+                v, off = decode_element(buf, off)
+                append(v)
+        else:
+            missing, off = _unpack_missing(buf, off, n)
+            for m in missing.tolist():
+                if m:
+                    append(None)
+                else:
+                    v, off = decode_element(buf, off)
+                    append(v)
+        return construct(values), off
+    return decode
+
+
+def _compile_ndarray(et, t):
+    if not types.is_numeric(t.element_type):
+        raise TypeError("Hail cannot currently return ndarrays of non-numeric or boolean type.")
+    dtype = _numpy_dtypes[et.element_type.name]
+    ndim = et.ndim
+    shape_format = struct.Struct(f'<{ndim}q')
+
+    def decode(buf, off):
+        shape = shape_format.unpack_from(buf, off)
+        off += 8 * ndim
+        n = int(np.prod(shape, dtype=np.int64))
+        data = np.frombuffer(buf, dtype=dtype, count=n, offset=off).reshape(shape, order='F')
+        return np.ascontiguousarray(data), off + n * dtype.itemsize
+    return decode
+
+
+def compile_decoder(et, t):
+    """Build a function decoding one present value of encoded type `et` as a
+    Python value of Hail type `t`.
+
+    The returned function takes a :obj:`bytes` buffer and an offset and
+    returns the decoded value and the offset just past it.
+    """
+    if isinstance(t, types.tstruct):
+        from hail.utils.struct import _tuple_struct_class
+        make_struct = _tuple_struct_class(tuple(t))
+        return _compile_struct(et, t.types, lambda values: make_struct(tuple(values)))
+    if isinstance(t, types.ttuple):
+        return _compile_struct(et, t.types, tuple)
+    if isinstance(t, types.tlocus):
+        rg = t.reference_genome
+        return _compile_struct(et, (types.tstr, types.tint32),
+                               lambda values: genetics.Locus(values[0], values[1], reference_genome=rg))
+    if isinstance(t, types.tinterval):
+        from hail.utils import Interval
+        point_type = t.point_type
+        return _compile_struct(et, (point_type, point_type, types.tbool, types.tbool),
+                               lambda values: Interval(values[0], values[1], values[2], values[3],
+                                                       point_type=point_type))
+    if isinstance(t, types.tarray):
+        return _compile_array(et, t.element_type, lambda values: values)
+    if isinstance(t, types.tset):
+        return _compile_array(et, t.element_type, frozenset)
+    if isinstance(t, types.tdict):
+        from hail.utils import frozendict
+        return _compile_array(et, types.ttuple(t.key_type, t.value_type), lambda values: frozendict(dict(values)))
+    if isinstance(t, types.tndarray):
+        return _compile_ndarray(et, t)
+    if t == types.tstr:
+        return _decode_binary
+    if et.name in _primitive_formats:
+        return _compile_primitive(et, t)
+    raise NotImplementedError(f'cannot decode {et.name} as {t}')
+
+
+def unblock(data):
+    """Strip the length-prefixed block framing written by
+    ``BlockingBufferSpec(..., StreamBlockBufferSpec)``."""
+    view = memoryview(data)
+    blocks = []
+    off = 0
+    while off < len(view):
+        n = _int32.unpack_from(view, off)[0]
+        off += 4
+        blocks.append(view[off:off + n])
+        off += n
+    return b''.join(blocks)
+
+
+_decoder_cache = {}
+
+
+def decode_result(typ, etype_string, data):
+    """Decode the result of ``executeEncode``, a one-field tuple holding a
+    value of type `typ` encoded with :data:`DEFAULT_BUFFER_SPEC`."""
+    key = (etype_string, typ)
+    decode = _decoder_cache.get(key)
+    if decode is None:
+        decode = compile_decoder(parse_etype(etype_string), types.ttuple(typ))
+        _decoder_cache[key] = decode
+    value, _ = decode(unblock(data), 0)
+    return value[0]
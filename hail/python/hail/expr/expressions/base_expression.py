@@ -422,7 +422,7 @@ class Expression(object):
                  indices: Indices = Indices(),
                  aggregations: LinkedList = LinkedList(Aggregation)):
 
-        self._ir: ir.IR = x
+        self._ir: ir.IR = ir.hash_cons(x)
         self._type = type
         self._indices = indices
         self._aggregations = aggregations
@@ -163,6 +163,14 @@ class HailTypeContext(object):
 _empty_context = HailTypeContext()
 
 
+def _identity(x):
+    return x
+
+
+def _float_or_none(x):
+    return None if x is None else float(x)
+
+
 class HailType(object):
     """
     Hail type superclass.
@@ -254,14 +262,34 @@ class HailType(object):
         return self._convert_from_json_na(x)
 
     def _convert_from_json_na(self, x):
-        if x is None:
-            return x
-        else:
-            return self._convert_from_json(x)
+        return self._json_converter()(x)
 
     def _convert_from_json(self, x):
         return x
 
+    def _json_converter(self):
+        """Function converting a JSON value of this type, or ``None``, to
+        Python. It is compiled once per type and reused."""
+        converter = self.__dict__.get('_json_converter_cache')
+        if converter is None:
+            converter = self._compile_json_converter()
+            self._json_converter_cache = converter
+        return converter
+
+    def _compile_json_converter(self):
+        if type(self)._convert_from_json is HailType._convert_from_json:
+            return _identity
+        convert = self._convert_from_json
+
+        def convert_na(x):
+            return None if x is None else convert(x)
+        return convert_na
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_json_converter_cache', None)
+        return state
+
     def _traverse(self, obj, f):
         """Traverse a nested type and object.
 
@@ -445,6 +473,9 @@ class _tfloat32(HailType):
     def _convert_from_json(self, x):
         return float(x)
 
+    def _compile_json_converter(self):
+        return _float_or_none
+
     def _convert_to_json(self, x):
         if math.isfinite(x):
             return x
@@ -489,6 +520,9 @@ class _tfloat64(HailType):
     def _convert_from_json(self, x):
         return float(x)
 
+    def _compile_json_converter(self):
+        return _float_or_none
+
     def _convert_to_json(self, x):
         if math.isfinite(x):
             return x
@@ -756,6 +790,24 @@ class tarray(HailType):
     def _convert_from_json(self, x):
         return [self.element_type._convert_from_json_na(elt) for elt in x]
 
+    def _compile_json_converter(self):
+        convert_element = self.element_type._json_converter()
+        if convert_element is _identity:
+            # JSON arrays are already lists of the right values
+            return _identity
+        if convert_element is _float_or_none:
+            def convert(x):
+                if x is None:
+                    return None
+                return [None if elt is None else float(elt) for elt in x]
+            return convert
+
+        def convert(x):
+            if x is None:
+                return None
+            return [convert_element(elt) for elt in x]
+        return convert
+
     def _convert_to_json(self, x):
         return [self.element_type._convert_to_json_na(elt) for elt in x]
 
@@ -897,6 +949,15 @@ class tset(HailType):
     def _convert_from_json(self, x):
         return frozenset({self.element_type._convert_from_json_na(elt) for elt in x})
 
+    def _compile_json_converter(self):
+        convert_element = self.element_type._json_converter()
+
+        def convert(x):
+            if x is None:
+                return None
+            return frozenset([convert_element(elt) for elt in x])
+        return convert
+
     def _convert_to_json(self, x):
         return [self.element_type._convert_to_json_na(elt) for elt in x]
 
@@ -1000,6 +1061,16 @@ class tdict(HailType):
     def _convert_from_json(self, x):
         return frozendict({self.key_type._convert_from_json_na(elt['key']): self.value_type._convert_from_json_na(elt['value']) for elt in x})
 
+    def _compile_json_converter(self):
+        convert_key = self.key_type._json_converter()
+        convert_value = self.value_type._json_converter()
+
+        def convert(x):
+            if x is None:
+                return None
+            return frozendict({convert_key(elt['key']): convert_value(elt['value']) for elt in x})
+        return convert
+
     def _convert_to_json(self, x):
         return [{'key': self.key_type._convert_to_json(k),
                  'value': self.value_type._convert_to_json(v)} for k, v in x.items()]
@@ -1153,6 +1224,27 @@ class tstruct(HailType, Mapping):
         from hail.utils import Struct
         return Struct(**{f: t._convert_from_json_na(x.get(f)) for f, t in self.items()})
 
+    def _compile_json_converter(self):
+        from hail.utils.struct import _tuple_struct_class
+        make_struct = _tuple_struct_class(tuple(self))
+        fields = [(f, t._json_converter()) for f, t in self.items()]
+        if all(c is _identity for _, c in fields):
+            names = [f for f, _ in fields]
+
+            def convert(x):
+                if x is None:
+                    return None
+                get = x.get
+                return make_struct(tuple([get(f) for f in names]))
+            return convert
+
+        def convert(x):
+            if x is None:
+                return None
+            get = x.get
+            return make_struct(tuple([c(get(f)) for f, c in fields]))
+        return convert
+
     def _convert_to_json(self, x):
         return {f: t._convert_to_json_na(x[f]) for f, t in self.items()}
 
@@ -1408,6 +1500,15 @@ class ttuple(HailType, Sequence):
     def _convert_from_json(self, x):
         return tuple(self.types[i]._convert_from_json_na(x[i]) for i in range(len(self.types)))
 
+    def _compile_json_converter(self):
+        converters = [t._json_converter() for t in self.types]
+
+        def convert(x):
+            if x is None:
+                return None
+            return tuple([c(elt) for c, elt in zip(converters, x)])
+        return convert
+
     def _convert_to_json(self, x):
         return [self.types[i]._convert_to_json_na(x[i]) for i in range(len(self.types))]
 
@@ -16,6 +16,11 @@ class FS(abc.ABC):
     def copy(self, src: str, dest: str):
         pass
 
+    def copy_many(self, srcs: List[str], dest: str):
+        """Copy each of `srcs` into the directory `dest`."""
+        for src in srcs:
+            self.copy(src, os.path.join(dest, os.path.basename(src)))
+
     @abc.abstractmethod
     def exists(self, path: str) -> bool:
         pass
@@ -32,6 +37,10 @@ class FS(abc.ABC):
     def stat(self, path: str) -> Dict:
         pass
 
+    def stat_many(self, paths: List[str]) -> List[Dict]:
+        """Results of :meth:`stat` on each of `paths`, in order."""
+        return [self.stat(path) for path in paths]
+
     @abc.abstractmethod
     def ls(self, path: str) -> List[Dict]:
         pass
@@ -1,5 +1,9 @@
+import hmac
 import io
 import json
+import secrets
+import socket
+import struct
 from typing import Dict, List
 
 from .fs import FS
@@ -51,38 +55,145 @@ class HadoopFS(FS):
         return self._jfs.rmtree(path)
 
 
+# File contents are streamed to and from the JVM over a loopback socket
+# rather than passed as byte arrays through Py4J; see HadoopSocketTransfer in
+# Py4jUtils.scala for the framing.
+_EOF = 0
+_ERROR = -1
+_FLUSH = -2
+
+_frame_header = struct.Struct('>i')
+
+# size of the chunks the JVM reads from the file and sends
+_READ_CHUNK_SIZE = 1 << 20
+
+# seconds to wait for the JVM to connect
+_CONNECT_TIMEOUT = 60
+
+
+def _recv_exactly(sock, n):
+    buf = bytearray(n)
+    view = memoryview(buf)
+    off = 0
+    while off < n:
+        k = sock.recv_into(view[off:])
+        if k == 0:
+            raise ConnectionError('connection to the JVM closed unexpectedly')
+        off += k
+    return bytes(buf)
+
+
+def _recv_int(sock):
+    return _frame_header.unpack(_recv_exactly(sock, 4))[0]
+
+
+def _recv_error(sock, path):
+    n = _recv_int(sock)
+    msg = _recv_exactly(sock, n).decode('utf-8')
+    return OSError(f"error accessing '{path}': {msg}")
+
+
+def _connect_jvm(start):
+    """Listen on a loopback port, call `start` with the port and a token to
+    have the JVM connect to it, and return the connection."""
+    token = secrets.token_hex(16)
+    expected = token.encode('ascii')
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        server.settimeout(_CONNECT_TIMEOUT)
+        start(server.getsockname()[1], token)
+        while True:
+            conn, _ = server.accept()
+            conn.settimeout(_CONNECT_TIMEOUT)
+            try:
+                received = _recv_exactly(conn, len(expected))
+            except OSError:
+                received = None
+            # anything else on this host may connect to the port
+            if received is not None and hmac.compare_digest(received, expected):
+                conn.settimeout(None)
+                return conn
+            conn.close()
+
+
 class HadoopReader(io.RawIOBase):
     def __init__(self, hfs, path, buffer_size):
         super(HadoopReader, self).__init__()
-        self._jfile = hfs._utils_package_object.readFile(hfs._jfs, path, buffer_size)
+        self._path = path
+        self._sock = None
+        self._sock = _connect_jvm(
+            lambda port, token: hfs._utils_package_object.readFileToSocket(
+                hfs._jfs, path, port, token, max(buffer_size, _READ_CHUNK_SIZE)))
+        # bytes left in the current frame
+        self._remaining = 0
+        self._eof = False
 
     def close(self):
-        self._jfile.close()
+        if not self.closed and self._sock is not None:
+            self._sock.close()
+        super(HadoopReader, self).close()
 
     def readable(self):
         return True
 
     def readinto(self, b):
-        b_from_java = self._jfile.read(len(b))
-        n_read = len(b_from_java)
-        b[:n_read] = b_from_java
+        if self._eof:
+            return 0
+        if self._remaining == 0:
+            n = _recv_int(self._sock)
+            if n == _EOF:
+                self._eof = True
+                return 0
+            if n == _ERROR:
+                raise _recv_error(self._sock, self._path)
+            self._remaining = n
+        view = memoryview(b).cast('B')
+        n_read = self._sock.recv_into(view[:min(len(view), self._remaining)])
+        if n_read == 0:
+            raise ConnectionError(f"connection to the JVM closed while reading '{self._path}'")
+        self._remaining -= n_read
         return n_read
 
 
 class HadoopWriter(io.RawIOBase):
     def __init__(self, hfs, path, exclusive=False):
-        self._jfile = hfs._utils_package_object.writeFile(hfs._jfs, path, exclusive)
+        self._path = path
+        self._sock = None
+        self._finished = True
+        self._sock = _connect_jvm(
+            lambda port, token: hfs._utils_package_object.writeFileFromSocket(
+                hfs._jfs, path, exclusive, port, token))
+        self._finished = False
         super(HadoopWriter, self).__init__()
 
     def writable(self):
         return True
 
+    def _request(self, frame):
+        self._sock.sendall(_frame_header.pack(frame))
+        status = _recv_int(self._sock)
+        if status == _ERROR:
+            raise _recv_error(self._sock, self._path)
+
     def close(self):
-        self._jfile.close()
+        if not self.closed and self._sock is not None:
+            try:
+                if not self._finished:
+                    self._finished = True
+                    self._request(_EOF)
+            finally:
+                self._sock.close()
+        super(HadoopWriter, self).close()
 
     def flush(self):
-        self._jfile.flush()
+        if not self._finished:
+            self._request(_FLUSH)
 
     def write(self, b):
-        self._jfile.write(bytearray(b))
-        return len(b)
+        view = memoryview(b).cast('B')
+        n = len(view)
+        if n > 0:
+            self._sock.sendall(_frame_header.pack(n))
+            self._sock.sendall(view)
+        return n
@@ -0,0 +1,324 @@
+import asyncio
+import io
+import os
+import shutil
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from stat import S_ISDIR
+from typing import Callable, Dict, List, Optional
+
+from hurry.filesize import size
+
+from hailtop.aiotools import RouterAsyncFS, Transfer, FileListEntry
+from hailtop.utils import blocking_to_async, bounded_gather2
+
+from .fs import FS
+
+
+class _EventLoopThread:
+    """An event loop running in a daemon thread, so coroutines can be run to
+    completion from any thread, including threads without an event loop and
+    threads whose loop is already running."""
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_forever, name='RouterFS', daemon=True)
+        self._thread.start()
+
+    def _run_forever(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class RouterFS(FS):
+    """Synchronous :class:`.FS` backed by a :class:`.RouterAsyncFS`.
+
+    Operations touching many files (:meth:`stat_many`, copies, removing a
+    tree) issue their requests concurrently, at most `parallelism` at a time.
+    Listing a remote directory takes one request per page of the listing.
+
+    Local paths are served by blocking calls in the calling thread. Remote
+    requests run on an event loop owned by the file system, so every method
+    may be called from any thread. :meth:`close` releases the event loop,
+    the thread pool and the client sessions of the file system.
+
+    Parameters
+    ----------
+    make_afs : function returning a :class:`.RouterAsyncFS`
+        Makes the asynchronous file system to route requests to. It is called
+        on the file system's event loop, which client sessions bind to.
+        Paths without a scheme are local paths.
+    thread_pool : :class:`concurrent.futures.ThreadPoolExecutor`
+        Pool in which blocking local file system calls are made.
+    parallelism : :obj:`int`
+        Maximum number of concurrent requests.
+    """
+
+    DEFAULT_PARALLELISM = 32
+
+    def __init__(self, make_afs: Callable[[], RouterAsyncFS], thread_pool: ThreadPoolExecutor,
+                 parallelism: int = DEFAULT_PARALLELISM):
+        if parallelism < 1:
+            raise ValueError(f'parallelism must be positive, found {parallelism}')
+        self._loop_thread = _EventLoopThread()
+
+        async def _make_afs():
+            return make_afs()
+        self.afs = self._run(_make_afs())
+        self._thread_pool = thread_pool
+        self._parallelism = parallelism
+
+    def _run(self, coro):
+        return self._loop_thread.run(coro)
+
+    def close(self):
+        try:
+            self._run(self.afs.close())
+        finally:
+            self._loop_thread.stop()
+            self._thread_pool.shutdown()
+
+    @staticmethod
+    def _local_path(path: str) -> Optional[str]:
+        parsed = urllib.parse.urlparse(path)
+        if parsed.scheme == 'file':
+            return parsed.path
+        if not parsed.scheme:
+            return path
+        return None
+
+    @staticmethod
+    def _dir_url(path: str) -> str:
+        return path if path.endswith('/') else path + '/'
+
+    def _sema(self) -> asyncio.Semaphore:
+        return asyncio.Semaphore(self._parallelism)
+
+    def open(self, path: str, mode: str = 'r', buffer_size: int = 8192):
+        local_path = self._local_path(path)
+        if local_path is not None:
+            return open(local_path, mode, buffering=buffer_size if buffer_size > 0 else -1)
+
+        if 'r' in mode:
+            handle = io.BufferedReader(SyncReadableStream(self._run(self.afs.open(path)), self._run),
+                                       buffer_size=buffer_size)
+        elif 'w' in mode or 'x' in mode:
+            if 'x' in mode and self.exists(path):
+                raise FileExistsError(path)
+            handle = io.BufferedWriter(SyncWritableStream(self._run(self.afs.create(path)), self._run),
+                                       buffer_size=buffer_size)
+        else:
+            raise ValueError(f'unsupported mode: {mode}')
+
+        if 'b' in mode:
+            return handle
+        return io.TextIOWrapper(handle, encoding='utf-8')
+
+    def copy(self, src: str, dest: str):
+        local_src = self._local_path(src)
+        local_dest = self._local_path(dest)
+        if local_src is not None and local_dest is not None:
+            _copy_local_file(local_src, local_dest)
+            return
+
+        async def _copy():
+            await self.afs.copy(self._sema(), Transfer(src, dest))
+        self._run(_copy())
+
+    def copy_many(self, srcs: List[str], dest: str):
+        local_dest = self._local_path(dest)
+        if local_dest is not None and all(self._local_path(src) is not None for src in srcs):
+            for src in srcs:
+                _copy_local_file(self._local_path(src), local_dest)
+            return
+
+        async def _copy():
+            await self.afs.copy(self._sema(), Transfer(srcs, dest, treat_dest_as=Transfer.DEST_DIR))
+        self._run(_copy())
+
+    def exists(self, path: str) -> bool:
+        local_path = self._local_path(path)
+        if local_path is not None:
+            return os.path.exists(local_path)
+        return self.is_file(path) or self.is_dir(path)
+
+    def is_file(self, path: str) -> bool:
+        local_path = self._local_path(path)
+        if local_path is not None:
+            return os.path.isfile(local_path)
+        if path.endswith('/'):
+            return False
+        return self._run(self.afs.isfile(path))
+
+    def is_dir(self, path: str) -> bool:
+        local_path = self._local_path(path)
+        if local_path is not None:
+            return os.path.isdir(local_path)
+        return self._run(self.afs.isdir(self._dir_url(path)))
+
+    def stat(self, path: str) -> Dict:
+        local_path = self._local_path(path)
+        if local_path is not None:
+            return _format_stat_local_file(os.stat(local_path), path)
+        return self._run(self._stat(path))
+
+    def stat_many(self, paths: List[str]) -> List[Dict]:
+        async def _stat_many():
+            return await bounded_gather2(self._sema(), *[self._stat(path) for path in paths],
+                                         cancel_on_error=True)
+        return self._run(_stat_many())
+
+    def ls(self, path: str) -> List[Dict]:
+        local_path = self._local_path(path)
+        if local_path is not None:
+            return _ls_local(path, local_path)
+        return self._run(self._ls(path))
+
+    def mkdir(self, path: str):
+        local_path = self._local_path(path)
+        if local_path is not None:
+            os.makedirs(local_path, exist_ok=True)
+            return
+        self._run(self.afs.makedirs(path, exist_ok=True))
+
+    def remove(self, path: str):
+        local_path = self._local_path(path)
+        if local_path is not None:
+            os.remove(local_path)
+            return
+        self._run(self.afs.remove(path))
+
+    def rmtree(self, path: str):
+        local_path = self._local_path(path)
+        if local_path is not None:
+            shutil.rmtree(local_path)
+            return
+
+        async def _rmtree():
+            await self.afs.rmtree(self._sema(), path)
+        self._run(_rmtree())
+
+    async def _stat(self, path: str) -> Dict:
+        local_path = self._local_path(path)
+        if local_path is not None:
+            stats = await blocking_to_async(self._thread_pool, os.stat, local_path)
+            return _format_stat_local_file(stats, path)
+
+        if not path.endswith('/'):
+            try:
+                status = await self.afs.statfile(path)
+                return _format_stat_object(path, await status.size(), await status['updated'])
+            except FileNotFoundError:
+                pass
+        if await self.afs.isdir(self._dir_url(path)):
+            return _format_stat_object(path, 0, None, is_dir=True)
+        raise FileNotFoundError(path)
+
+    async def _ls(self, path: str) -> List[Dict]:
+        local_path = self._local_path(path)
+        if local_path is not None:
+            # local stat calls are cheap enough that thread hand-offs would
+            # dominate, so list the directory in a single call
+            return await blocking_to_async(self._thread_pool, _ls_local, path, local_path)
+
+        try:
+            it = await self.afs.listfiles(path)
+        except FileNotFoundError:
+            return [await self._stat(path)]
+        # object listings carry the metadata, no further requests are needed
+        return [await _format_entry(entry) async for entry in it]
+
+
+async def _format_entry(entry: FileListEntry) -> Dict:
+    url = entry.url_maybe_trailing_slash()
+    if await entry.is_dir():
+        return _format_stat_object(url, 0, None, is_dir=True)
+    status = await entry.status()
+    return _format_stat_object(url, await status.size(), await status['updated'])
+
+
+def _copy_local_file(src: str, dest: str):
+    # like cp -p, keep the mode, times and ownership
+    if os.path.isdir(dest):
+        dest = os.path.join(dest, os.path.basename(src))
+    shutil.copy2(src, dest)
+    stats = os.stat(src)
+    os.chown(dest, stats.st_uid, stats.st_gid)
+
+
+def _ls_local(path: str, local_path: str) -> List[Dict]:
+    if not os.path.isdir(local_path):
+        return [_format_stat_local_file(os.stat(local_path), path)]
+    return [_format_stat_local_file(os.stat(os.path.join(local_path, name)), os.path.join(path, name))
+            for name in os.listdir(local_path)]
+
+
+def _format_stat_object(path: str, size_bytes: int, modification_time, is_dir: bool = False) -> Dict:
+    return {
+        'is_dir': is_dir,
+        'size_bytes': size_bytes,
+        'size': size(size_bytes),
+        'path': path,
+        'owner': urllib.parse.urlparse(path).netloc,
+        'modification_time': modification_time,
+    }
+
+
+def _format_stat_local_file(stats: os.stat_result, path: str) -> Dict:
+    return {
+        'is_dir': S_ISDIR(stats.st_mode),
+        'size_bytes': stats.st_size,
+        'size': size(stats.st_size),
+        'path': path,
+        'owner': stats.st_uid,
+        'modification_time': stats.st_mtime,
+    }
+
+
+class SyncReadableStream(io.RawIOBase):
+    def __init__(self, stream, run):
+        super(SyncReadableStream, self).__init__()
+        self._stream = stream
+        self._run = run
+
+    def close(self):
+        if not self.closed:
+            self._run(self._stream.wait_closed())
+        super(SyncReadableStream, self).close()
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        view = memoryview(b).cast('B')
+        data = self._run(self._stream.read(len(view)))
+        n = len(data)
+        view[:n] = data
+        return n
+
+
+class SyncWritableStream(io.RawIOBase):
+    def __init__(self, stream, run):
+        super(SyncWritableStream, self).__init__()
+        self._stream = stream
+        self._run = run
+
+    def close(self):
+        if not self.closed:
+            self._run(self._stream.wait_closed())
+        super(SyncWritableStream, self).close()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        return self._run(self._stream.write(bytes(b)))
@@ -1,6 +1,6 @@
 from .export_type import ExportType
 from .base_ir import BaseIR, IR, TableIR, MatrixIR, BlockMatrixIR, \
-    JIRVectorReference
+    JIRVectorReference, hash_cons, set_hash_consing
 from .ir import MatrixWrite, MatrixMultiWrite, BlockMatrixWrite, \
     BlockMatrixMultiWrite, TableToValueApply, \
     MatrixToValueApply, BlockMatrixToValueApply, BlockMatrixCollect, \
@@ -61,7 +61,7 @@ from .blockmatrix_writer import BlockMatrixWriter, BlockMatrixNativeWriter, \
     BlockMatrixMultiWriter, BlockMatrixBinaryMultiWriter, \
     BlockMatrixTextMultiWriter, BlockMatrixPersistWriter, BlockMatrixNativeMultiWriter
 from .renderer import Renderable, RenderableStr, ParensRenderer, \
-    RenderableQueue, RQStack, Renderer, PlainRenderer, CSERenderer
+    RenderableQueue, RQStack, Renderer, PlainRenderer, CSERenderer, RenderCache
 
 __all__ = [
     'ExportType',
@@ -71,6 +71,8 @@ __all__ = [
     'MatrixIR',
     'BlockMatrixIR',
     'JIRVectorReference',
+    'hash_cons',
+    'set_hash_consing',
     'register_functions',
     'register_aggregators',
     'filter_predicate_with_keep',
@@ -83,6 +85,7 @@ __all__ = [
     'Renderer',
     'PlainRenderer',
     'CSERenderer',
+    'RenderCache',
     'TableWriter',
     'TableNativeWriter',
     'TableTextWriter',
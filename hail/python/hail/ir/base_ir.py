@@ -1,4 +1,6 @@
 import abc
+import weakref
+from typing import Optional
 
 from hail.utils.java import Env
 from .renderer import Renderer, PlainRenderer, Renderable
@@ -25,6 +27,45 @@ def _env_bind(env, bindings):
         return env
 
 
+_hash_cons_table: Optional[weakref.WeakValueDictionary] = None
+
+
+def set_hash_consing(enabled: bool):
+    """Enable or disable hash-consing of IR.
+
+    While enabled, :func:`hash_cons` maps closed IR to a canonical,
+    structurally equal instance, so identical subtrees built separately share
+    one object, along with its computed type and Java IR.
+    """
+    global _hash_cons_table
+    if enabled:
+        if _hash_cons_table is None:
+            _hash_cons_table = weakref.WeakValueDictionary()
+    else:
+        _hash_cons_table = None
+
+
+def hash_cons(x: 'BaseIR') -> 'BaseIR':
+    """Return the canonical instance of `x` if hash-consing is enabled.
+
+    IR with free variables is returned unchanged, since its type depends on
+    where it is used, as is IR carrying error information.
+    """
+    table = _hash_cons_table
+    if table is None or x._error_id is not None:
+        return x
+    if isinstance(x, IR) and (x.free_vars or x.free_agg_vars or x.free_scan_vars):
+        return x
+    h = hash(x)
+    canonical = table.get(h)
+    if canonical is None:
+        table[h] = x
+        return x
+    if canonical._error_id is None and canonical == x:
+        return canonical
+    return x
+
+
 class BaseIR(Renderable):
     def __init__(self, *children):
         super().__init__()
@@ -32,6 +73,7 @@ class BaseIR(Renderable):
         self.children = children
         self._error_id = None
         self._stack_trace = None
+        self._hash = None
 
     def __str__(self):
         r = PlainRenderer(stop_at_jir=False)
@@ -71,7 +113,25 @@ class BaseIR(Renderable):
         return
 
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.children == other.children and self._eq(other)
+        # iterative, comparing shared subtrees once
+        stack = [(self, other)]
+        seen = set()
+        while stack:
+            left, right = stack.pop()
+            if left is right or (id(left), id(right)) in seen:
+                continue
+            seen.add((id(left), id(right)))
+            if not (isinstance(right, left.__class__)
+                    and hash(left) == hash(right)
+                    and len(left.children) == len(right.children)
+                    and left._eq(right)):
+                return False
+            for left_child, right_child in zip(left.children, right.children):
+                if isinstance(left_child, BaseIR):
+                    stack.append((left_child, right_child))
+                elif left_child != right_child:
+                    return False
+        return True
 
     def __ne__(self, other):
         return not self == other
@@ -91,7 +151,24 @@ class BaseIR(Renderable):
         return True
 
     def __hash__(self):
-        return 31 + hash(str(self))
+        if self._hash is None:
+            # computed bottom-up, without recursion, and cached on every node
+            stack = [self]
+            while stack:
+                node = stack[-1]
+                pending = [c for c in node.children if isinstance(c, BaseIR) and c._hash is None]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                if node._hash is None:
+                    node._hash = hash((node.__class__.__name__, node._hash_head(), *map(hash, node.children)))
+        return self._hash
+
+    def _hash_head(self):
+        """Non-child attributes included in the structural hash. Nodes equal
+        under :meth:`_eq` must have equal heads."""
+        return self.head_str()
 
     def new_block(self, i: int) -> bool:
         return self.renderable_new_block(self.renderable_idx_of_child(i))
@@ -190,10 +267,22 @@ class BaseIR(Renderable):
         return set()
 
     def base_search(self, criteria):
-        others = [node for child in self.children if isinstance(child, BaseIR) for node in child.base_search(criteria)]
-        if criteria(self):
-            return others + [self]
-        return others
+        # post-order, visiting shared subtrees once
+        found = []
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                if criteria(node):
+                    found.append(node)
+                continue
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children) if isinstance(child, BaseIR))
+        return found
 
     def save_error_info(self):
         self._error_id = get_next_int()
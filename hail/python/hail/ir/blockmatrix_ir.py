@@ -373,6 +373,13 @@ class JavaBlockMatrix(BlockMatrixIR):
     def render_head(self, r):
         return f'(JavaBlockMatrix {r.add_jir(self.jir)}'
 
+    def _eq(self, other):
+        # distinct Java objects may hold different data, even with equal types
+        return self.jir is other.jir
+
+    def _hash_head(self):
+        return id(self.jir)
+
     def _compute_type(self):
         self._type = tblockmatrix._from_java(self.jir.typ())
 
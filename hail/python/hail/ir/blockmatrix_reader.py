@@ -14,6 +14,11 @@ class BlockMatrixReader(object):
     def __eq__(self, other):
         pass
 
+    def _input_paths(self):
+        """Paths of the files read, or ``None`` if they are not known
+        without the backend."""
+        return None
+
 
 class BlockMatrixNativeReader(BlockMatrixReader):
     @typecheck_method(path=str)
@@ -29,6 +34,9 @@ class BlockMatrixNativeReader(BlockMatrixReader):
         return isinstance(other, BlockMatrixNativeReader) and \
             self.path == other.path
 
+    def _input_paths(self):
+        return [self.path]
+
 
 class BlockMatrixBinaryReader(BlockMatrixReader):
     @typecheck_method(path=str, shape=sequenceof(int), block_size=int)
@@ -50,6 +58,9 @@ class BlockMatrixBinaryReader(BlockMatrixReader):
             self.shape == other.shape and \
             self.block_size == other.block_size
 
+    def _input_paths(self):
+        return [self.path]
+
 
 class BlockMatrixPersistReader(BlockMatrixReader):
     def __init__(self, id, original):
@@ -542,6 +542,10 @@ class MakeArray(IR):
     def head_str(self):
         return self._type._parsable_string() if self._type is not None else 'None'
 
+    def _hash_head(self):
+        # the type may be filled in after the hash is computed
+        return None
+
     def _eq(self, other):
         return other._type == self._type
 
@@ -1623,6 +1627,21 @@ def _register(registry, name, f):
     registry[name].append(f)
 
 
+# The built-in functions and aggregators are registered on first use rather
+# than when hail is imported.
+_builtins_registered = False
+
+
+def _ensure_builtins_registered():
+    global _builtins_registered
+    if not _builtins_registered:
+        _builtins_registered = True
+        from .register_functions import register_functions
+        from .register_aggregators import register_aggregators
+        register_functions()
+        register_aggregators()
+
+
 _aggregator_registry = defaultdict(list)
 
 
@@ -1631,6 +1650,7 @@ def register_aggregator(name, init_params, seq_params, ret_type):
 
 
 def lookup_aggregator_return_type(name, init_args, seq_args):
+    _ensure_builtins_registered()
     if name in _aggregator_registry:
         fns = _aggregator_registry[name]
         for f in fns:
@@ -1680,16 +1700,9 @@ class BaseApplyAggOp(IR):
         assert all(map(lambda c: len(c.aggregations) == 0, self.children))
         return [self]
 
-    def __eq__(self, other):
-        return isinstance(other, self.__class__) and \
-            other.agg_op == self.agg_op and \
-            other.init_op_args == self.init_op_args and \
-            other.seq_op_args == self.seq_op_args
-
-    def __hash__(self):
-        return hash(tuple([self.agg_op,
-                           tuple(self.init_op_args),
-                           tuple(self.seq_op_args)]))
+    def _eq(self, other):
+        return other.agg_op == self.agg_op and \
+            len(other.init_op_args) == len(self.init_op_args)
 
     def _compute_type(self, env, agg_env):
         for a in self.init_op_args:
@@ -1765,12 +1778,11 @@ class MakeStruct(IR):
     def render_children(self, r):
         return [InsertFields.IFRenderField(escape_id(f), x) for f, x in self.fields]
 
-    def __eq__(self, other):
-        return isinstance(other, MakeStruct) \
-            and other.fields == self.fields
+    def _eq(self, other):
+        return [f for f, _ in other.fields] == [f for f, _ in self.fields]
 
-    def __hash__(self):
-        return hash(tuple(self.fields))
+    def _hash_head(self):
+        return tuple(f for f, _ in self.fields)
 
     def _compute_type(self, env, agg_env):
         for f, x in self.fields:
@@ -1863,14 +1875,13 @@ class InsertFields(IR):
             *(InsertFields.IFRenderField(escape_id(f), x) for f, x in self.fields)
         ]
 
-    def __eq__(self, other):
-        return isinstance(other, InsertFields) and \
-            other.old == self.old and \
-            other.fields == self.fields and \
+    def _eq(self, other):
+        return [f for f, _ in other.fields] == [f for f, _ in self.fields] and \
             other.field_order == self.field_order
 
-    def __hash__(self):
-        return hash((self.old, tuple(self.fields), tuple(self.field_order) if self.field_order else None))
+    def _hash_head(self):
+        return (tuple(f for f, _ in self.fields),
+                tuple(self.field_order) if self.field_order else None)
 
     def _compute_type(self, env, agg_env):
         self.old._compute_type(env, agg_env)
@@ -1970,7 +1981,7 @@ class Die(IR):
         return f'{self._typ._parsable_string()} {self._error_id}'
 
     def _eq(self, other):
-        return other._typ == self._typ
+        return other._typ == self._typ and other._error_id == self._error_id
 
     def _compute_type(self, env, agg_env):
         self._type = self._typ
@@ -1994,6 +2005,7 @@ def clear_session_functions():
 
 
 def remove_function(name, param_types, ret_type, type_args=()):
+    _ensure_builtins_registered()
     f = (param_types, ret_type, type_args)
     bindings = _function_registry[name]
     bindings = [b for b in bindings if b != f]
@@ -58,7 +58,9 @@ class MatrixRead(MatrixIR):
         return self.reader == other.reader and self.drop_cols == other.drop_cols and self.drop_rows == other.drop_rows
 
     def _compute_type(self):
-        self._type = Env.backend().matrix_type(self)
+        self._type = self.reader._compute_type()
+        if self._type is None:
+            self._type = Env.backend().matrix_type(self)
 
 
 class MatrixFilterRows(MatrixIR):
@@ -643,6 +645,13 @@ class JavaMatrix(MatrixIR):
     def render_head(self, r):
         return f'(JavaMatrix {r.add_jir(self._jir)}'
 
+    def _eq(self, other):
+        # distinct Java objects may hold different data, even with equal types
+        return self._jir is other._jir
+
+    def _hash_head(self):
+        return id(self._jir)
+
     def _compute_type(self):
         self._type = hl.tmatrix._from_java(self._jir.typ())
 
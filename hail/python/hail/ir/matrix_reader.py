@@ -21,6 +21,16 @@ class MatrixReader(object):
     def __eq__(self, other):
         pass
 
+    def _compute_type(self):
+        """Type of the matrix read, or ``None`` if only the backend can
+        compute it."""
+        return None
+
+    def _input_paths(self):
+        """Paths of the files read, or ``None`` if they are not known
+        without the backend."""
+        return None
+
 
 class MatrixNativeReader(MatrixReader):
     @typecheck_method(path=str,
@@ -66,6 +76,9 @@ class MatrixNativeReader(MatrixReader):
             other.intervals == self.intervals and \
             other.filter_intervals == self.filter_intervals
 
+    def _input_paths(self):
+        return [self.path]
+
 
 class MatrixRangeReader(MatrixReader):
     @typecheck_method(n_rows=int,
@@ -89,6 +102,17 @@ class MatrixRangeReader(MatrixReader):
             other.n_cols == self.n_cols and \
             other.n_partitions == self.n_partitions
 
+    def _input_paths(self):
+        return []
+
+    def _compute_type(self):
+        return hl.tmatrix(global_type=hl.tstruct(),
+                          col_type=hl.tstruct(col_idx=hl.tint32),
+                          col_key=['col_idx'],
+                          row_type=hl.tstruct(row_idx=hl.tint32),
+                          row_key=['row_idx'],
+                          entry_type=hl.tstruct())
+
 
 class MatrixVCFReader(MatrixReader):
     @typecheck_method(path=oneof(str, sequenceof(str)),
@@ -177,6 +201,11 @@ class MatrixVCFReader(MatrixReader):
             other.find_replace == self.find_replace and \
             other._partitions_json == self._partitions_json
 
+    def _input_paths(self):
+        if self.header_file is not None:
+            return self.path + [self.header_file]
+        return list(self.path)
+
 
 class MatrixBGENReader(MatrixReader):
     @typecheck_method(path=oneof(str, sequenceof(str)),
@@ -216,6 +245,15 @@ class MatrixBGENReader(MatrixReader):
             other.block_size == self.block_size and \
             other.included_variants == self.included_variants
 
+    def _input_paths(self):
+        if self.included_variants is not None:
+            return None
+        paths = list(self.path)
+        if self.sample_file is not None:
+            paths.append(self.sample_file)
+        paths.extend(self.index_file_map.values())
+        return paths
+
 
 class TextMatrixReader(MatrixReader):
     @typecheck_method(paths=oneof(str, sequenceof(str)),
@@ -278,6 +316,9 @@ class TextMatrixReader(MatrixReader):
             self.add_row_id == other.add_row_id and \
             self.comment == other.comment
 
+    def _input_paths(self):
+        return list(self.paths)
+
 
 class MatrixPLINKReader(MatrixReader):
     @typecheck_method(bed=str, bim=str, fam=str,
@@ -333,6 +374,9 @@ class MatrixPLINKReader(MatrixReader):
             other.contig_recoding == self.contig_recoding and \
             other.skip_invalid_loci == self.skip_invalid_loci
 
+    def _input_paths(self):
+        return [self.bed, self.bim, self.fam]
+
 
 class MatrixGENReader(MatrixReader):
     @typecheck_method(files=sequenceof(str), sample_file=str, chromosome=nullable(str),
@@ -358,3 +402,6 @@ class MatrixGENReader(MatrixReader):
     def __eq__(self, other):
         return isinstance(other, MatrixGENReader) and \
             self.config == other.config
+
+    def _input_paths(self):
+        return self.config['files'] + [self.config['sampleFile']]
@@ -1,7 +1,8 @@
 from hail import ir
 import abc
+import time
 from typing import Sequence, MutableSequence, List, Set, Dict, Optional
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 
 
 class Renderable(object):
@@ -152,9 +153,72 @@ BindingSite = namedtuple(
     'depth lifted_lets agg_lifted_lets scan_lifted_lets')
 
 
+class RenderCache:
+    """Bounded LRU cache of rendered IR, shared by the :class:`CSERenderer`s
+    of a session.
+
+    Table, matrix and block matrix IR open a new binding block for each of
+    their children, so no let is ever lifted across them and their rendering
+    does not depend on where they appear. Every rendered root is cached, and
+    later renders splice cached table, matrix and block matrix subtrees in
+    without traversing them again.
+
+    Entries are bounded by the total length of the cached code, `max_chars`.
+    `hits`, `misses` and `render_time` (in seconds) are updated as the cache
+    is used.
+    """
+
+    def __init__(self, max_chars: int = 1 << 26):
+        self.max_chars = max_chars
+        self.hits = 0
+        self.misses = 0
+        self.render_time = 0.0
+        self._chars = 0
+        # keyed on the IR itself, so structurally equal subtrees share an entry
+        self._entries: 'OrderedDict[ir.BaseIR, str]' = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, node: 'ir.BaseIR') -> Optional[str]:
+        code = self._entries.get(node)
+        if code is None:
+            return None
+        self._entries.move_to_end(node)
+        self.hits += 1
+        return code
+
+    def put(self, node: 'ir.BaseIR', code: str):
+        old = self._entries.pop(node, None)
+        if old is not None:
+            self._chars -= len(old)
+        if len(code) > self.max_chars:
+            return
+        self._entries[node] = code
+        self._chars += len(code)
+        while self._chars > self.max_chars:
+            _, evicted = self._entries.popitem(last=False)
+            self._chars -= len(evicted)
+
+    def clear(self):
+        self._entries.clear()
+        self._chars = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'render_time': self.render_time,
+                'entries': len(self._entries),
+                'chars': self._chars}
+
+
 class CSERenderer(Renderer):
-    def __init__(self, stop_at_jir=False):
+    def __init__(self, stop_at_jir=False, cache: Optional[RenderCache] = None):
+        if stop_at_jir and cache is not None:
+            # rendered code refers to the renderer's own jir ids
+            raise ValueError('CSERenderer: cannot use a render cache with stop_at_jir')
         self.stop_at_jir = stop_at_jir
+        self.cache = cache
         self.jir_count = 0
         self.jirs = {}
         self.memo: Dict[int, Sequence[str]] = {}
@@ -180,6 +244,21 @@ class CSERenderer(Renderer):
         self.memo[id(node)] = jref
 
     def __call__(self, root: 'ir.BaseIR') -> str:
+        cache = self.cache
+        if cache is None:
+            return self._render(root)
+
+        code = cache.get(root)
+        if code is not None:
+            return code
+        cache.misses += 1
+        start = time.perf_counter()
+        code = self._render(root)
+        cache.render_time += time.perf_counter() - start
+        cache.put(root, code)
+        return code
+
+    def _render(self, root: 'ir.BaseIR') -> str:
         binding_sites = CSEAnalysisPass(self)(root)
         return CSEPrintPass(self)(root, binding_sites)
 
@@ -247,6 +326,12 @@ class CSEAnalysisPass:
                 self.renderer._add_jir(child)
                 continue
 
+            if self.renderer.cache is not None and not isinstance(child, ir.IR):
+                code = self.renderer.cache.get(child)
+                if code is not None:
+                    self.renderer.memo[id(child)] = code
+                    continue
+
             child_frame = frame.make_child_frame(len(stack))
 
             if isinstance(child, ir.IR):
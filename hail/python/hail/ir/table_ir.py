@@ -245,7 +245,9 @@ class TableRead(TableIR):
         return self.reader == other.reader and self.drop_rows == other.drop_rows
 
     def _compute_type(self):
-        self._type = Env.backend().table_type(self)
+        self._type = self.reader._compute_type()
+        if self._type is None:
+            self._type = Env.backend().table_type(self)
 
 
 class MatrixEntriesTable(TableIR):
@@ -696,5 +698,12 @@ class JavaTable(TableIR):
     def render_head(self, r):
         return f'(JavaTable {r.add_jir(self._jir)}'
 
+    def _eq(self, other):
+        # distinct Java objects may hold different data, even with equal types
+        return self._jir is other._jir
+
+    def _hash_head(self):
+        return id(self._jir)
+
     def _compute_type(self):
         self._type = hl.ttable._from_java(self._jir.typ())
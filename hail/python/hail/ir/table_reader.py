@@ -17,6 +17,16 @@ class TableReader(object):
     def __eq__(self, other):
         pass
 
+    def _compute_type(self):
+        """Type of the table read, or ``None`` if only the backend can
+        compute it."""
+        return None
+
+    def _input_paths(self):
+        """Paths of the files read, or ``None`` if they are not known
+        without the backend."""
+        return None
+
 
 class TableNativeReader(TableReader):
     @typecheck_method(path=str,
@@ -62,6 +72,9 @@ class TableNativeReader(TableReader):
             other.intervals == self.intervals and \
             other.filter_intervals == self.filter_intervals
 
+    def _input_paths(self):
+        return [self.path]
+
 
 class TextTableReader(TableReader):
     def __init__(self, paths, min_partitions, types, comment,
@@ -93,6 +106,9 @@ class TextTableReader(TableReader):
         return isinstance(other, TextTableReader) and \
             other.config == self.config
 
+    def _input_paths(self):
+        return list(self.config['files'])
+
 
 class TableFromBlockMatrixNativeReader(TableReader):
     @typecheck_method(path=str, n_partitions=nullable(int), maximum_cache_memory_in_bytes=nullable(int))
@@ -113,3 +129,11 @@ class TableFromBlockMatrixNativeReader(TableReader):
             other.path == self.path and \
             other.n_partitions == self.n_partitions and \
             other.maximum_cache_memory_in_bytes == self.maximum_cache_memory_in_bytes
+
+    def _input_paths(self):
+        return [self.path]
+
+    def _compute_type(self):
+        return hl.ttable(global_type=hl.tstruct(),
+                         row_type=hl.tstruct(row_idx=hl.tint64, entries=hl.tarray(hl.tfloat64)),
+                         row_key=['row_idx'])
@@ -1,7 +1,9 @@
 from .blockmatrix import BlockMatrix, _jarray_from_ndarray, _breeze_from_ndarray, _svd, _eigh
+from .rectangles import ExportedRectangles
 from . import utils as utils
 
 __all__ = ['BlockMatrix',
+           'ExportedRectangles',
            'utils',
            '_jarray_from_ndarray',
            '_breeze_from_ndarray',
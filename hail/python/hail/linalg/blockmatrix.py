@@ -2,7 +2,7 @@ import os
 
 import itertools
 import math
-import re
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import scipy.linalg as spla
 
@@ -23,7 +23,8 @@ from hail.ir.blockmatrix_reader import (BlockMatrixNativeReader,
                                         BlockMatrixBinaryReader, BlockMatrixPersistReader)
 from hail.ir.blockmatrix_writer import (BlockMatrixBinaryWriter,
                                         BlockMatrixNativeWriter, BlockMatrixRectanglesWriter, BlockMatrixPersistWriter)
-from hail.ir import ExportType
+from hail.ir import ExportType, hash_cons
+from hail.linalg.rectangles import _write_rectangles_index, _list_rectangle_files, open_rectangles
 from hail.table import Table
 from hail.typecheck import (typecheck, typecheck_method, nullable, oneof,
                             sliceof, sequenceof, lazy, enumeration, numeric, tupleof, func_spec,
@@ -34,6 +35,10 @@ from hail.utils.java import Env
 
 block_matrix_type = lazy()
 
+# threads reading and writing files for to_numpy and from_numpy
+_numpy_io_threads = 16
+_numpy_io_chunk_bytes = 64 << 20
+
 
 class BlockMatrix(object):
     """Hail's block-distributed matrix of :py:data:`.tfloat64` elements.
@@ -228,7 +233,7 @@ class BlockMatrix(object):
         return BlockMatrix(JavaBlockMatrix(jbm))
 
     def __init__(self, bmir):
-        self._bmir = bmir
+        self._bmir = hash_cons(bmir)
 
     @classmethod
     @typecheck_method(path=str)
@@ -328,6 +333,10 @@ class BlockMatrix(object):
 
         The number of entries must be less than :math:`2^{31}`.
 
+        The ndarray is converted to float64 and written out in chunks of rows,
+        several at a time, so a :class:`numpy.memmap` larger than memory can
+        be distributed.
+
         Parameters
         ----------
         ndarray: :class:`numpy.ndarray`
@@ -346,12 +355,11 @@ class BlockMatrix(object):
             raise ValueError(f'from_numpy: ndarray dimensions must be non-zero, found shape {ndarray.shape}')
 
         nd = _ndarray_as_2d(ndarray)
-        nd = _ndarray_as_float64(nd)
         n_rows, n_cols = nd.shape
 
         path = new_local_temp_file()
         uri = local_path_uri(path)
-        nd.tofile(path)
+        _ndarray_tofile(nd, path)
         return cls.fromfile(uri, n_rows, n_cols, block_size)
 
     @classmethod
@@ -1189,8 +1197,8 @@ class BlockMatrix(object):
         writer = BlockMatrixBinaryWriter(uri)
         Env.backend().execute(BlockMatrixWrite(self._bmir, writer))
 
-    @typecheck_method(_force_blocking=bool)
-    def to_numpy(self, _force_blocking=False):
+    @typecheck_method(out=nullable(np.ndarray), _force_blocking=bool)
+    def to_numpy(self, out=None, _force_blocking=False):
         """Collects the block matrix into a `NumPy ndarray
         <https://docs.scipy.org/doc/numpy/reference/generated/numpy.ndarray.html>`__.
 
@@ -1199,24 +1207,53 @@ class BlockMatrix(object):
         >>> bm = BlockMatrix.random(10, 20)
         >>> a = bm.to_numpy()
 
+        Collect a large block matrix into a memory-mapped file:
+
+        >>> out = np.memmap('/local/file', dtype=np.float64, mode='w+', shape=(10, 20)) # doctest: +SKIP
+        >>> bm.to_numpy(out=out) # doctest: +SKIP
+
         Notes
         -----
         The resulting ndarray will have the same shape as the block matrix.
 
+        Block matrices with at least :math:`2^{31}` entries are exported block
+        by block, and the blocks are read in parallel straight into the
+        result, so the matrix is never held in memory twice.
+
+        Parameters
+        ----------
+        out: :class:`numpy.ndarray`, optional
+            Array of float64 with the shape of the block matrix to fill,
+            such as a :class:`numpy.memmap`.
+
         Returns
         -------
         :class:`numpy.ndarray`
+            `out`, if given.
         """
+        if out is not None:
+            if out.shape != (self.n_rows, self.n_cols):
+                raise ValueError(f'to_numpy: expected out of shape {(self.n_rows, self.n_cols)}, found {out.shape}')
+            if out.dtype != np.float64:
+                raise TypeError(f"to_numpy: expected out of dtype 'float64', found {out.dtype}")
+        else:
+            out = np.empty((self.n_rows, self.n_cols))
 
         if self.n_rows * self.n_cols > 1 << 31 or _force_blocking:
             path = new_temp_file()
             self.export_blocks(path, binary=True)
-            return BlockMatrix.rectangles_to_numpy(path, binary=True)
+            try:
+                BlockMatrix._rectangles_into(path, out, binary=True)
+            finally:
+                Env.fs().rmtree(path)
+        else:
+            with with_local_temp_file() as path:
+                self.tofile(local_path_uri(path))
+                _ndarray_fromfile(path, out)
 
-        with with_local_temp_file() as path:
-            uri = local_path_uri(path)
-            self.tofile(uri)
-            return np.fromfile(path).reshape((self.n_rows, self.n_cols))
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
 
     def to_ndarray(self):
         """Collects a BlockMatrix into a local hail ndarray expression on driver. This should not
@@ -2112,6 +2149,10 @@ class BlockMatrix(object):
         Note however that these binary files are not platform independent; in
         particular, no byte-order or data-type information is saved.
 
+        With `binary`, a small index file ``index.json`` listing the shape of
+        the block matrix and the rectangles is also written, so that
+        :meth:`.open_rectangles` can memory-map the export.
+
         The number of rectangles must be less than :math:`2^{29}`.
 
         Parameters
@@ -2141,6 +2182,8 @@ class BlockMatrix(object):
 
         writer = BlockMatrixRectanglesWriter(path_out, rectangles, delimiter, binary)
         Env.backend().execute(BlockMatrixWrite(self._bmir, writer))
+        if binary:
+            _write_rectangles_index(path_out, (self.n_rows, self.n_cols), rectangles)
 
     @typecheck_method(path_out=str, delimiter=str, binary=bool)
     def export_blocks(self, path_out, delimiter='\t', binary=False):
@@ -2278,30 +2321,87 @@ class BlockMatrix(object):
         -------
         :class:`numpy.ndarray`
         """
-        def parse_rects(fname):
-            rect_idx_and_bounds = [int(i) for i in re.findall(r'\d+', fname)]
-            if len(rect_idx_and_bounds) != 5:
-                raise ValueError(f'Invalid rectangle file name: {fname}')
-            return rect_idx_and_bounds
-
-        rect_files = [file['path'] for file in hl.utils.hadoop_ls(path) if not re.match(r'.*\.crc', file['path'])]
-        rects = [parse_rects(os.path.basename(file_path)) for file_path in rect_files]
+        rects = BlockMatrix._list_rectangles(path)
 
         n_rows = max(rects, key=lambda r: r[2])[2]
         n_cols = max(rects, key=lambda r: r[4])[4]
 
         nd = np.zeros(shape=(n_rows, n_cols))
-        with with_local_temp_file() as f:
-            uri = local_path_uri(f)
-            for rect, file_path in zip(rects, rect_files):
-                hl.utils.hadoop_copy(file_path, uri)
-                if binary:
-                    rect_data = np.reshape(np.fromfile(f), (rect[2] - rect[1], rect[4] - rect[3]))
-                else:
-                    rect_data = np.loadtxt(f, ndmin=2)
-                nd[rect[1]:rect[2], rect[3]:rect[4]] = rect_data
+        BlockMatrix._rectangles_into(path, nd, binary, rects)
         return nd
 
+    @staticmethod
+    @typecheck(path=str)
+    def open_rectangles(path):
+        """Opens files of rectangles written out in binary using
+        :meth:`.export_rectangles` or :meth:`.export_blocks` as a lazily
+        memory-mapped, indexable array.
+
+        Examples
+        --------
+        Export a block matrix in blocks, then read a small window of it:
+
+        >>> bm = BlockMatrix.random(100, 100, block_size=10)
+        >>> bm.export_blocks('output/blocks', binary=True)
+        >>> rects = BlockMatrix.open_rectangles('output/blocks')
+        >>> rects.shape
+        (100, 100)
+        >>> window = rects[15:25, 40:45]
+
+        Notes
+        -----
+        Indexing the result with integers, slices, or sequences of integers
+        in each of its two dimensions returns a :class:`numpy.ndarray`.
+        Only the rectangle files overlapping the selection are mapped, and
+        only the pages of them holding selected entries are read. Files on a
+        remote file system are copied to a local temporary directory when
+        first touched. Entries not covered by any rectangle are zero.
+
+        Exports written with an index file have the shape of the exported
+        block matrix. Older exports have the shape of the union of the
+        rectangles, as in :meth:`.rectangles_to_numpy`.
+
+        See Also
+        --------
+        :meth:`.export_rectangles`
+        :meth:`.export_blocks`
+        :meth:`.rectangles_to_numpy`
+
+        Parameters
+        ----------
+        path: :class:`str`
+            Path to directory where rectangles were written in binary.
+
+        Returns
+        -------
+        :class:`.ExportedRectangles`
+        """
+        return open_rectangles(path)
+
+    @staticmethod
+    def _list_rectangles(path):
+        return _list_rectangle_files(path)
+
+    @staticmethod
+    def _rectangles_into(path, nd, binary, rects=None):
+        """Reads the rectangle files under `path` into `nd`, several at a time."""
+        if rects is None:
+            rects = BlockMatrix._list_rectangles(path)
+        fs = Env.fs()
+
+        def read_rect(rect):
+            file_path, _, start_row, end_row, start_col, end_col = rect
+            target = nd[start_row:end_row, start_col:end_col]
+            if binary:
+                with fs.open(file_path, 'rb') as f:
+                    _readinto_ndarray(f, target)
+            else:
+                with fs.open(file_path) as f:
+                    target[...] = np.loadtxt(f, ndmin=2)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(_numpy_io_threads, len(rects)))) as executor:
+            list(executor.map(read_rect, rects))
+
     @typecheck_method(compute_uv=bool,
                       complexity_bound=int)
     def svd(self, compute_uv=True, complexity_bound=8192):
@@ -2533,6 +2633,70 @@ def _broadcast_index_expr(bmir_shape, is_row_vector):
         raise ValueError(f'Cannot broadcast shape: ${bmir_shape}')
 
 
+def _ndarray_tofile(nd, path):
+    """Writes 2-dimensional `nd` to `path` as float64 in row-major order, in
+    chunks of rows converted and written in parallel."""
+    n_rows, n_cols = nd.shape
+    row_bytes = n_cols * np.dtype(np.float64).itemsize
+    chunk_rows = max(1, _numpy_io_chunk_bytes // row_bytes)
+
+    def write_chunk(fd, start):
+        chunk = np.ascontiguousarray(_ndarray_as_float64(nd[start:start + chunk_rows]))
+        data = memoryview(chunk).cast('B')
+        offset = start * row_bytes
+        while data:
+            n = os.pwrite(fd, data, offset)
+            data = data[n:]
+            offset += n
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, n_rows * row_bytes)
+        with ThreadPoolExecutor(max_workers=_numpy_io_threads) as executor:
+            list(executor.map(lambda start: write_chunk(fd, start), range(0, n_rows, chunk_rows)))
+    finally:
+        os.close(fd)
+
+
+def _ndarray_fromfile(path, nd):
+    """Fills 2-dimensional `nd` from the float64 values in row-major order in
+    the local file `path`, in chunks of rows read in parallel."""
+    n_rows, n_cols = nd.shape
+    row_bytes = n_cols * np.dtype(np.float64).itemsize
+    chunk_rows = max(1, _numpy_io_chunk_bytes // row_bytes)
+
+    def read_chunk(start):
+        with open(path, 'rb') as f:
+            f.seek(start * row_bytes)
+            _readinto_ndarray(f, nd[start:start + chunk_rows])
+
+    with ThreadPoolExecutor(max_workers=_numpy_io_threads) as executor:
+        list(executor.map(read_chunk, range(0, n_rows, chunk_rows)))
+
+
+def _readinto_ndarray(f, nd):
+    """Fills 2-dimensional float64 `nd` with values in row-major order read
+    from binary file `f`, without intermediate copies where the layout of
+    `nd` allows."""
+    if nd.flags.c_contiguous:
+        views = [nd]
+    elif nd.strides[1] == nd.itemsize:
+        views = nd
+    else:
+        buf = np.empty(nd.shape)
+        _readinto_ndarray(f, buf)
+        nd[...] = buf
+        return
+
+    for view in views:
+        data = memoryview(view).cast('B')
+        while data:
+            n = f.readinto(data)
+            if not n:
+                raise EOFError(f'expected {nd.size} float64 values, found fewer')
+            data = data[n:]
+
+
 def _ndarray_as_2d(nd):
     if nd.ndim == 1:
         nd = nd.reshape(1, nd.shape[0])
@@ -0,0 +1,195 @@
+import json
+import os
+import re
+import urllib.parse
+
+import numpy as np
+
+from hail.utils import new_local_temp_dir, local_path_uri
+from hail.utils.java import Env
+
+_index_file = 'index.json'
+
+
+def _rectangle_file_name(index, n_rectangles, rectangle):
+    """Name of the file of `rectangle` written by
+    :meth:`.BlockMatrix.export_rectangles`, padded as in the JVM writer."""
+    return f'rect-{str(index).zfill(len(str(n_rectangles)))}_{"-".join(str(b) for b in rectangle)}'
+
+
+def _write_rectangles_index(path, shape, rectangles):
+    rects = [[_rectangle_file_name(i, len(rectangles), r)] + list(r)
+             for i, r in enumerate(rectangles)
+             if r[0] < r[1] and r[2] < r[3]]  # empty rectangles are not written
+    with Env.fs().open(os.path.join(path, _index_file), 'w') as f:
+        json.dump({'shape': list(shape),
+                   'dtype': np.dtype(np.float64).str,
+                   'rectangles': rects}, f)
+
+
+def _list_rectangle_files(path):
+    """Rectangle files under `path` as lists of path, index, and bounds."""
+    def parse_rects(fname):
+        rect_idx_and_bounds = [int(i) for i in re.findall(r'\d+', fname)]
+        if len(rect_idx_and_bounds) != 5:
+            raise ValueError(f'Invalid rectangle file name: {fname}')
+        return rect_idx_and_bounds
+
+    rect_files = [file['path'] for file in Env.fs().ls(path)
+                  if not re.match(r'.*\.crc', file['path']) and os.path.basename(file['path']) != _index_file]
+    return [[file_path] + parse_rects(os.path.basename(file_path)) for file_path in rect_files]
+
+
+def _key_indices(key, n):
+    if isinstance(key, (int, np.integer)):
+        if not -n <= key < n:
+            raise IndexError(f'index {key} out of bounds for axis of length {n}')
+        return np.array([key % n]), True
+    if isinstance(key, slice):
+        return np.arange(*key.indices(n)), False
+    idx = np.asarray(key)
+    if idx.size == 0:
+        idx = idx.astype(np.int64)
+    if idx.ndim != 1 or not np.issubdtype(idx.dtype, np.integer):
+        raise TypeError(f'expected an int, a slice or a sequence of ints, found {key!r}')
+    if idx.size and (idx.min() < -n or idx.max() >= n):
+        raise IndexError(f'index out of bounds for axis of length {n}')
+    return idx % n, False
+
+
+def _as_slice(idx):
+    """`idx`, an array of increasing indices, as a slice where it is one."""
+    if len(idx) == 1:
+        return slice(idx[0], idx[0] + 1)
+    step = idx[1] - idx[0]
+    if step > 0 and np.all(np.diff(idx) == step):
+        return slice(idx[0], idx[-1] + 1, step)
+    return idx
+
+
+class ExportedRectangles(object):
+    """Rectangles exported in binary by :meth:`.BlockMatrix.export_rectangles`
+    or :meth:`.BlockMatrix.export_blocks`, indexed like a two-dimensional
+    ndarray of the shape of the exported block matrix.
+
+    Use :meth:`.BlockMatrix.open_rectangles` to create one.
+
+    Rectangle files are memory-mapped when first touched by an index, so
+    selecting a small window of a large export reads only the pages of the
+    rectangles overlapping it. Files on remote file systems are copied to a
+    local temporary directory when first touched. Entries not covered by any
+    rectangle are zero.
+    """
+
+    def __init__(self, path, shape, dtype, rects):
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._rects = rects
+        self._maps = {}
+        self._local_dir = None
+
+    @property
+    def ndim(self):
+        return 2
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return f'ExportedRectangles(path={self.path!r}, shape={self.shape}, n_rectangles={len(self._rects)})'
+
+    def __array__(self, dtype=None):
+        nd = self[:, :]
+        return nd if dtype is None else nd.astype(dtype)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Unmaps the rectangle files."""
+        self._maps.clear()
+
+    def _local_file(self, file_path):
+        parsed = urllib.parse.urlparse(file_path)
+        if parsed.scheme in ('', 'file'):
+            return parsed.path
+        if self._local_dir is None:
+            self._local_dir = new_local_temp_dir()
+        local_path = os.path.join(self._local_dir, os.path.basename(file_path))
+        Env.fs().copy(file_path, local_path_uri(local_path))
+        return local_path
+
+    def _map(self, i):
+        nd = self._maps.get(i)
+        if nd is None:
+            file_path, _, start_row, end_row, start_col, end_col = self._rects[i]
+            nd = np.memmap(self._local_file(file_path), dtype=self.dtype, mode='r',
+                           shape=(end_row - start_row, end_col - start_col))
+            self._maps[i] = nd
+        return nd
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) == 1:
+            key = (key[0], slice(None))
+        if len(key) != 2:
+            raise IndexError(f'expected at most 2 indices, found {len(key)}')
+
+        rows, squeeze_rows = _key_indices(key[0], self.shape[0])
+        cols, squeeze_cols = _key_indices(key[1], self.shape[1])
+        result = np.zeros((len(rows), len(cols)), dtype=self.dtype)
+
+        if len(rows) and len(cols):
+            for i, (_, _, start_row, end_row, start_col, end_col) in enumerate(self._rects):
+                in_rows = np.nonzero((rows >= start_row) & (rows < end_row))[0]
+                if not len(in_rows):
+                    continue
+                in_cols = np.nonzero((cols >= start_col) & (cols < end_col))[0]
+                if not len(in_cols):
+                    continue
+                src_rows = _as_slice(rows[in_rows] - start_row)
+                src_cols = _as_slice(cols[in_cols] - start_col)
+                dest_rows = _as_slice(in_rows)
+                dest_cols = _as_slice(in_cols)
+                nd = self._map(i)
+                if isinstance(src_rows, slice) and isinstance(src_cols, slice):
+                    block = nd[src_rows, src_cols]
+                else:
+                    block = nd[np.ix_(np.r_[src_rows], np.r_[src_cols])]
+                if isinstance(dest_rows, slice) and isinstance(dest_cols, slice):
+                    result[dest_rows, dest_cols] = block
+                else:
+                    result[np.ix_(np.r_[dest_rows], np.r_[dest_cols])] = block
+
+        if squeeze_rows and squeeze_cols:
+            return result[0, 0]
+        if squeeze_rows:
+            return result[0]
+        if squeeze_cols:
+            return result[:, 0]
+        return result
+
+
+def open_rectangles(path):
+    """Opens the binary rectangle files in directory `path` as an
+    :class:`.ExportedRectangles`."""
+    index_path = os.path.join(path, _index_file)
+    fs = Env.fs()
+    if fs.exists(index_path):
+        with fs.open(index_path) as f:
+            index = json.load(f)
+        rects = [[os.path.join(path, name), i] + bounds
+                 for i, (name, *bounds) in enumerate(index['rectangles'])]
+        return ExportedRectangles(path, index['shape'], index['dtype'], rects)
+
+    # exported without an index, take the shape from the rectangle bounds
+    rects = sorted(_list_rectangle_files(path), key=lambda r: r[1])
+    if not rects:
+        raise ValueError(f"no rectangle files found in '{path}'")
+    shape = (max(r[3] for r in rects), max(r[5] for r in rects))
+    return ExportedRectangles(path, shape, np.float64, rects)
@@ -542,7 +542,7 @@ class MatrixTable(ExprContainer):
     def __init__(self, mir):
         super(MatrixTable, self).__init__()
 
-        self._mir = mir
+        self._mir = ir.hash_cons(mir)
 
         self._globals = None
         self._col_values = None
@@ -9,7 +9,6 @@ from hail.table import Table
 from hail.typecheck import typecheck
 from hail.utils import FatalError
 from hail.utils.java import Env, info
-from hail.experimental import mt_to_table_of_ndarray
 
 
 def hwe_normalize(call_expr):
@@ -300,6 +299,8 @@ def _blanczos_pca(entry_expr, k=10, compute_loadings=False, q_iterations=2, over
     (:obj:`list` of :obj:`float`, :class:`.Table`, :class:`.Table`)
         List of eigenvalues, table with column scores, table with row loadings.
     """
+    from hail.experimental import mt_to_table_of_ndarray
+
     check_entry_indexed('mt_to_table_of_ndarray/entry_expr', entry_expr)
     mt = matrix_table_source('pca/entry_expr', entry_expr)
 
@@ -1,3 +1,5 @@
+import csv
+import json
 import math
 
 import collections
@@ -14,15 +16,15 @@ from bokeh.layouts import gridplot
 
 from hail.expr import aggregators
 from hail.expr.expressions import Expression, NumericExpression, \
-    StringExpression, Int32Expression, Int64Expression, \
-    Float32Expression, Float64Expression, \
+    StringExpression, \
     expr_numeric, expr_float64, expr_any, expr_locus, expr_str, \
     check_row_indexed
 from hail.typecheck import typecheck, oneof, nullable, sized_tupleof, numeric, \
     sequenceof, dictof
 from hail import Table
 from hail.utils.struct import Struct
-from hail.utils.java import warning
+from hail.utils.java import Env, warning
+from hail.utils.misc import new_temp_file
 from typing import List, Tuple, Dict, Union
 import hail
 
@@ -712,6 +714,34 @@ def _generate_hist2d_data(x, y, bins, range):
     return data
 
 
+_numpy_dtypes = {
+    hail.tint32: np.int32,
+    hail.tint64: np.int64,
+    hail.tfloat32: np.float32,
+    hail.tfloat64: np.float64,
+}
+
+
+def _to_numpy_column(values, dtype) -> np.ndarray:
+    """Column of collected values of Hail type `dtype`. Numeric columns with
+    missing values are floating point, with missing values as NaN."""
+    np_dtype = _numpy_dtypes.get(dtype)
+    if np_dtype is None:
+        return np.array(values, dtype=object)
+    if np.issubdtype(np_dtype, np.integer) and any(v is None for v in values):
+        np_dtype = np.float64
+    return np.array(values, dtype=np_dtype)
+
+
+def _parse_numpy_column(values, dtype) -> np.ndarray:
+    """Like :func:`_to_numpy_column`, for values formatted by :func:`hail.str`."""
+    np_dtype = _numpy_dtypes.get(dtype)
+    if np_dtype is not None:
+        parse = int if np.issubdtype(np_dtype, np.integer) else float
+        values = [None if v is None else parse(v) for v in values]
+    return _to_numpy_column(values, dtype)
+
+
 def _collect_scatter_plot_data(
         x: Tuple[str, NumericExpression],
         y: Tuple[str, NumericExpression],
@@ -719,37 +749,79 @@ def _collect_scatter_plot_data(
         n_divisions: int = None,
         missing_label: str = 'NA'
 ) -> pd.DataFrame:
+    """Collect the points of a scatter plot as columns.
+
+    Points with missing or NaN coordinates are dropped. If `n_divisions` is
+    ``None``, every other point is collected: the columns are exported to a
+    temporary file on the backend and read back in a stream, rather than
+    collected as one value. Otherwise, points are downsampled on the backend
+    with :func:`.aggregators.downsample`, in a single pass over the data.
 
+    Numeric fields keep their types. Other fields, booleans included, are
+    converted to strings, with missing values as `missing_label`, and
+    plotted as categories.
+    """
     expressions = dict()
     if fields is not None:
-        expressions.update({k: hail.or_else(v, missing_label) if isinstance(v, StringExpression) else v for k, v in fields.items()})
-
-    if n_divisions is None:
-        collect_expr = hail.struct(**dict((k, v) for k, v in (x, y)), **expressions)
-        plot_data = [point for point in collect_expr.collect() if point[x[0]] is not None and point[y[0]] is not None]
-        source_pd = pd.DataFrame(plot_data)
-    else:
-        # FIXME: remove the type conversion logic if/when downsample supports continuous values for labels
-        # Save all numeric types to cast in DataFrame
-        numeric_expr = {k: 'int32' for k, v in expressions.items() if isinstance(v, Int32Expression)}
-        numeric_expr.update({k: 'int64' for k, v in expressions.items() if isinstance(v, Int64Expression)})
-        numeric_expr.update({k: 'float32' for k, v in expressions.items() if isinstance(v, Float32Expression)})
-        numeric_expr.update({k: 'float64' for k, v in expressions.items() if isinstance(v, Float64Expression)})
+        for k, v in fields.items():
+            if v.dtype == hail.tbool or not isinstance(v, NumericExpression):
+                v = hail.or_else(hail.str(v), missing_label)
+            expressions[k] = v
 
-        # Cast non-string types to string
-        expressions = {k: hail.str(v) if not isinstance(v, StringExpression) else v for k, v in expressions.items()}
+    x_expr = hail.float64(x[1])
+    y_expr = hail.float64(y[1])
+    names = [x[0], y[0], *expressions]
+    dtypes = [hail.tfloat64, hail.tfloat64, *(v.dtype for v in expressions.values())]
+    is_point = hail.is_defined(x_expr) & hail.is_defined(y_expr) & ~hail.is_nan(x_expr) & ~hail.is_nan(y_expr)
 
-        agg_f = x[1]._aggregation_method()
-        res = agg_f(hail.agg.downsample(x[1], y[1], label=list(expressions.values()) if expressions else None, n_divisions=n_divisions))
-        source_pd = pd.DataFrame([
-            dict(
-                **{x[0]: point[0], y[0]: point[1]},
-                **(dict(zip(expressions, point[2])) if point[2] is not None else {})
-            ) for point in res
-        ])
-        source_pd = source_pd.astype(numeric_expr, copy=False)
-
-    return source_pd
+    if n_divisions is None:
+        return _export_scatter_plot_data(names, dtypes, [x_expr, y_expr, *expressions.values()], is_point)
+
+    # downsample carries labels as strings, numeric fields are parsed back
+    labels = [v if v.dtype == hail.tstr else hail.str(v) for v in expressions.values()]
+    agg_f = x[1]._aggregation_method()
+    points = agg_f(hail.agg.filter(is_point, hail.agg.downsample(
+        x_expr, y_expr, label=hail.array(labels) if labels else None, n_divisions=n_divisions)))
+    columns = [[p[0] for p in points], [p[1] for p in points]]
+    for i in range(len(labels)):
+        columns.append([p[2][i] if p[2] is not None else None for p in points])
+    return pd.DataFrame({name: _parse_numpy_column(values, dtype)
+                         for name, values, dtype in zip(names, columns, dtypes)})
+
+
+def _export_scatter_plot_data(names, dtypes, exprs, is_point) -> pd.DataFrame:
+    point = hail.or_missing(is_point, hail.tuple(exprs))
+    _, ds = point._to_relational('point')
+    if isinstance(ds, hail.MatrixTable):
+        ds = ds.entries()
+    ds = ds.key_by()
+    ds = ds.filter(hail.is_defined(ds.point))
+    # strings as JSON, so tabs and newlines in labels survive the text file
+    ds = ds.select(**{f'c{i}': ds.point[i] if dtype != hail.tstr else hail.json(ds.point[i])
+                      for i, dtype in enumerate(dtypes)})
+
+    path = new_temp_file(prefix='plot', extension='tsv')
+    ds.export(path)
+    try:
+        with hail.hadoop_open(path) as f:
+            df = pd.read_csv(f, sep='\t', quoting=csv.QUOTE_NONE, na_values=['NA', 'NaN'], keep_default_na=False,
+                             dtype={f'c{i}': _numpy_dtypes.get(dtype, object)
+                                    for i, dtype in enumerate(dtypes)
+                                    if not np.issubdtype(_numpy_dtypes.get(dtype, object), np.integer)})
+    finally:
+        Env.fs().remove(path)
+
+    columns = {}
+    for i, (name, dtype) in enumerate(zip(names, dtypes)):
+        column = df[f'c{i}']
+        np_dtype = _numpy_dtypes.get(dtype)
+        if np_dtype is None:
+            columns[name] = np.array([json.loads(v) for v in column], dtype=object)
+        elif np.issubdtype(np_dtype, np.integer) and column.isna().any():
+            columns[name] = column.to_numpy(dtype=np.float64)
+        else:
+            columns[name] = column.to_numpy(dtype=np_dtype)
+    return pd.DataFrame(columns)
 
 
 def _get_categorical_palette(factors: List[str]) -> Dict[str, str]:
@@ -778,7 +850,7 @@ def _get_scatter_plot_elements(
     sp.tools.append(HoverTool(tooltips=[(x_col, f'@{x_col}'), (y_col, f'@{y_col}')]
                               + [(c, f'@{c}') for c in source_pd.columns if c not in [x_col, y_col]]))
 
-    cds = ColumnDataSource(source_pd)
+    cds = ColumnDataSource({col: source_pd[col].to_numpy() for col in source_pd.columns})
 
     if not label_cols:
         sp.circle(x_col, y_col, source=cds, size=size)
@@ -924,7 +996,7 @@ def scatter(
     collect_all : bool
         Whether to collect all values or downsample before plotting.
     n_divisions : int
-        Factor by which to downsample (default value = 500). A lower input results in fewer output datapoints.
+        Number of bins along each axis when downsampling (default value = 500). One point is kept per bin, so a lower input results in fewer output datapoints.
     missing_label: str
         Label to use when a point is missing data for a categorical label
 
@@ -1073,7 +1145,7 @@ def joint_plot(
         collect_all : bool
             Whether to collect all values or downsample before plotting.
         n_divisions : int
-            Factor by which to downsample (default value = 500). A lower input results in fewer output datapoints.
+            Number of bins along each axis when downsampling (default value = 500). One point is kept per bin, so a lower input results in fewer output datapoints.
         missing_label: str
             Label to use when a point is missing data for a categorical label
 
@@ -1297,7 +1369,7 @@ def qq(
     collect_all : bool
         Whether to collect all values or downsample before plotting.
     n_divisions : int
-        Factor by which to downsample (default value = 500). A lower input results in fewer output datapoints.
+        Number of bins along each axis when downsampling (default value = 500). One point is kept per bin, so a lower input results in fewer output datapoints.
     missing_label: str
         Label to use when a point is missing data for a categorical label
 
@@ -1376,7 +1448,7 @@ def manhattan(pvals, locus=None, title=None, size=4, hover_fields=None, collect_
     collect_all : bool
         Whether to collect all values or downsample before plotting.
     n_divisions : int
-        Factor by which to downsample (default value = 500). A lower input results in fewer output datapoints.
+        Number of bins along each axis when downsampling (default value = 500). One point is kept per bin, so a lower input results in fewer output datapoints.
     significance_line : float, optional
         p-value at which to add a horizontal, dotted red line indicating
         genome-wide significance.  If ``None``, no line is added.
@@ -1394,6 +1466,7 @@ def manhattan(pvals, locus=None, title=None, size=4, hover_fields=None, collect_
         hover_fields = {}
 
     hover_fields['locus'] = hail.str(locus)
+    hover_fields['_contig'] = locus.contig
 
     pvals = -hail.log10(pvals)
 
@@ -1403,8 +1476,7 @@ def manhattan(pvals, locus=None, title=None, size=4, hover_fields=None, collect_
         fields=hover_fields,
         n_divisions=None if collect_all else n_divisions
     )
-    source_pd['p_value'] = [10 ** (-p) for p in source_pd['_pval']]
-    source_pd['_contig'] = [locus.split(":")[0] for locus in source_pd['locus']]
+    source_pd['p_value'] = np.power(10.0, -source_pd['_pval'].to_numpy())
 
     observed_contigs = set(source_pd['_contig'])
     observed_contigs = [contig for contig in ref.contigs.copy() if contig in observed_contigs]
@@ -0,0 +1,237 @@
+"""Wall-clock profiling of the Python side of query construction and execution.
+
+Backends record a span for every phase of a query (rendering, parsing,
+execution, decoding, type computation) while a :class:`Profiler` is active.
+Time spent checking arguments of :func:`.typecheck`-decorated functions is
+accumulated rather than recorded span by span, as there are far too many of
+those calls to trace individually.
+"""
+
+import contextlib
+import json
+import threading
+import time
+try:
+    import contextvars
+except ImportError:  # Python 3.6
+    contextvars = None
+
+# the active profiler, or None; read on every instrumented call, so this is a
+# plain module global
+_profiler = None
+
+# The innermost open span, of any profiler. Coroutines keep phases open
+# across awaits, so with contextvars every asyncio task has its own stack of
+# phases. Without them, every thread has.
+if contextvars is not None:
+    _current_span = contextvars.ContextVar('hail_profiling_span', default=None)
+
+    def _get_current_span():
+        return _current_span.get()
+
+    def _set_current_span(span):
+        return _current_span.set(span)
+
+    def _reset_current_span(token):
+        _current_span.reset(token)
+else:
+    _thread_local = threading.local()
+
+    def _get_current_span():
+        return getattr(_thread_local, 'span', None)
+
+    def _set_current_span(span):
+        token = _get_current_span()
+        _thread_local.span = span
+        return token
+
+    def _reset_current_span(token):
+        _thread_local.span = token
+
+
+class _NoPhase(object):
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_no_phase = _NoPhase()
+
+
+class _Span(object):
+    __slots__ = ('profiler', 'name', 'start', 'duration', 'args', 'parent', 'outer', 'child_time', 'thread')
+
+    def __init__(self, profiler, name, start, args, parent, outer):
+        self.profiler = profiler
+        self.name = name
+        self.start = start
+        self.duration = None
+        self.args = args
+        self.parent = parent
+        # the span open when this one started, possibly of another profiler
+        self.outer = outer
+        self.child_time = 0.0
+        self.thread = threading.get_ident()
+
+    def stack(self):
+        names = []
+        span = self
+        while span is not None:
+            names.append(span.name)
+            span = span.parent
+        return reversed(names)
+
+
+class Profiler(object):
+    """Records per-phase wall times of backend calls.
+
+    Examples
+    --------
+
+    >>> with hl.profile() as p:  # doctest: +SKIP
+    ...     hl.utils.range_table(10).aggregate(hl.agg.count())
+    >>> p.summary()  # doctest: +SKIP
+    >>> p.write_chrome_trace('trace.json')  # doctest: +SKIP
+
+    In a notebook, where a ``with`` block cannot span cells, keep the
+    profiler returned by :func:`.profile` and call :meth:`stop` when done.
+
+    Spans can be viewed in ``chrome://tracing`` or https://ui.perfetto.dev
+    after :meth:`write_chrome_trace`, or as a flame graph after
+    :meth:`write_folded_stacks`.
+
+    Phases may be recorded from several threads or asyncio tasks at once.
+    Each has its own stack of phases.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.totals = {}
+        self._totals_lock = threading.Lock()
+        self._previous = None
+        self._t0 = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        global _profiler
+        self._previous = _profiler
+        _profiler = self
+        return self
+
+    def stop(self):
+        global _profiler
+        if _profiler is self:
+            _profiler = self._previous
+        self._previous = None
+
+    @contextlib.contextmanager
+    def phase(self, name, **args):
+        outer = _get_current_span()
+        parent = outer
+        while parent is not None and parent.profiler is not self:
+            parent = parent.outer
+        span = _Span(self, name, time.perf_counter(), args, parent, outer)
+        self.spans.append(span)
+        token = _set_current_span(span)
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - span.start
+            _reset_current_span(token)
+            if parent is not None:
+                parent.child_time += span.duration
+
+    def add(self, name, seconds):
+        """Accumulate `seconds` under `name` without recording a span."""
+        with self._totals_lock:
+            count, total = self.totals.get(name, (0, 0.0))
+            self.totals[name] = (count + 1, total + seconds)
+
+    def summary(self):
+        """Number of calls and total seconds spent in each phase.
+
+        Returns
+        -------
+        :obj:`dict` of :class:`str` to :obj:`dict`
+        """
+        result = {name: {'count': count, 'total_time': total}
+                  for name, (count, total) in self.totals.items()}
+        for span in self.spans:
+            if span.duration is None:
+                continue
+            s = result.setdefault(span.name, {'count': 0, 'total_time': 0.0})
+            s['count'] += 1
+            s['total_time'] += span.duration
+        return result
+
+    def chrome_trace(self):
+        """Spans in the Chrome trace event format."""
+        events = []
+        for span in self.spans:
+            if span.duration is None:
+                continue
+            events.append({'name': span.name,
+                           'ph': 'X',
+                           'ts': (span.start - self._t0) * 1e6,
+                           'dur': span.duration * 1e6,
+                           'pid': 0,
+                           'tid': span.thread,
+                           'args': span.args})
+        return {'traceEvents': events,
+                'displayTimeUnit': 'ms',
+                'otherData': {'totals': self.summary()}}
+
+    def write_chrome_trace(self, path):
+        """Write spans to a local file in the Chrome trace event format."""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f, default=str)
+
+    def folded_stacks(self):
+        """Self time of each stack of phases, in microseconds, in the folded
+        format read by ``flamegraph.pl`` and speedscope."""
+        stacks = {}
+        for span in self.spans:
+            if span.duration is None:
+                continue
+            key = ';'.join(span.stack())
+            stacks[key] = stacks.get(key, 0.0) + span.duration - span.child_time
+        return [f'{key} {max(int(round(t * 1e6)), 0)}' for key, t in stacks.items()]
+
+    def write_folded_stacks(self, path):
+        """Write :meth:`folded_stacks` to a local file."""
+        with open(path, 'w') as f:
+            for line in self.folded_stacks():
+                f.write(line + '\n')
+
+
+def profile():
+    """Start profiling the Python side of every backend call.
+
+    Returns
+    -------
+    :class:`.Profiler`
+        The active profiler. Use it as a context manager or call
+        :meth:`.Profiler.stop` to stop profiling.
+    """
+    return Profiler().start()
+
+
+def phase(name, ir=None, **args):
+    """Span of phase `name` in the active profiler, if any.
+
+    If `ir` is given, its class and number of distinct nodes are recorded.
+    """
+    profiler = _profiler
+    if profiler is None:
+        return _no_phase
+    if ir is not None:
+        args['ir'] = type(ir).__name__
+        args['ir_size'] = len(ir.base_search(lambda _: True))
+    return profiler.phase(name, **args)
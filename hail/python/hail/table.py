@@ -1,6 +1,6 @@
 import collections
 import itertools
-import pandas
+import numpy as np
 import pyspark
 from typing import Optional, Dict, Callable
 
@@ -10,7 +10,7 @@ from hail.expr.expressions import Expression, StructExpression, \
     ExpressionException, TupleExpression, unify_all, NumericExpression, \
     StringExpression, CallExpression, CollectionExpression, DictExpression, \
     IntervalExpression, LocusExpression, NDArrayExpression, expr_array
-from hail.expr.types import hail_type, tstruct, types_match, tarray, tset
+from hail.expr.types import hail_type, tstruct, types_match, tarray, tset, tbool, is_numeric
 from hail.expr.table_type import ttable
 import hail.ir as ir
 from hail.typecheck import typecheck, typecheck_method, dictof, anytype, \
@@ -245,6 +245,22 @@ class GroupedTable(ExprContainer):
                                                self._buffer_size))
 
 
+def _pandas_data_frame():
+    # pandas is slow to import and only needed to convert to and from Pandas
+    import pandas
+    return pandas.DataFrame
+
+
+def _column_to_numpy(values, dtype):
+    if not (is_numeric(dtype) or dtype == tbool):
+        return values
+    if None not in values:
+        return np.array(values, dtype=dtype.to_numpy())
+    if dtype == tbool:
+        return np.array(values, dtype=object)
+    return np.array(values, dtype=np.float64)
+
+
 class Table(ExprContainer):
     """Hail's distributed implementation of a dataframe or SQL table.
 
@@ -339,7 +355,7 @@ class Table(ExprContainer):
     def __init__(self, tir):
         super(Table, self).__init__()
 
-        self._tir = tir
+        self._tir = ir.hash_cons(tir)
         self._type = self._tir.typ
 
         self._row_axis = 'row'
@@ -3236,9 +3252,13 @@ class Table(ExprContainer):
     def to_pandas(self, flatten=True):
         """Converts this table to a Pandas DataFrame.
 
-        Because conversion to Pandas is done through Spark, and Spark
-        cannot represent complex types, types are expanded before
-        flattening or conversion.
+        Rows are collected column-at-a-time and each numeric column is
+        converted directly into a NumPy array. Complex types are expanded
+        before flattening or conversion, as in :meth:`to_spark`.
+
+        Numeric columns with missing values are converted to ``float64``
+        with missing values represented as ``NaN``. Boolean columns with
+        missing values have dtype ``object``.
 
         Parameters
         ----------
@@ -3250,10 +3270,62 @@ class Table(ExprContainer):
         :class:`.pandas.DataFrame`
 
         """
-        return Env.spark_backend('to_pandas').to_pandas(self, flatten)
+        t = self.expand_types()
+        if flatten:
+            t = t.flatten()
+        columns = t._collect_columns()
+        return _pandas_data_frame()(columns, columns=list(columns))
+
+    def to_numpy(self):
+        """Converts the row fields of this table to a two-dimensional NumPy array.
+
+        Examples
+        --------
+
+        >>> a = table1.select(table1.X, table1.Z).key_by().to_numpy()
+
+        Notes
+        -----
+        The result has one row per table row and one column per row field,
+        in field order, including key fields. All row fields must be numeric
+        or boolean. The array's dtype is the smallest NumPy type that can hold
+        every field; numeric fields with missing values are converted to
+        ``float64`` with missing values represented as ``NaN``.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+        """
+        for f, t in self.row.dtype.items():
+            if not (is_numeric(t) or t == tbool):
+                raise ValueError(f"'to_numpy': row field {f!r} has non-numeric type {t}")
+
+        columns = self._collect_columns()
+        n_rows = len(next(iter(columns.values()))) if columns else 0
+        dtype = np.result_type(*[c.dtype for c in columns.values()]) if columns else np.float64
+        if dtype == object:
+            raise ValueError("'to_numpy': boolean row fields must not contain missing values")
+
+        result = np.empty((n_rows, len(columns)), dtype=dtype)
+        for i, c in enumerate(columns.values()):
+            result[:, i] = c
+        return result
+
+    def _collect_columns(self):
+        """Collect the table as a dict from row field name to column.
+
+        The table is collected in a single query as a struct of arrays, one
+        per row field, rather than an array of row structs. Numeric and
+        boolean columns are returned as NumPy arrays, other columns as lists.
+        """
+        fields = list(self.row)
+        rows = self.collect(_localize=False)
+        columns = hl.rbind(rows, lambda rows: hl.struct(**{f: rows.map(lambda r: r[f]) for f in fields}))
+        values = Env.backend().execute(columns._ir)
+        return {f: _column_to_numpy(values[f], self.row[f].dtype) for f in fields}
 
     @staticmethod
-    @typecheck(df=pandas.DataFrame,
+    @typecheck(df=_pandas_data_frame,
                key=oneof(str, sequenceof(str)))
     def from_pandas(df, key=[]) -> 'Table':
         """Create table from Pandas DataFrame
@@ -3,7 +3,7 @@ from .check import (TypeChecker, typecheck, typecheck_method, anytype, anyfunc,
                     dictof, linked_list, setof, oneof, exactly, numeric, char,
                     lazy, enumeration, identity, transformed, func_spec,
                     table_key_type, TypecheckFailure, arg_check, args_check,
-                    kwargs_check)
+                    kwargs_check, _set_typecheck_mode)
 
 __all__ = [
     'TypeChecker',
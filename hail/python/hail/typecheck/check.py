@@ -2,8 +2,11 @@ import re
 import inspect
 import abc
 import collections
+import time
 from decorator import decorator
 
+from .. import profiling
+
 
 class TypecheckFailure(Exception):
     pass
@@ -38,6 +41,10 @@ class TypeChecker(object):
     def format(self, arg):
         return f"{extract(type(arg))}: {arg}"
 
+    def _validates_only(self):
+        """Whether :meth:`check` always returns its argument unchanged."""
+        return False
+
 
 class DeferredChecker(TypeChecker):
     def __init__(self, f):
@@ -63,6 +70,9 @@ class DeferredChecker(TypeChecker):
     def expects(self):
         return self.tc.expects()
 
+    def _validates_only(self):
+        return self.tc._validates_only()
+
 
 class MultipleTypeChecker(TypeChecker):
     def __init__(self, checkers):
@@ -87,6 +97,9 @@ class MultipleTypeChecker(TypeChecker):
     def expects(self):
         return '(' + ' or '.join([c.expects() for c in self.checkers]) + ')'
 
+    def _validates_only(self):
+        return all(c._validates_only() for c in self.checkers)
+
 
 class SequenceChecker(TypeChecker):
     def __init__(self, element_checker):
@@ -228,6 +241,9 @@ class LinkedListChecker(TypeChecker):
     def expects(self):
         return 'linkedlist[%s]' % self.type
 
+    def _validates_only(self):
+        return True
+
 
 class AnyChecker(TypeChecker):
     def __init__(self):
@@ -239,6 +255,9 @@ class AnyChecker(TypeChecker):
     def expects(self):
         return 'any'
 
+    def _validates_only(self):
+        return True
+
 
 class CharChecker(TypeChecker):
     def __init__(self):
@@ -253,6 +272,9 @@ class CharChecker(TypeChecker):
     def expects(self):
         return 'char'
 
+    def _validates_only(self):
+        return True
+
 
 class LiteralChecker(TypeChecker):
     def __init__(self, t):
@@ -267,6 +289,9 @@ class LiteralChecker(TypeChecker):
     def expects(self):
         return extract(self.t)
 
+    def _validates_only(self):
+        return True
+
 
 class LazyChecker(TypeChecker):
     def __init__(self):
@@ -307,6 +332,9 @@ class ExactlyTypeChecker(TypeChecker):
     def expects(self):
         return repr(self.v)
 
+    def _validates_only(self):
+        return True
+
 
 class CoercionChecker(TypeChecker):
     """Type checker that performs argument transformations.
@@ -346,6 +374,9 @@ class AnyFuncChecker(TypeChecker):
     def expects(self):
         return 'function'
 
+    def _validates_only(self):
+        return True
+
 
 class FunctionChecker(TypeChecker):
     def __init__(self, nargs, ret_checker):
@@ -560,6 +591,87 @@ def check_all(f, args, kwargs, checks, is_method):
     return args_, kwargs_
 
 
+def _compile_checks(f, checks, is_method, validate):
+    """Specialize argument checking to the signature of `f`.
+
+    :func:`decorator` binds arguments to the signature before calling the
+    wrapper: every positional parameter is passed positionally, defaults
+    included, followed by any variable positional arguments, and keyword-only
+    and variable keyword arguments are passed by keyword. The returned
+    function relies on that layout and raises :class:`TypecheckFailure`,
+    :class:`IndexError` or :class:`KeyError` when an argument does not check,
+    in which case :func:`check_all` is used to report the error.
+
+    If `validate` is false, checkers that never change their argument are
+    skipped. Returns ``None`` if no checker needs to run.
+    """
+    spec = get_signature(f)
+    check_meta(f, checks, is_method)
+    name = f.__name__
+
+    positional = []
+    keyword = []
+    varargs = None
+    varargs_start = None
+    varkw = None
+    for i, (arg_name, param) in enumerate(spec.parameters.items()):
+        if i == 0 and is_method:
+            continue
+        checker = checks[arg_name]
+        if isinstance(checker, AnyChecker) or (not validate and checker._validates_only()):
+            checker = None
+        if param.kind == param.VAR_POSITIONAL:
+            varargs_start = i
+            if checker is not None:
+                varargs = (arg_name, checker.check)
+        elif param.kind == param.VAR_KEYWORD:
+            if checker is not None:
+                varkw = checker.check
+        elif checker is not None:
+            if param.kind == param.KEYWORD_ONLY:
+                keyword.append((arg_name, checker.check))
+            else:
+                positional.append((i, arg_name, checker.check))
+    if not positional and not keyword and varargs is None and varkw is None:
+        return None
+    positional = tuple(positional)
+    keyword = tuple(keyword)
+    named = frozenset(spec.parameters)
+
+    def check(args, kwargs):
+        args_ = list(args)
+        for i, arg_name, c in positional:
+            args_[i] = c(args_[i], name, arg_name)
+        if varargs is not None:
+            arg_name, c = varargs
+            for j in range(varargs_start, len(args_)):
+                args_[j] = c(args_[j], name, arg_name)
+        if keyword or varkw is not None:
+            kwargs = dict(kwargs)
+            for arg_name, c in keyword:
+                kwargs[arg_name] = c(kwargs[arg_name], name, arg_name)
+            if varkw is not None:
+                for kwarg_name, arg in kwargs.items():
+                    if kwarg_name not in named:
+                        kwargs[kwarg_name] = varkw(arg, name, kwarg_name)
+        return args_, kwargs
+
+    return check
+
+
+# 'fast' runs every checker through a per-function specialized check; 'off'
+# additionally skips checkers that only validate, running those that convert
+# their argument (for instance, Python values to expressions).
+_mode = 'fast'
+
+
+def _set_typecheck_mode(mode):
+    global _mode
+    if mode not in ('fast', 'off'):
+        raise ValueError(f"typecheck mode must be 'fast' or 'off', found '{mode}'")
+    _mode = mode
+
+
 def typecheck_method(**checkers):
     return _make_dec(checkers, is_method=True)
 
@@ -570,10 +682,34 @@ def typecheck(**checkers):
 
 def _make_dec(checkers, is_method):
     checkers = {k: only(v) for k, v in checkers.items()}
+    # specialized checks, keyed on function and mode; the same decorator may
+    # be applied to several functions
+    compiled = {}
+
+    def check_args(f, args, kwargs):
+        key = (f, _mode)
+        try:
+            check = compiled[key]
+        except KeyError:
+            check = compiled[key] = _compile_checks(f, checkers, is_method, _mode == 'fast')
+        if check is None:
+            return args, kwargs
+        try:
+            return check(args, kwargs)
+        except (TypecheckFailure, IndexError, KeyError):
+            pass
+        # report the error, outside the except clause to keep it out of the traceback
+        return check_all(f, args, dict(kwargs), checkers, is_method=is_method)
 
     @decorator
     def wrapper(__original_func, *args, **kwargs):
-        args_, kwargs_ = check_all(__original_func, args, kwargs, checkers, is_method=is_method)
+        profiler = profiling._profiler
+        if profiler is None:
+            args_, kwargs_ = check_args(__original_func, args, kwargs)
+        else:
+            start = time.perf_counter()
+            args_, kwargs_ = check_args(__original_func, args, kwargs)
+            profiler.add('typecheck', time.perf_counter() - start)
         return __original_func(*args_, **kwargs_)
 
     return wrapper
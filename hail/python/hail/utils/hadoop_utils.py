@@ -1,6 +1,6 @@
 from hail.utils.java import Env
-from hail.typecheck import typecheck, enumeration
-from typing import Dict, List
+from hail.typecheck import typecheck, enumeration, oneof, sequenceof
+from typing import Dict, List, Union
 
 
 @typecheck(path=str,
@@ -79,9 +79,9 @@ def hadoop_open(path: str, mode: str = 'r', buffer_size: int = 8192):
     return Env.fs().open(path, mode, buffer_size)
 
 
-@typecheck(src=str,
+@typecheck(src=oneof(str, sequenceof(str)),
            dest=str)
-def hadoop_copy(src, dest):
+def hadoop_copy(src: Union[str, List[str]], dest: str):
     """Copy a file through the Hadoop filesystem API.
     Supports distributed file systems like hdfs, gs, and s3.
 
@@ -92,6 +92,11 @@ def hadoop_copy(src, dest):
     >>> hadoop_copy('gs://hail-common/LCR.interval_list',
     ...             'file:///mnt/data/LCR.interval_list') # doctest: +SKIP
 
+    Copy several files into a local directory:
+
+    >>> hadoop_copy(['gs://my-bucket/a.tsv', 'gs://my-bucket/b.tsv'],
+    ...             'file:///mnt/data/') # doctest: +SKIP
+
     Notes
     ----
 
@@ -104,14 +109,19 @@ def hadoop_copy(src, dest):
     The provided source and destination file paths must be URIs
     (uniform resource identifiers).
 
+    If `src` is a list, each file is copied into the directory `dest`. On the
+    local and service backends, the files are copied concurrently.
+
     Parameters
     ----------
-    src: :class:`str`
-        Source file URI.
+    src: :class:`str` or :obj:`list` of :class:`str`
+        Source file URI or URIs.
     dest: :class:`str`
-        Destination file URI.
+        Destination file URI, or destination directory URI if `src` is a list.
     """
-    return Env.fs().copy(src, dest)
+    if isinstance(src, str):
+        return Env.fs().copy(src, dest)
+    return Env.fs().copy_many(src, dest)
 
 
 def hadoop_exists(path: str) -> bool:
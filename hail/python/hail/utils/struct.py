@@ -161,6 +161,91 @@ class Struct(Mapping):
         return Struct(**d)
 
 
+class _TupleStruct(Struct):
+    """Struct storing its values in a tuple.
+
+    Field names are shared by all instances of a class made by
+    :func:`_tuple_struct_class`, so an instance costs little more than its
+    tuple of values. Used for structs converted from query results, which
+    are often collected in bulk. Compares equal to, and hashes like, a
+    :class:`.Struct` with the same fields.
+    """
+
+    __slots__ = ('_values',)
+    _names = ()
+    _index = {}
+
+    def __init__(self, values):
+        self._values = values
+
+    @property
+    def _fields(self):
+        return dict(zip(self._names, self._values))
+
+    def __getattr__(self, item):
+        i = self._index.get(item)
+        if i is not None:
+            return self._values[i]
+        return super().__getattr__(item)
+
+    def __getitem__(self, item):
+        i = self._index.get(item)
+        if i is None:
+            if not isinstance(item, str):
+                return super().__getitem__(item)
+            raise KeyError(get_nice_field_error(self, item))
+        return self._values[i]
+
+    def __contains__(self, item):
+        return item in self._index
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def items(self):
+        return zip(self._names, self._values)
+
+    def values(self):
+        return self._values
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return self._values == other._values
+        return isinstance(other, Struct) and self._fields == other._fields
+
+    __hash__ = Struct.__hash__
+
+    def __reduce__(self):
+        return _make_tuple_struct, (self._names, self._values)
+
+
+_tuple_struct_classes = {}
+
+
+def _tuple_struct_class(names):
+    """The :class:`_TupleStruct` subclass for the field names `names`, a
+    tuple of strings."""
+    cls = _tuple_struct_classes.get(names)
+    if cls is None:
+        attrs = {'__slots__': (),
+                 '_names': names,
+                 '_index': {name: i for i, name in enumerate(names)}}
+        for i, name in enumerate(names):
+            # like Struct, fields shadow methods of the same name
+            if name.isidentifier() and not name.startswith('_'):
+                attrs[name] = property(lambda self, i=i: self._values[i])
+        cls = type('Struct', (_TupleStruct,), attrs)
+        _tuple_struct_classes[names] = cls
+    return cls
+
+
+def _make_tuple_struct(names, values):
+    return _tuple_struct_class(names)(values)
+
+
 @typecheck(struct=Struct)
 def to_dict(struct):
     return dict(struct.items())
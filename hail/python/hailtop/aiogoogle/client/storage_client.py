@@ -203,7 +203,8 @@ class ResumableInsertObjectStream(WritableStream):
                                                'Content-Length': '0',
                                                'Content-Range': f'bytes */{total_size_str}'
                                            },
-                                           raise_for_status=False)
+                                           raise_for_status=False,
+                                           allow_redirects=False)
             if resp.status >= 200 and resp.status < 300:
                 assert self._closed
                 assert total_size is not None
@@ -252,6 +253,8 @@ class ResumableInsertObjectStream(WritableStream):
                                       'Content-Range': range
                                   },
                                   raise_for_status=False,
+                                  # 308 is Resume Incomplete here, not a redirect
+                                  allow_redirects=False,
                                   retry=False)) as put_task:
             for chunk in self._write_buffer.chunks(n):
                 async with _TaskManager(it.feed(chunk)) as feed_task:
@@ -322,8 +325,15 @@ class GetObjectStream(ReadableStream):
 
 
 class StorageClient(BaseClient):
-    def __init__(self, **kwargs):
-        super().__init__('https://storage.googleapis.com/storage/v1', **kwargs)
+    DEFAULT_ENDPOINT = 'https://storage.googleapis.com'
+
+    def __init__(self, *, endpoint: Optional[str] = None, **kwargs):
+        # `endpoint` points the client at a server implementing the
+        # Storage JSON API other than Google's, for example in tests
+        if endpoint is None:
+            endpoint = self.DEFAULT_ENDPOINT
+        self._endpoint = endpoint.rstrip('/')
+        super().__init__(f'{self._endpoint}/storage/v1', **kwargs)
 
     # docs:
     # https://cloud.google.com/storage/docs/json_api/v1
@@ -342,7 +352,7 @@ class StorageClient(BaseClient):
 
         if 'data' in params:
             return await self._session.post(
-                f'https://storage.googleapis.com/upload/storage/v1/b/{bucket}/o',
+                f'{self._endpoint}/upload/storage/v1/b/{bucket}/o',
                 **kwargs)
 
         upload_type = params.get('uploadType')
@@ -354,7 +364,7 @@ class StorageClient(BaseClient):
             it: FeedableAsyncIterable[bytes] = FeedableAsyncIterable()
             kwargs['data'] = aiohttp.AsyncIterablePayload(it)
             request_task = asyncio.ensure_future(self._session.post(
-                f'https://storage.googleapis.com/upload/storage/v1/b/{bucket}/o',
+                f'{self._endpoint}/upload/storage/v1/b/{bucket}/o',
                 retry=False,
                 **kwargs))
             return InsertObjectStream(it, request_task)
@@ -364,7 +374,7 @@ class StorageClient(BaseClient):
         assert upload_type == 'resumable'
         chunk_size = kwargs.get('bufsize', 256 * 1024)
         resp = await self._session.post(
-            f'https://storage.googleapis.com/upload/storage/v1/b/{bucket}/o',
+            f'{self._endpoint}/upload/storage/v1/b/{bucket}/o',
             **kwargs)
         session_url = resp.headers['Location']
         return ResumableInsertObjectStream(self._session, session_url, chunk_size)
@@ -380,7 +390,7 @@ class StorageClient(BaseClient):
         params['alt'] = 'media'
 
         resp = await self._session.get(
-            f'https://storage.googleapis.com/storage/v1/b/{bucket}/o/{urllib.parse.quote(name, safe="")}', **kwargs)
+            f'{self._base_url}/b/{bucket}/o/{urllib.parse.quote(name, safe="")}', **kwargs)
         return GetObjectStream(resp)
 
     async def get_object_metadata(self, bucket: str, name: str, **kwargs) -> Dict[str, str]:
@@ -421,6 +431,14 @@ class GetObjectFileStatus(FileStatus):
     async def __getitem__(self, key: str) -> str:
         return self._items[key]
 
+    async def checksum(self, algorithm: str) -> Optional[str]:
+        # composite objects have no MD5 hash
+        if algorithm == 'crc32c':
+            return self._items.get('crc32c')
+        if algorithm == 'md5':
+            return self._items.get('md5Hash')
+        return None
+
 
 class GoogleStorageFileListEntry(FileListEntry):
     def __init__(self, url: str, items: Optional[Dict[str, Any]]):
@@ -571,10 +589,17 @@ class GoogleStorageAsyncFS(AsyncFS):
         bucket, name = self._get_bucket_name(url)
         return await self._storage_client.get_object(bucket, name)
 
-    async def open_from(self, url: str, start: int) -> ReadableStream:
+    async def open_from(self, url: str, start: int, end: Optional[int] = None) -> ReadableStream:
         bucket, name = self._get_bucket_name(url)
+        if end is None:
+            byte_range = f'bytes={start}-'
+        else:
+            # a bounded range lets the connection be reused once the
+            # slice is read
+            assert end > start
+            byte_range = f'bytes={start}-{end - 1}'
         return await self._storage_client.get_object(
-            bucket, name, headers={'Range': f'bytes={start}-'})
+            bucket, name, headers={'Range': byte_range})
 
     async def create(self, url: str, retry_writes: bool = True) -> WritableStream:
         bucket, name = self._get_bucket_name(url)
@@ -587,7 +612,9 @@ class GoogleStorageAsyncFS(AsyncFS):
             self,
             sema: asyncio.Semaphore,
             url: str,
-            num_parts: int) -> GoogleStorageMultiPartCreate:
+            num_parts: int,
+            *,
+            size: Optional[int] = None) -> GoogleStorageMultiPartCreate:  # pylint: disable=unused-argument
         return GoogleStorageMultiPartCreate(sema, self, url, num_parts)
 
     async def staturl(self, url: str) -> str:
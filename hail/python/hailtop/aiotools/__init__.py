@@ -3,7 +3,7 @@ from .stream import (
     blocking_writable_stream_to_async)
 from .fs import (
     FileStatus, FileListEntry, AsyncFS, LocalAsyncFS, RouterAsyncFS, Transfer,
-    FileAndDirectoryError, MultiPartCreate)
+    FileAndDirectoryError, MultiPartCreate, CopyTuner)
 from .utils import FeedableAsyncIterable
 from .tasks import BackgroundTaskManager
 
@@ -21,5 +21,6 @@ __all__ = [
     'BackgroundTaskManager',
     'Transfer',
     'FileAndDirectoryError',
-    'MultiPartCreate'
+    'MultiPartCreate',
+    'CopyTuner'
 ]
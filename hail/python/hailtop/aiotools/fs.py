@@ -1,20 +1,36 @@
 from typing import Any, Optional, List, Type, BinaryIO, cast, Set, AsyncIterator, Union, Dict
 from types import TracebackType
 import abc
+import base64
+import errno
+import hashlib
+import json
+import logging
 import os
 import os.path
 import io
 import stat
 import shutil
 import asyncio
+import time
 from concurrent.futures import ThreadPoolExecutor
 import urllib.parse
 import humanize
+try:
+    import google_crc32c
+except ImportError:
+    google_crc32c = None
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 from hailtop.utils import (
     retry_transient_errors, blocking_to_async, url_basename, url_join, bounded_gather2,
     time_msecs, humanize_timedelta_msecs)
 from .stream import ReadableStream, WritableStream, blocking_readable_stream_to_async, blocking_writable_stream_to_async
 
+log = logging.getLogger('aiotools.fs')
+
 
 class FileStatus(abc.ABC):
     @abc.abstractmethod
@@ -25,6 +41,12 @@ class FileStatus(abc.ABC):
     async def __getitem__(self, key: str) -> Any:
         pass
 
+    async def checksum(self, algorithm: str) -> Optional[str]:
+        '''Return the base64-encoded `algorithm` ('crc32c' or 'md5') digest
+        of the file contents, as in Google Cloud Storage object metadata, or
+        None if the file system cannot provide it.'''
+        return None
+
 
 class FileListEntry(abc.ABC):
     @abc.abstractmethod
@@ -82,7 +104,9 @@ class AsyncFS(abc.ABC):
         pass
 
     @abc.abstractmethod
-    async def open_from(self, url: str, start: int) -> ReadableStream:
+    async def open_from(self, url: str, start: int, end: Optional[int] = None) -> ReadableStream:
+        '''Open `url` for reading from byte `start` up to, but excluding,
+        byte `end`, or to the end of the file if `end` is None.'''
         pass
 
     @abc.abstractmethod
@@ -94,7 +118,11 @@ class AsyncFS(abc.ABC):
             self,
             sema: asyncio.Semaphore,
             url: str,
-            num_parts: int) -> MultiPartCreate:
+            num_parts: int,
+            *,
+            size: Optional[int] = None) -> MultiPartCreate:
+        '''Create `url` from `num_parts` parts written concurrently.  `size`,
+        if known, is the size of the complete file.'''
         pass
 
     @abc.abstractmethod
@@ -151,9 +179,11 @@ class AsyncFS(abc.ABC):
 
 
 class LocalStatFileStatus(FileStatus):
-    def __init__(self, stat_result):
+    def __init__(self, stat_result, path: Optional[str] = None, fs: Optional['LocalAsyncFS'] = None):
         self._stat_result = stat_result
         self._items = None
+        self._path = path
+        self._fs = fs
 
     async def size(self) -> int:
         return self._stat_result.st_size
@@ -161,11 +191,17 @@ class LocalStatFileStatus(FileStatus):
     async def __getitem__(self, key: str) -> Any:
         raise KeyError(key)
 
+    async def checksum(self, algorithm: str) -> Optional[str]:
+        if self._path is None or self._fs is None:
+            return None
+        return await self._fs._checksum(self._path, self._stat_result, algorithm)
+
 
 class LocalFileListEntry(FileListEntry):
-    def __init__(self, thread_pool, base_url, entry):
+    def __init__(self, thread_pool, base_url, entry, fs: Optional['LocalAsyncFS'] = None):
         assert '/' not in entry.name
         self._thread_pool = thread_pool
+        self._fs = fs
         if not base_url.endswith('/'):
             base_url = f'{base_url}/'
         self._base_url = base_url
@@ -192,7 +228,8 @@ class LocalFileListEntry(FileListEntry):
         if self._status is None:
             if await self.is_dir():
                 raise ValueError("directory has no file status")
-            self._status = LocalStatFileStatus(await blocking_to_async(self._thread_pool, self._entry.stat))
+            self._status = LocalStatFileStatus(await blocking_to_async(self._thread_pool, self._entry.stat),
+                                               self._entry.path, self._fs)
         return self._status
 
 
@@ -222,11 +259,97 @@ class LocalMultiPartCreate(MultiPartCreate):
                 pass
 
 
+def _preallocate(fd: int, size: int) -> None:
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.ENOSYS):
+                raise
+    os.ftruncate(fd, size)
+
+
+# FICLONE from linux/fs.h
+_FICLONE = 0x40049409
+
+
+def _reflink(src_fd: int, dest_fd: int) -> bool:
+    '''Make `dest_fd` share the extents of `src_fd`, returning False if the
+    file system cannot.'''
+    if fcntl is None or not hasattr(os, 'copy_file_range'):
+        # not Linux
+        return False
+    try:
+        fcntl.ioctl(dest_fd, _FICLONE, src_fd)
+        return True
+    except OSError:
+        return False
+
+
+class _FdCopier:
+    '''Copies from the current offset of one file descriptor to that of
+    another with the first of copy_file_range, sendfile and reads into a
+    reusable buffer that works for the pair.'''
+
+    # errors meaning the method is not supported for these files
+    UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.ESPIPE}
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, src_fd: int, dest_fd: int):
+        self._src_fd = src_fd
+        self._dest_fd = dest_fd
+        self._methods = []
+        if hasattr(os, 'copy_file_range'):
+            self._methods.append(self._copy_file_range)
+        if hasattr(os, 'sendfile'):
+            self._methods.append(self._sendfile)
+        self._methods.append(self._readinto)
+        self._buffer: Optional[memoryview] = None
+
+    def _copy_file_range(self, n: int) -> int:
+        return os.copy_file_range(self._src_fd, self._dest_fd, n)
+
+    def _sendfile(self, n: int) -> int:
+        return os.sendfile(self._dest_fd, self._src_fd, None, n)
+
+    def _readinto(self, n: int) -> int:
+        if self._buffer is None:
+            self._buffer = memoryview(bytearray(self.BUFFER_SIZE))
+        copied = 0
+        while copied < n:
+            view = self._buffer[:min(len(self._buffer), n - copied)]
+            k = os.readv(self._src_fd, [view])
+            if k == 0:
+                break
+            written = 0
+            while written < k:
+                written += os.write(self._dest_fd, view[written:k])
+            copied += k
+        return copied
+
+    def copy(self, n: int) -> int:
+        '''Copy up to `n` bytes, returning the number copied, 0 at the end
+        of the source.'''
+        while True:
+            try:
+                return self._methods[0](n)
+            except OSError as e:
+                if e.errno not in self.UNSUPPORTED or len(self._methods) == 1:
+                    raise
+                self._methods.pop(0)
+
+
 class LocalAsyncFS(AsyncFS):
+    CHECKSUM_XATTR = 'user.hailtop.checksums'
+    COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
     def __init__(self, thread_pool: ThreadPoolExecutor, max_workers=None):
         if not thread_pool:
             thread_pool = ThreadPoolExecutor(max_workers=max_workers)
         self._thread_pool = thread_pool
+        # path -> (size, mtime_ns, inode, {algorithm: checksum})
+        self._checksums: Dict[str, Any] = {}
 
     def schemes(self) -> Set[str]:
         return {'file'}
@@ -250,32 +373,102 @@ class LocalAsyncFS(AsyncFS):
         f = await blocking_to_async(self._thread_pool, open, self._get_path(url), 'rb')
         return blocking_readable_stream_to_async(self._thread_pool, cast(BinaryIO, f))
 
-    async def open_from(self, url: str, start: int) -> ReadableStream:
+    async def open_from(self, url: str, start: int, end: Optional[int] = None) -> ReadableStream:
         f = await blocking_to_async(self._thread_pool, open, self._get_path(url), 'rb')
         f.seek(start, io.SEEK_SET)
-        return blocking_readable_stream_to_async(self._thread_pool, cast(BinaryIO, f))
+        length = None if end is None else max(end - start, 0)
+        return blocking_readable_stream_to_async(self._thread_pool, cast(BinaryIO, f), length)
 
     async def create(self, url: str, *, retry_writes: bool = True) -> WritableStream:  # pylint: disable=unused-argument
         f = await blocking_to_async(self._thread_pool, open, self._get_path(url), 'wb')
         return blocking_writable_stream_to_async(self._thread_pool, cast(BinaryIO, f))
 
+    async def copy_file(self, src_url: str, dest_url: str, *, progress=None) -> None:
+        '''Copy the file `src_url` to `dest_url` without moving the data
+        through Python: clone it where the file system supports reflinks,
+        else copy it in the kernel with copy_file_range or sendfile, in
+        chunks of `COPY_CHUNK_SIZE` bytes.  `progress`, if given, is awaited
+        with the number of bytes copied after each chunk.'''
+        srcf = await blocking_to_async(self._thread_pool, open, self._get_path(src_url), 'rb')
+        try:
+            destf = await blocking_to_async(self._thread_pool, open, self._get_path(dest_url), 'wb')
+            try:
+                src_fd, dest_fd = srcf.fileno(), destf.fileno()
+                if await blocking_to_async(self._thread_pool, _reflink, src_fd, dest_fd):
+                    if progress is not None:
+                        await progress(os.fstat(src_fd).st_size)
+                    return
+                copier = _FdCopier(src_fd, dest_fd)
+                while True:
+                    n = await blocking_to_async(self._thread_pool, copier.copy, self.COPY_CHUNK_SIZE)
+                    if n == 0:
+                        return
+                    if progress is not None:
+                        await progress(n)
+            finally:
+                await blocking_to_async(self._thread_pool, destf.close)
+        finally:
+            await blocking_to_async(self._thread_pool, srcf.close)
+
     async def multi_part_create(
             self,
             sema: asyncio.Semaphore,  # pylint: disable=unused-argument
             url: str,
-            num_parts: int) -> MultiPartCreate:
-        # create an empty file
+            num_parts: int,
+            *,
+            size: Optional[int] = None) -> MultiPartCreate:
+        # create an empty file, preallocated if the size is known, so the
+        # parts do not extend it piecemeal
         # will be opened r+b to write the parts
-        async with await self.create(url):
-            pass
-        return LocalMultiPartCreate(self, self._get_path(url), num_parts)
+        path = self._get_path(url)
+        f = await blocking_to_async(self._thread_pool, open, path, 'wb')
+        try:
+            if size:
+                await blocking_to_async(self._thread_pool, _preallocate, f.fileno(), size)
+        finally:
+            f.close()
+        return LocalMultiPartCreate(self, path, num_parts)
 
     async def statfile(self, url: str) -> LocalStatFileStatus:
         path = self._get_path(url)
         stat_result = await blocking_to_async(self._thread_pool, os.stat, path)
         if stat.S_ISDIR(stat_result.st_mode):
             raise FileNotFoundError(f'is directory: {url}')
-        return LocalStatFileStatus(stat_result)
+        return LocalStatFileStatus(stat_result, path, self)
+
+    async def _checksum(self, path: str, stat_result, algorithm: str) -> Optional[str]:
+        if algorithm == 'crc32c' and google_crc32c is None:
+            return None
+        if algorithm not in ('crc32c', 'md5'):
+            return None
+        stamp = (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+        cached = self._checksums.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, await blocking_to_async(self._thread_pool, self._read_checksum_xattr, path, stamp))
+            self._checksums[path] = cached
+        checksums = cached[1]
+        if algorithm not in checksums:
+            checksums[algorithm] = await blocking_to_async(self._thread_pool, _compute_checksum, path, algorithm)
+            await blocking_to_async(self._thread_pool, self._write_checksum_xattr, path, stamp, checksums)
+        return checksums[algorithm]
+
+    # checksums are kept in an extended attribute of the file, where
+    # supported, so later processes need not read the file again
+    def _read_checksum_xattr(self, path: str, stamp) -> Dict[str, str]:
+        try:
+            saved = json.loads(os.getxattr(path, self.CHECKSUM_XATTR))
+        except (AttributeError, OSError, ValueError):
+            return {}
+        if saved.get('stamp') != list(stamp):
+            return {}
+        return saved['checksums']
+
+    def _write_checksum_xattr(self, path: str, stamp, checksums: Dict[str, str]) -> None:
+        try:
+            os.setxattr(path, self.CHECKSUM_XATTR,
+                        json.dumps({'stamp': list(stamp), 'checksums': checksums}).encode('utf-8'))
+        except (AttributeError, OSError):
+            pass
 
     # entries has no type hint because the return type of os.scandir
     # appears to be a private type, posix.ScandirIterator.
@@ -302,7 +495,7 @@ class LocalAsyncFS(AsyncFS):
     async def _listfiles_flat(self, url: str, entries) -> AsyncIterator[FileListEntry]:
         with entries:
             for entry in entries:
-                yield LocalFileListEntry(self._thread_pool, url, entry)
+                yield LocalFileListEntry(self._thread_pool, url, entry, self)
 
     async def listfiles(self, url: str, recursive: bool = False) -> AsyncIterator[FileListEntry]:
         path = self._get_path(url)
@@ -343,6 +536,20 @@ class LocalAsyncFS(AsyncFS):
         await blocking_to_async(self._thread_pool, shutil.rmtree, path)
 
 
+def _compute_checksum(path: str, algorithm: str) -> str:
+    if algorithm == 'crc32c':
+        h = google_crc32c.Checksum()
+    else:
+        h = hashlib.md5()
+    with open(path, 'rb') as f:
+        while True:
+            b = f.read(1024 * 1024)
+            if not b:
+                break
+            h.update(b)
+    return base64.b64encode(h.digest()).decode('ascii')
+
+
 class FileAndDirectoryError(Exception):
     pass
 
@@ -373,6 +580,8 @@ class SourceReport:
         self._source_type: Optional[str] = None
         self._files = 0
         self._bytes = 0
+        self._skipped_files = 0
+        self._skipped_bytes = 0
         self._errors = 0
         self._complete = 0
         self._first_file_error: Optional[Dict[str, Any]] = None
@@ -435,7 +644,7 @@ class CopyReport:
             else:
                 source_reports.extend(transfer_report._source_report)
 
-        if isinstance(self._transfer_report, Transfer):
+        if isinstance(self._transfer_report, TransferReport):
             total_transfers = 1
             add_source_reports(self._transfer_report)
         else:
@@ -446,38 +655,197 @@ class CopyReport:
         total_sources = len(source_reports)
         total_files = sum([sr._files for sr in source_reports])
         total_bytes = sum([sr._bytes for sr in source_reports])
+        skipped_files = sum([sr._skipped_files for sr in source_reports])
+        skipped_bytes = sum([sr._skipped_bytes for sr in source_reports])
+        copied_bytes = total_bytes - skipped_bytes
 
         print('Transfer summary:')
         print(f'  Transfers: {total_transfers}')
         print(f'  Sources: {total_sources}')
         print(f'  Files: {total_files}')
         print(f'  Bytes: {humanize.naturalsize(total_bytes)}')
+        if skipped_files:
+            print(f'  Skipped (unchanged): {skipped_files} files, {humanize.naturalsize(skipped_bytes)}')
+            print(f'  Copied: {total_files - skipped_files} files, {humanize.naturalsize(copied_bytes)}')
         print(f'  Time: {humanize_timedelta_msecs(self._duration)}')
-        print(f'  Average transfer rate: {humanize.naturalsize(total_bytes / (self._duration / 1000))}/s')
+        print(f'  Average transfer rate: {humanize.naturalsize(copied_bytes / (self._duration / 1000))}/s')
 
         print('Sources:')
         for sr in source_reports:
-            print(f'  {sr._source}: {sr._files} files, {humanize.naturalsize(sr._bytes)}')
+            skipped = f' ({sr._skipped_files} unchanged)' if sr._skipped_files else ''
+            print(f'  {sr._source}: {sr._files} files{skipped}, {humanize.naturalsize(sr._bytes)}')
 
 
 class UnexpectedEOFError(Exception):
     pass
 
 
+class CopyTuner:
+    '''Chooses part sizes, buffer sizes and the number of concurrent
+    reads and writes for a copy, adapting them to the throughput observed
+    while the copy runs.
+
+    Every stream moving bytes, a whole small file or one part of a large
+    one, holds a slot.  Every `TUNING_INTERVAL` seconds the aggregate
+    throughput is compared with that of the previous interval: while the
+    slots are all in use and adding slots still raises throughput, the
+    number of slots grows; when the last increase did not help, it is
+    undone.  If `bandwidth` (bytes per second) is given, the copy is
+    throttled to it and slots stop growing close to it.
+
+    Part sizes aim for parts that each take `PART_SECONDS` at the observed
+    per-stream throughput.  Once throughput has been measured, they are
+    also made small enough to spread a file over all slots.  Before that,
+    parts are the historical 128MiB.
+    '''
+
+    MAX_PARALLELISM = 512
+    TUNING_INTERVAL = 1.0
+
+    MIN_PART_SIZE = 32 * 1024 * 1024
+    MAX_PART_SIZE = 1024 * 1024 * 1024
+    MAX_PARTS = 10000
+    PART_SECONDS = 4
+
+    MIN_BUFFER_SIZE = 64 * 1024
+    MAX_BUFFER_SIZE = 8 * 1024 * 1024
+
+    # assumed throughput of a single stream before any is observed, this
+    # gives the historical 128MiB parts and 256KiB buffers
+    INITIAL_STREAM_THROUGHPUT = 32 * 1024 * 1024
+
+    # clock the tuning intervals and the bandwidth budget are measured with
+    _clock = staticmethod(time.monotonic)
+
+    def __init__(self, *, bandwidth: Optional[float] = None, parallelism: int = 32, max_parallelism: int = MAX_PARALLELISM):
+        if bandwidth is not None and bandwidth <= 0:
+            raise ValueError(f'bandwidth must be positive, found {bandwidth}')
+        if not 1 <= parallelism <= max_parallelism:
+            raise ValueError(f'parallelism must be between 1 and {max_parallelism}, found {parallelism}')
+        self.bandwidth = bandwidth
+        self.max_parallelism = max_parallelism
+        self._limit = parallelism
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+        self._window_start = self._clock()
+        self._window_bytes = 0
+        self._window_max_in_flight = 0
+        self._throughput: Optional[float] = None
+        self._stream_throughput = float(self.INITIAL_STREAM_THROUGHPUT)
+        self._raised_from: Optional[int] = None
+        self._hold = 0
+
+        self._budget_time = self._window_start
+
+    @property
+    def parallelism(self) -> int:
+        return self._limit
+
+    @property
+    def throughput(self) -> Optional[float]:
+        '''Aggregate throughput in bytes per second over the last tuning
+        interval, or None before the first interval ends.'''
+        return self._throughput
+
+    def part_size(self, size: int) -> int:
+        '''Part size for a file of `size` bytes.  Files no larger than the
+        part size are copied in one stream.'''
+        part_size = self._stream_throughput * self.PART_SECONDS
+        if self._throughput is not None:
+            part_size = min(part_size, size / self._limit)
+        part_size = max(self.MIN_PART_SIZE, min(self.MAX_PART_SIZE, part_size), size / self.MAX_PARTS)
+        # round up to a whole MiB
+        mib = 1024 * 1024
+        return int((part_size + mib - 1) // mib * mib)
+
+    def buffer_size(self) -> int:
+        '''Size of the reads of a stream, about 1/128 s of data.'''
+        target = self._stream_throughput / 128
+        buffer_size = self.MIN_BUFFER_SIZE
+        while buffer_size < target and buffer_size < self.MAX_BUFFER_SIZE:
+            buffer_size *= 2
+        return buffer_size
+
+    async def __aenter__(self) -> 'CopyTuner':
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+            self._window_max_in_flight = max(self._window_max_in_flight, self._in_flight)
+        return self
+
+    async def __aexit__(self,
+                        exc_type: Optional[Type[BaseException]],
+                        exc_val: Optional[BaseException],
+                        exc_tb: Optional[TracebackType]) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    async def transferred(self, n: int) -> None:
+        '''Record that a stream moved `n` bytes, waiting if that exceeds the
+        bandwidth budget.'''
+        now = self._clock()
+        self._window_bytes += n
+        if now - self._window_start >= self.TUNING_INTERVAL:
+            await self._tune(now)
+
+        if self.bandwidth is not None:
+            # token bucket allowing bursts of up to one second of bandwidth
+            self._budget_time = max(self._budget_time, now - 1.0) + n / self.bandwidth
+            if self._budget_time > now:
+                await asyncio.sleep(self._budget_time - now)
+
+    async def _tune(self, now: float) -> None:
+        throughput = self._window_bytes / (now - self._window_start)
+        previous = self._throughput
+        limit = self._limit
+        saturated = self._window_max_in_flight >= limit
+
+        if self._raised_from is not None and previous is not None and throughput < previous * 1.05:
+            # the last increase did not pay off, undo it and stay put a while
+            limit = self._raised_from
+            self._raised_from = None
+            self._hold = 10
+        elif self._hold > 0:
+            self._hold -= 1
+            self._raised_from = None
+        elif (saturated
+              and limit < self.max_parallelism
+              and (self.bandwidth is None or throughput < 0.9 * self.bandwidth)):
+            self._raised_from = limit
+            limit = min(self.max_parallelism, max(limit + 1, limit * 5 // 4))
+        else:
+            self._raised_from = None
+
+        if self._window_max_in_flight > 0:
+            self._stream_throughput = max(throughput / self._window_max_in_flight, 1.0)
+        self._throughput = throughput
+        self._window_start = now
+        self._window_bytes = 0
+        self._window_max_in_flight = self._in_flight
+
+        if limit != self._limit:
+            async with self._cond:
+                self._limit = limit
+                self._cond.notify_all()
+
+
 class SourceCopier:
     '''This class implements copy from a single source.  In general, a
     transfer will have multiple sources, and a SourceCopier will be
     created for each source.
     '''
 
-    PART_SIZE = 128 * 1024 * 1024
-
-    def __init__(self, router_fs: 'RouterAsyncFS', src: str, dest: str, treat_dest_as: str, dest_type_task):
+    def __init__(self, router_fs: 'RouterAsyncFS', src: str, dest: str, treat_dest_as: str, dest_type_task, sync: bool = False,
+                 tuner: Optional[CopyTuner] = None):
         self.router_fs = router_fs
+        self.tuner = tuner if tuner is not None else CopyTuner()
         self.src = src
         self.dest = dest
         self.treat_dest_as = treat_dest_as
         self.dest_type_task = dest_type_task
+        self.sync = sync
 
         self.src_is_file: Optional[bool] = None
         self.src_is_dir: Optional[bool] = None
@@ -490,10 +858,41 @@ class SourceCopier:
         if self.pending == 0:
             self.barrier.set()
 
+    def _is_local(self, url: str) -> bool:
+        return isinstance(self.router_fs._get_fs(url), LocalAsyncFS)
+
+    async def _copy_stream(self, srcf: ReadableStream, destf: WritableStream, n: Optional[int], reuse_buffer: bool) -> None:
+        '''Copy `n` bytes, or all remaining bytes if `n` is None, from
+        `srcf` to `destf`, raising :class:`UnexpectedEOFError` if `srcf`
+        ends before `n` bytes.  With `reuse_buffer`, which requires `destf` to
+        consume what it is given before returning, the data is read into a
+        single buffer instead of a new bytes object per read.'''
+        buffer = None
+        while n is None or n > 0:
+            buffer_size = self.tuner.buffer_size()
+            if n is not None:
+                buffer_size = min(buffer_size, n)
+            if reuse_buffer:
+                if buffer is None or len(buffer) < buffer_size:
+                    buffer = memoryview(bytearray(buffer_size))
+                k = await srcf.readinto(buffer[:buffer_size])
+                b = buffer[:k]
+            else:
+                b = await srcf.read(buffer_size)
+            if not b:
+                if n is not None:
+                    raise UnexpectedEOFError()
+                return
+            written = await destf.write(b)
+            assert written == len(b)
+            await self.tuner.transferred(written)
+            if n is not None:
+                n -= len(b)
+
     async def _copy_file(self, srcfile: str, destfile: str) -> None:
         assert not destfile.endswith('/')
 
-        async with await self.router_fs.open(srcfile) as srcf:
+        async with self.tuner, await self.router_fs.open(srcfile) as srcf:
             try:
                 destf = await self.router_fs.create(destfile, retry_writes=False)
             except FileNotFoundError:
@@ -501,59 +900,86 @@ class SourceCopier:
                 destf = await self.router_fs.create(destfile)
 
             async with destf:
-                while True:
-                    b = await srcf.read(Copier.BUFFER_SIZE)
-                    if not b:
-                        return
-                    written = await destf.write(b)
-                    assert written == len(b)
+                await self._copy_stream(srcf, destf, None, self._is_local(destfile))
 
-    async def _copy_part(self, source_report, srcfile, part_number, part_creator, return_exceptions):
-        try:
-            async with await self.router_fs.open_from(srcfile, part_number * self.PART_SIZE) as srcf:
-                async with await part_creator.create_part(part_number, part_number * self.PART_SIZE, retry_writes=False) as destf:
-                    n = self.PART_SIZE
-                    while n > 0:
-                        b = await srcf.read(min(Copier.BUFFER_SIZE, n))
-                        # FIXME check expected bytes
-                        if not b:
-                            return
-                        written = await destf.write(b)
-                        assert written == len(b)
-                        n -= len(b)
-        except Exception as e:
-            if return_exceptions:
-                source_report.set_exception(e)
-            else:
-                raise
+    async def _copy_local_file(self, srcfile: str, destfile: str) -> None:
+        assert not destfile.endswith('/')
+
+        local_fs = self.router_fs._get_fs(srcfile)
+        async with self.tuner:
+            try:
+                await local_fs.copy_file(srcfile, destfile, progress=self.tuner.transferred)
+            except FileNotFoundError as e:
+                if e.filename != local_fs._get_path(destfile):
+                    raise
+                await local_fs.makedirs(os.path.dirname(destfile), exist_ok=True)
+                await local_fs.copy_file(srcfile, destfile, progress=self.tuner.transferred)
+
+    async def _copy_part(self, srcfile, size, part_size, part_number, part_creator, reuse_buffer):
+        start = part_number * part_size
+        end = min(start + part_size, size)
+        # a bounded range read of the slice, retried on its own
+        async with self.tuner, await self.router_fs.open_from(srcfile, start, end) as srcf:
+            async with await part_creator.create_part(part_number, start, retry_writes=False) as destf:
+                await self._copy_stream(srcf, destf, end - start, reuse_buffer)
 
     async def _copy_file_multi_part_main(
             self,
             sema: asyncio.Semaphore,
-            source_report: SourceReport,
             srcfile: str,
             srcstat: FileStatus,
-            destfile: str,
-            return_exceptions: bool):
+            destfile: str):
         size = await srcstat.size()
-        if size <= self.PART_SIZE:
+        dest_is_local = self._is_local(destfile)
+        if dest_is_local and self._is_local(srcfile):
+            # one kernel-side copy beats parallel parts on a local disk
+            await self._copy_local_file(srcfile, destfile)
+            return
+
+        part_size = self.tuner.part_size(size)
+        if size <= part_size:
             await retry_transient_errors(self._copy_file, srcfile, destfile)
             return
 
-        n_parts = int((size + self.PART_SIZE - 1) / self.PART_SIZE)
+        n_parts = (size + part_size - 1) // part_size
 
         try:
-            part_creator = await self.router_fs.multi_part_create(sema, destfile, n_parts)
+            part_creator = await self.router_fs.multi_part_create(sema, destfile, n_parts, size=size)
         except FileNotFoundError:
             await self.router_fs.makedirs(os.path.dirname(destfile), exist_ok=True)
-            part_creator = await self.router_fs.multi_part_create(sema, destfile, n_parts)
+            part_creator = await self.router_fs.multi_part_create(sema, destfile, n_parts, size=size)
 
         async with part_creator:
             await bounded_gather2(sema, *[
-                retry_transient_errors(self._copy_part, source_report, srcfile, i, part_creator, return_exceptions)
+                retry_transient_errors(self._copy_part, srcfile, size, part_size, i, part_creator, dest_is_local)
                 for i in range(n_parts)
             ], cancel_on_error=True)
 
+    async def _unchanged(self, srcstat: FileStatus, destfile: str) -> bool:
+        '''Return True if `destfile` has the size and checksum of the source.'''
+        try:
+            deststat = await self.router_fs.statfile(destfile)
+        except FileNotFoundError:
+            return False
+        if await srcstat.size() != await deststat.size():
+            return False
+        # compare the first checksum both sides can provide, preferring
+        # CRC32C, which Google Cloud Storage keeps for composite objects too
+        for algorithm in ('crc32c', 'md5'):
+            src_checksum = await srcstat.checksum(algorithm)
+            if src_checksum is None:
+                continue
+            dest_checksum = await deststat.checksum(algorithm)
+            if dest_checksum is None:
+                continue
+            return src_checksum == dest_checksum
+        if google_crc32c is None:
+            log.warning(f'sync: no checksum in common with {destfile}, copying it; '
+                        f'install google-crc32c to compare CRC32C checksums')
+        else:
+            log.warning(f'sync: no checksum in common with {destfile}, copying it')
+        return False
+
     async def _copy_file_multi_part(
             self,
             sema: asyncio.Semaphore,
@@ -562,11 +988,16 @@ class SourceCopier:
             srcstat: FileStatus,
             destfile: str,
             return_exceptions: bool):
+        size = await srcstat.size()
         source_report._files += 1
-        source_report._bytes += await srcstat.size()
+        source_report._bytes += size
         success = False
         try:
-            await self._copy_file_multi_part_main(sema, source_report, srcfile, srcstat, destfile, return_exceptions)
+            if self.sync and await self._unchanged(srcstat, destfile):
+                source_report._skipped_files += 1
+                source_report._skipped_bytes += size
+            else:
+                await self._copy_file_multi_part_main(sema, srcfile, srcstat, destfile)
             source_report._complete += 1
             success = True
         except Exception as e:
@@ -700,10 +1131,10 @@ class Copier:
     This class implements copy for a list of transfers.
     '''
 
-    BUFFER_SIZE = 256 * 1024
-
-    def __init__(self, router_fs):
+    def __init__(self, router_fs, sync: bool = False, tuner: Optional[CopyTuner] = None):
         self.router_fs = router_fs
+        self.sync = sync
+        self.tuner = tuner if tuner is not None else CopyTuner()
 
     async def _dest_type(self, transfer: Transfer):
         '''Return the (real or assumed) type of `dest`.
@@ -728,7 +1159,7 @@ class Copier:
         return dest_type
 
     async def copy_source(self, sema: asyncio.Semaphore, transfer: Transfer, source_report: SourceReport, src: str, dest_type_task, return_exceptions: bool):
-        src_copier = SourceCopier(self.router_fs, src, transfer.dest, transfer.treat_dest_as, dest_type_task)
+        src_copier = SourceCopier(self.router_fs, src, transfer.dest, transfer.treat_dest_as, dest_type_task, self.sync, self.tuner)
         await src_copier.copy(sema, source_report, return_exceptions)
 
     async def _copy_one_transfer(self, sema: asyncio.Semaphore, transfer_report: TransferReport, transfer: Transfer, return_exceptions: bool):
@@ -826,9 +1257,9 @@ class RouterAsyncFS(AsyncFS):
         fs = self._get_fs(url)
         return await fs.open(url)
 
-    async def open_from(self, url: str, start: int) -> ReadableStream:
+    async def open_from(self, url: str, start: int, end: Optional[int] = None) -> ReadableStream:
         fs = self._get_fs(url)
-        return await fs.open_from(url, start)
+        return await fs.open_from(url, start, end)
 
     async def create(self, url: str, *, retry_writes: bool = True) -> WritableStream:
         fs = self._get_fs(url)
@@ -838,9 +1269,11 @@ class RouterAsyncFS(AsyncFS):
             self,
             sema: asyncio.Semaphore,
             url: str,
-            num_parts: int) -> MultiPartCreate:
+            num_parts: int,
+            *,
+            size: Optional[int] = None) -> MultiPartCreate:
         fs = self._get_fs(url)
-        return await fs.multi_part_create(sema, url, num_parts)
+        return await fs.multi_part_create(sema, url, num_parts, size=size)
 
     async def statfile(self, url: str) -> FileStatus:
         fs = self._get_fs(url)
@@ -882,8 +1315,14 @@ class RouterAsyncFS(AsyncFS):
         for fs in self._filesystems:
             await fs.close()
 
-    async def copy(self, sema: asyncio.Semaphore, transfer: Union[Transfer, List[Transfer]], return_exceptions: bool = False) -> CopyReport:
-        copier = Copier(self)
+    async def copy(self, sema: asyncio.Semaphore, transfer: Union[Transfer, List[Transfer]], return_exceptions: bool = False,
+                   *, sync: bool = False, tuner: Optional[CopyTuner] = None) -> CopyReport:
+        '''Copy `transfer`.  With `sync`, files whose destination already
+        has the same size and checksum are skipped, like rsync.  `tuner`
+        chooses part sizes and bounds the concurrent reads and writes, which
+        are also bounded by `sema`; by default a :class:`CopyTuner` without
+        a bandwidth budget is used.'''
+        copier = Copier(self, sync, tuner)
         copy_report = CopyReport(transfer)
         await copier.copy(sema, copy_report, transfer, return_exceptions)
         copy_report.mark_done()
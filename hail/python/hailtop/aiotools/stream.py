@@ -13,6 +13,15 @@ class ReadableStream(abc.ABC):
     async def read(self, n: int = -1) -> bytes:
         raise NotImplementedError
 
+    async def readinto(self, b) -> int:
+        '''Read up to len(b) bytes into the writable buffer `b`, returning
+        the number of bytes read, 0 at the end of the stream.'''
+        view = memoryview(b).cast('B')
+        data = await self.read(len(view))
+        n = len(data)
+        view[:n] = data
+        return n
+
     def close(self) -> None:
         self._closed = True
 
@@ -51,6 +60,9 @@ class WritableStream(abc.ABC):
         return False
 
     async def write(self, b: bytes) -> int:
+        '''Write the bytes-like `b`.  Unless the stream consumes `b` before
+        returning, as streams writing to local files do, `b` must not be
+        modified afterwards.'''
         raise NotImplementedError
 
     def close(self) -> None:
@@ -85,14 +97,34 @@ class WritableStream(abc.ABC):
 class _ReadableStreamFromBlocking(ReadableStream):
     _thread_pool: ThreadPoolExecutor
     _f: BinaryIO
+    _remaining: Optional[int]
 
-    def __init__(self, thread_pool: ThreadPoolExecutor, f: BinaryIO):
+    def __init__(self, thread_pool: ThreadPoolExecutor, f: BinaryIO, length: Optional[int] = None):
         super().__init__()
         self._thread_pool = thread_pool
         self._f = f
+        self._remaining = length
 
     async def read(self, n: int = -1) -> bytes:
-        return await blocking_to_async(self._thread_pool, self._f.read, n)
+        if self._remaining is not None:
+            if n < 0 or n > self._remaining:
+                n = self._remaining
+            if n == 0:
+                return b''
+        b = await blocking_to_async(self._thread_pool, self._f.read, n)
+        if self._remaining is not None:
+            self._remaining -= len(b)
+        return b
+
+    async def readinto(self, b) -> int:
+        if self._remaining is not None:
+            b = memoryview(b).cast('B')[:self._remaining]
+            if len(b) == 0:
+                return 0
+        n = await blocking_to_async(self._thread_pool, self._f.readinto, b)
+        if self._remaining is not None:
+            self._remaining -= n
+        return n
 
     async def _wait_closed(self) -> None:
         await blocking_to_async(self._thread_pool, self._f.close)
@@ -119,8 +151,8 @@ class _WritableStreamFromBlocking(WritableStream):
         del self._f
 
 
-def blocking_readable_stream_to_async(thread_pool: ThreadPoolExecutor, f: BinaryIO) -> _ReadableStreamFromBlocking:
-    return _ReadableStreamFromBlocking(thread_pool, f)
+def blocking_readable_stream_to_async(thread_pool: ThreadPoolExecutor, f: BinaryIO, length: Optional[int] = None) -> _ReadableStreamFromBlocking:
+    return _ReadableStreamFromBlocking(thread_pool, f, length)
 
 
 def blocking_writable_stream_to_async(thread_pool: ThreadPoolExecutor, f: BinaryIO) -> _WritableStreamFromBlocking:
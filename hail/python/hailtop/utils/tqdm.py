@@ -1,9 +1,14 @@
-from tqdm.notebook import tqdm as tqdm_notebook
+import sys
+
 from tqdm.auto import tqdm as tqdm_auto
 
+# tqdm.auto only imports tqdm.notebook, and with it IPython, when running in a
+# notebook, so look it up rather than importing it.
+_tqdm_notebook = sys.modules.get('tqdm.notebook')
+
 # To tqdm_notebook, None means do not display. To standard tqdm, None means
 # display only when connected to a TTY.
-TQDM_DEFAULT_DISABLE = False if tqdm_auto == tqdm_notebook else None
+TQDM_DEFAULT_DISABLE = False if _tqdm_notebook is not None and tqdm_auto == _tqdm_notebook.tqdm else None
 
 
 def tqdm(*args, disable=TQDM_DEFAULT_DISABLE, **kwargs):
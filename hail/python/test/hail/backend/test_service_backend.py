@@ -0,0 +1,91 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+import hail as hl
+import hail.ir as ir
+from hail import profiling
+from hail.backend.result_cache import ResultCache
+from hail.backend.service_backend import ServiceBackend
+from hail.fs.local_fs import LocalFS
+from hailtop.config import DeployConfig
+from hailtop.utils import async_to_blocking
+
+
+class FakeSocket:
+    '''Answers execute requests for I32 literals with their value, the
+    larger values first, and type requests with a fixed table type.'''
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.requests = []
+        self.cancelled = 0
+
+    def close(self):
+        pass
+
+    async def async_request_with_retries(self, endpoint, **data):
+        self.requests.append(endpoint)
+        if endpoint.startswith('type/'):
+            return {'global': 'struct{}', 'row': 'struct{idx: int32}', 'row_key': ['idx']}
+        assert endpoint == 'execute'
+        value = int(data['code'].split()[-1].rstrip(')'))
+        try:
+            await asyncio.sleep(0.01 * (10 - value))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if value == self.fail_on:
+            raise ValueError(f'failed {value}')
+        return {'type': 'int32', 'value': value}
+
+
+@pytest.fixture
+def backend():
+    backend = ServiceBackend(billing_project='test', bucket='test',
+                             deploy_config=DeployConfig('external', 'default', 'hail.is'),
+                             skip_logging_configuration=True)
+    backend.socket = FakeSocket()
+    backend._fs = LocalFS()
+    yield backend
+    backend.stop()
+
+
+def test_execute_many_keeps_order(backend):
+    assert backend.execute_many([ir.I32(i) for i in range(10)], parallelism=4) == list(range(10))
+    assert backend.socket.requests == ['execute'] * 10
+
+
+def test_execute_many_cancels_on_error(backend):
+    backend.socket = FakeSocket(fail_on=9)
+    with pytest.raises(ValueError, match='failed 9'):
+        backend.execute_many([ir.I32(i) for i in range(10)], parallelism=10)
+    # 9 answers first, the others are still in flight
+    assert backend.socket.cancelled == 9
+
+
+def test_execute_async_uses_result_cache_and_profiling(backend):
+    with tempfile.TemporaryDirectory() as d:
+        backend._result_cache = ResultCache(os.path.join(d, 'cache'), max_bytes=1 << 20)
+        with hl.profile() as p:
+            assert async_to_blocking(backend.execute_async(ir.I32(3))) == 3
+            assert async_to_blocking(backend.execute_async(ir.I32(3))) == 3
+            assert backend.execute(ir.I32(3)) == 3
+        assert backend.socket.requests == ['execute']
+        assert backend._result_cache.hits == 2
+        assert p.summary()['execute']['count'] == 3
+
+
+def test_type_async_is_cached(backend):
+    tir = ir.TableRange(10, 1)
+    t1 = async_to_blocking(backend.table_type_async(tir))
+    t2 = async_to_blocking(backend.table_type_async(ir.TableRange(10, 1)))
+    assert t1 == t2 == hl.ttable(hl.tstruct(), hl.tstruct(idx=hl.tint32), ['idx'])
+    assert backend.socket.requests == ['type/table']
+
+    # executing a query clears the cache
+    backend.execute(ir.I32(1))
+    async_to_blocking(backend.table_type_async(tir))
+    assert backend.socket.requests == ['type/table', 'execute', 'type/table']
@@ -1,3 +1,4 @@
+import numpy as np
 import hail as hl
 from test.hail.helpers import *
 
@@ -64,3 +65,63 @@ def test_complex_round_trips():
     assert_round_trip_all_specs(hl.struct(x=hl.dict({3: 'a', 4: 'b', 5: 'c'}),
                                           y=hl.array([3, 4, 5]),
                                           z=hl.set([3, 4, 5, 3])))
+
+
+def test_decode_result_basics():
+    from hail.expr.binary_decoder import decode_result
+
+    def block(b):
+        return len(b).to_bytes(4, 'little') + b
+
+    assert decode_result(hl.tint32, 'EBaseStruct{`0`:EInt32}', block(bytes.fromhex('00ffffffff'))) == -1
+    assert decode_result(hl.tint32, 'EBaseStruct{`0`:EInt32}', block(bytes.fromhex('01'))) is None
+    assert decode_result(hl.tarray(hl.tint32),
+                         '+EBaseStruct{`0`:+EArray[EInt32]}',
+                         block(bytes.fromhex('03000000' '02' '01000000' '03000000'))) == [1, None, 3]
+
+
+def test_decode_diploid_calls():
+    from hail.expr.binary_decoder import _call_from_int, _isqrt
+
+    assert [_isqrt(n) for n in range(10)] == [0, 1, 1, 1, 2, 2, 2, 2, 2, 3]
+    assert _isqrt((2 ** 29 - 1) ** 2) == 2 ** 29 - 1
+    assert _isqrt((2 ** 29 - 1) ** 2 - 1) == 2 ** 29 - 2
+
+    ar = 0
+    for k in range(100):
+        for j in range(k + 1):
+            assert _call_from_int(ar << 3 | 2 << 1) == hl.Call([j, k])
+            assert _call_from_int(ar << 3 | 2 << 1 | 1) == hl.Call([j, k - j], phased=True)
+            ar += 1
+
+
+@skip_unless_spark_backend()
+def test_binary_transport_round_trips():
+    backend = hl.current_backend()
+    exprs = [hl.literal(1),
+             hl.missing(hl.tint32),
+             hl.struct(),
+             hl.empty_array(hl.tint32),
+             hl.array([1.5, hl.missing(hl.tfloat64), -3.0]),
+             hl.set([3, 4, 5, 3]),
+             hl.dict({3: 'a', 4: 'b', 5: 'c'}),
+             hl.locus('1', 100),
+             hl.interval(1, 5, includes_end=True),
+             hl.call(0, 1, phased=True),
+             hl.call(1, 2),
+             hl.tuple([1, 'a', hl.missing(hl.tbool)]),
+             hl.nd.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]),
+             hl.struct(x=hl.dict({3: 'a', 4: 'b'}),
+                       y=hl.array([hl.struct(a=1, b='x'), hl.missing(hl.tstruct(a=hl.tint32, b=hl.tstr))]),
+                       z=hl.set([3, 4, 5, 3]))]
+    for exp in exprs:
+        expected = hl.eval(exp)
+        backend._binary_transport = True
+        try:
+            actual = hl.eval(exp)
+        finally:
+            backend._binary_transport = False
+        if isinstance(expected, np.ndarray):
+            assert np.array_equal(actual, expected)
+        else:
+            assert actual == expected
@@ -1,5 +1,9 @@
+import gzip
+import json
 import os
 
+import pytest
+
 import hail as hl
 from hail.experimental.vcf_combiner import vcf_combiner as vc
 from hail.utils.java import Env
@@ -155,3 +159,151 @@ def test_sample_override():
     mt_cols = hl.read_matrix_table(out_file).key_cols_by().cols()
     mt_names = mt_cols.aggregate(hl.agg.collect(mt_cols.s))
     assert new_names == mt_names
+
+
+def test_combiner_plan_json():
+    plan = vc.CombinerConfig(branch_factor=3, batch_size=2).plan(10)
+    plan2 = vc.CombinerPlan.from_json(plan.to_json())
+    assert plan2.file_size == plan.file_size
+    assert plan2.to_json() == plan.to_json()
+
+
+@fails_service_backend()
+@fails_local_backend()
+def test_combiner_resume():
+    out_file = new_temp_file(extension='mt')
+    tmp_path = new_temp_file()
+
+    sample_names = all_samples[:5]
+    paths = [os.path.join(resource('gvcfs'), '1kg_chr22', f'{s}.hg38.g.vcf.gz') for s in sample_names]
+
+    def run():
+        vc.run_combiner(paths,
+                        out_file=out_file,
+                        tmp_path=tmp_path,
+                        branch_factor=2,
+                        batch_size=2,
+                        reference_genome='GRCh38',
+                        use_exome_default_intervals=True,
+                        resume=True,
+                        max_concurrent_jobs=2)
+
+    run()
+    [run_dir] = hl.hadoop_ls(tmp_path + '/combiner-temporary')
+    markers = hl.hadoop_ls(run_dir['path'] + '/done')
+    final_marker = [m['path'] for m in markers if os.path.basename(m['path']) == 'phase3_job1']
+    assert len(final_marker) == 1
+    expected = hl.read_matrix_table(out_file)._force_count_rows()
+
+    # a run cut off while writing the output only redoes the final merge,
+    # replacing the partial output
+    Env.fs().remove(final_marker[0])
+    run()
+    assert hl.read_matrix_table(out_file)._force_count_rows() == expected
+    assert len(hl.hadoop_ls(tmp_path + '/combiner-temporary')) == 1
+
+
+def test_balanced_combiner_config():
+    config = vc.CombinerConfig.balanced(150, max_branch_factor=100, max_batch_size=100)
+    assert (config.branch_factor, config.batch_size) == (13, 12)
+    plan = config.plan(150)
+    assert plan.file_size == [[1] * 150, [13] * 11 + [7], [150]]
+
+    config = vc.CombinerConfig.balanced(125, max_branch_factor=5, max_batch_size=10)
+    assert config.branch_factor == 5
+    assert len(config.plan(125).phases) == 3
+
+    assert vc.CombinerConfig().plan(1).file_size == [[1], [1]]
+
+
+def test_density_intervals():
+    rg = hl.get_reference('GRCh38')
+    bin_size = 1_000_000
+    counts = {contig: [0.0] * ((rg.lengths[contig] - 1) // bin_size + 1) for contig in rg.contigs[:25]}
+    counts['chr1'][:10] = [5000.0] * 10
+    density = vc.GVCFDensity(bin_size, counts)
+    assert density.records('chr1', 1, 2_500_000) == 12500.0
+
+    intervals = vc.calculate_density_intervals(density, 10_000, rg)
+    chr1 = [i for i in intervals if i.start.contig == 'chr1']
+    assert [i.end.position for i in chr1[:5]] == [2_000_000, 4_000_000, 6_000_000, 8_000_000, 10_000_000]
+    assert chr1[5].end.position == rg.lengths['chr1']
+    assert len(intervals) == len(chr1) + 24
+
+
+@fails_service_backend()
+@fails_local_backend()
+def test_combiner_dry_run():
+    sample_names = all_samples[:5]
+    paths = [os.path.join(resource('gvcfs'), '1kg_chr22', f'{s}.hg38.g.vcf.gz') for s in sample_names]
+    out_file = new_temp_file(extension='mt')
+    report = vc.run_combiner(paths,
+                             out_file=out_file,
+                             tmp_path=Env.hc()._tmpdir,
+                             branch_factor=4,
+                             reference_genome='GRCh38',
+                             use_density_intervals=True,
+                             import_target_records=1000,
+                             balance_plan=True,
+                             dry_run=True)
+    assert not hl.hadoop_exists(out_file)
+    assert report.branch_factor == 3
+    assert [p.n_outputs for p in report.phases] == [2, 1]
+    assert report.partition_records.max > 0
+
+
+def test_existing_intervals_from_spec():
+    def bound(position):
+        return {'locus': {'contig': 'chr22', 'position': position}, 'alleles': ['A', 'T']}
+
+    range_bounds = [{'start': bound(100), 'end': bound(200), 'includeStart': True, 'includeEnd': True},
+                    {'start': bound(200), 'end': bound(300), 'includeStart': True, 'includeEnd': True},
+                    {'start': bound(400), 'end': bound(500), 'includeStart': True, 'includeEnd': True}]
+    for field in ['_jRangeBounds', 'jRangeBounds']:
+        path = new_temp_file(extension='mt')
+        Env.fs().mkdir(os.path.join(path, 'rows', 'rows'))
+        with hl.hadoop_open(os.path.join(path, 'rows', 'rows', 'metadata.json.gz'), 'wb') as f:
+            f.write(gzip.compress(json.dumps({'name': 'IndexedRVDSpec2', field: range_bounds}).encode()))
+
+        intervals = vc.calculate_existing_intervals(path, 'GRCh38')
+        assert [(i.start.contig, i.start.position) for i in intervals] == [('chr1', 1), ('chr22', 400)]
+        assert intervals[0].end == hl.Locus('chr22', 400, 'GRCh38')
+        rg = hl.get_reference('GRCh38')
+        assert intervals[-1].end == hl.Locus(rg.contigs[-1], rg.lengths[rg.contigs[-1]], rg)
+        assert intervals[-1].includes_end
+
+
+@fails_service_backend()
+@fails_local_backend()
+def test_combiner_existing_mt():
+    paths = [os.path.join(resource('gvcfs'), '1kg_chr22', f'{s}.hg38.g.vcf.gz') for s in all_samples[:5]]
+
+    def run(paths, out_file, **kwargs):
+        vc.run_combiner(paths,
+                        out_file=out_file,
+                        tmp_path=Env.hc()._tmpdir,
+                        branch_factor=2,
+                        reference_genome='GRCh38',
+                        **kwargs)
+
+    existing = new_temp_file(extension='mt')
+    run(paths[:3], existing, use_exome_default_intervals=True, key_by_locus_and_alleles=True)
+    added = new_temp_file(extension='mt')
+    run(paths[3:], added, existing_mt=existing)
+    full = new_temp_file(extension='mt')
+    run(paths, full, use_exome_default_intervals=True)
+
+    existing_intervals = vc.calculate_existing_intervals(existing, 'GRCh38')
+    assert vc.calculate_existing_intervals(added, 'GRCh38') == existing_intervals
+    assert existing_intervals[0].start.position == 1
+
+    mt = hl.read_matrix_table(added)
+    assert mt.s.collect() == all_samples[:5]
+    assert mt._same(hl.read_matrix_table(full))
+
+    with pytest.raises(ValueError, match='already in'):
+        run(paths[:1], new_temp_file(extension='mt'), existing_mt=existing,
+            sample_names=all_samples[:1], header=paths[0])
+    # sample names read from the GVCF headers
+    with pytest.raises(ValueError, match='already in'):
+        run(paths[2:4], new_temp_file(extension='mt'), existing_mt=existing)
@@ -1,3 +1,4 @@
+import math
 import unittest
 
 from hail.expr import coercer_from_dtype
@@ -142,3 +143,23 @@ class Tests(unittest.TestCase):
         for types, rgs in types_and_rgs:
             for t in types:
                 self.assertEqual(t.get_context().references, rgs)
+
+    def test_convert_from_json(self):
+        t = tarray(tstruct(a=tint32, b=tfloat64, c=tarray(tfloat64), d=tset(tstr),
+                           e=tdict(tstr, tint32), f=ttuple(tint64, tfloat32), g=tcall))
+        row = {'a': 1, 'b': 'NaN', 'c': [1, None, 'Infinity'], 'd': ['x'],
+               'e': [{'key': 'k', 'value': 2}], 'f': [3, 1.5], 'g': '0/1'}
+        empty = {f: None for f in ['a', 'b', 'c', 'd', 'e', 'f', 'g']}
+        value = t._convert_from_json_na([row, None, empty])
+
+        first = value[0]
+        self.assertEqual(first.a, 1)
+        self.assertTrue(math.isnan(first.b))
+        self.assertEqual(first.c, [1.0, None, float('inf')])
+        self.assertEqual(first.d, frozenset({'x'}))
+        self.assertEqual(first.e, hl.utils.frozendict({'k': 2}))
+        self.assertEqual(first.f, (3, 1.5))
+        self.assertEqual(first.g, hl.Call([0, 1]))
+        self.assertIsNone(value[1])
+        self.assertEqual(value[2], hl.Struct(**empty))
+        self.assertIsNone(t._convert_from_json_na(None))
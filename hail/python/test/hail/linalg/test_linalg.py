@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 import pytest
 
 import hail as hl
@@ -206,6 +209,31 @@ class Tests(unittest.TestCase):
 
         self._assert_eq(bm.to_numpy(_force_blocking=True), a)
 
+    @fails_service_backend()
+    @fails_local_backend()
+    def test_to_numpy_out(self):
+        a = np.random.rand(10, 11)
+        bm = BlockMatrix.from_numpy(a, block_size=4)
+
+        out = np.empty((10, 11))
+        assert bm.to_numpy(out=out) is out
+        self._assert_eq(out, a)
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'a')
+            out = np.memmap(path, dtype=np.float64, mode='w+', shape=(10, 11))
+            bm.to_numpy(out=out, _force_blocking=True)
+            self._assert_eq(np.fromfile(path).reshape((10, 11)), a)
+
+        self._assert_eq(bm.T.to_numpy(out=np.empty((11, 10), order='F'), _force_blocking=True), a.T)
+        self._assert_eq(BlockMatrix.from_numpy(np.asfortranarray(a).astype(np.float32)).to_numpy(),
+                        a.astype(np.float32))
+
+        with self.assertRaises(ValueError):
+            bm.to_numpy(out=np.empty((11, 10)))
+        with self.assertRaises(TypeError):
+            bm.to_numpy(out=np.empty((10, 11), dtype=np.float32))
+
     @fails_service_backend()
     @fails_local_backend()
     def test_to_table(self):
@@ -850,6 +878,31 @@ class Tests(unittest.TestCase):
             actual = BlockMatrix.rectangles_to_numpy(bm_uri, binary=True)
             self._assert_eq(nd, actual)
 
+    @fails_service_backend()
+    @fails_local_backend()
+    def test_open_rectangles(self):
+        nd = np.random.rand(23, 17)
+        bm = BlockMatrix.from_numpy(nd, block_size=5)
+
+        with hl.TemporaryDirectory() as bm_uri:
+            bm.export_blocks(bm_uri, binary=True)
+            rects = BlockMatrix.open_rectangles(bm_uri)
+            assert rects.shape == (23, 17)
+            self._assert_eq(rects[3:14, 2:16], nd[3:14, 2:16])
+            self._assert_eq(rects[::3, [16, 0, 4]], nd[::3][:, [16, 0, 4]])
+            self._assert_eq(rects[-1], nd[-1])
+            assert rects[4, 5] == nd[4, 5]
+            self._assert_eq(np.asarray(rects), nd)
+            self._assert_eq(BlockMatrix.rectangles_to_numpy(bm_uri, binary=True), nd)
+
+        with hl.TemporaryDirectory() as rect_uri:
+            bm.export_rectangles(rect_uri, [[0, 3, 0, 1], [1, 2, 0, 2], [5, 5, 0, 3]], binary=True)
+            rects = BlockMatrix.open_rectangles(rect_uri)
+            expected = np.zeros((23, 17))
+            expected[0:3, 0:1] = nd[0:3, 0:1]
+            expected[1:2, 0:2] = nd[1:2, 0:2]
+            self._assert_eq(rects[:, :], expected)
+
     @fails_service_backend()
     @fails_local_backend()
     def test_rectangles_to_numpy(self):
@@ -0,0 +1,61 @@
+import math
+
+import numpy as np
+import pytest
+
+import hail as hl
+from hail.plot.plots import _collect_scatter_plot_data
+from ..helpers import *
+
+setUpModule = startTestHailContext
+tearDownModule = stopTestHailContext
+
+
+def points_table():
+    ht = hl.utils.range_table(100, n_partitions=4)
+    return ht.annotate(x=hl.case()
+                       .when(ht.idx == 0, hl.missing(hl.tfloat64))
+                       .when(ht.idx == 1, hl.float64(math.nan))
+                       .default(hl.float64(ht.idx)),
+                       i=hl.or_missing(ht.idx != 50, ht.idx),
+                       j=hl.int64(ht.idx),
+                       f=hl.float32(ht.idx) / 2,
+                       b=hl.or_missing(ht.idx != 50, ht.idx % 2 == 0),
+                       s=hl.or_missing(ht.idx != 50, hl.str(ht.idx) + '\t'))
+
+
+@pytest.mark.parametrize('n_divisions', [None, 10])
+def test_scatter_plot_data_columns(n_divisions):
+    ht = points_table()
+    df = _collect_scatter_plot_data(('x', ht.x), ('y', ht.idx),
+                                    fields={'i': ht.i, 'j': ht.j, 'f': ht.f, 'b': ht.b, 's': ht.s},
+                                    n_divisions=n_divisions, missing_label='missing')
+    assert list(df.columns) == ['x', 'y', 'i', 'j', 'f', 'b', 's']
+    assert df.x.dtype == np.float64 and df.y.dtype == np.float64
+    assert df.j.dtype == np.int64
+    assert df.f.dtype == np.float32
+    assert not df.x.isna().any()
+    assert set(df.b) <= {'true', 'false', 'missing'}
+    assert all(isinstance(v, str) for v in df.s)
+
+    if n_divisions is None:
+        # the points with a missing and a NaN coordinate are dropped
+        assert len(df) == 98
+        assert sorted(df.y) == list(range(2, 100))
+        # a missing value makes an integer column floating point
+        assert df.i.dtype == np.float64
+        assert df.i.isna().sum() == 1
+        row = df[df.y == 50].iloc[0]
+        assert row.b == 'missing' and row.s == 'missing'
+        row = df[df.y == 7].iloc[0]
+        assert (row.x, row.i, row.j, row.f, row.b, row.s) == (7.0, 7, 7, 3.5, 'false', '7\t')
+    else:
+        assert 0 < len(df) <= n_divisions ** 2
+        assert set(df.y) <= set(range(2, 100))
+
+
+def test_scatter_plot_data_bin_count_bound():
+    ht = hl.utils.range_table(10_000, n_partitions=8)
+    df = _collect_scatter_plot_data(('x', hl.float64(ht.idx % 100)), ('y', hl.float64(ht.idx // 100)),
+                                    n_divisions=5)
+    assert 0 < len(df) <= 25
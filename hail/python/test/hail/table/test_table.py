@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 import pyspark.sql
 import pytest
@@ -644,6 +645,42 @@ https://hail.zulipchat.com/#narrow/stream/123011-Hail-Dev/topic/test_drop/near/2
 
         self.assertTrue(t._same(t2))
 
+    def test_to_pandas(self):
+        t = hl.utils.range_table(5)
+        t = t.annotate(x=hl.or_missing(t.idx % 2 == 0, t.idx),
+                       y=hl.float64(t.idx) / 2,
+                       s=hl.str(t.idx),
+                       b=t.idx > 2,
+                       nested=hl.struct(a=t.idx, l=hl.locus('1', t.idx + 1)))
+        df = t.to_pandas()
+        self.assertEqual(list(df.columns),
+                         ['idx', 'x', 'y', 's', 'b', 'nested.a', 'nested.l.contig', 'nested.l.position'])
+        self.assertEqual(df['idx'].dtype, np.int32)
+        self.assertEqual(list(df['idx']), [0, 1, 2, 3, 4])
+        self.assertEqual(df['x'].dtype, np.float64)
+        self.assertTrue(np.isnan(df['x'][1]))
+        self.assertEqual(list(df['x'][::2]), [0.0, 2.0, 4.0])
+        self.assertEqual(list(df['y']), [0.0, 0.5, 1.0, 1.5, 2.0])
+        self.assertEqual(list(df['s']), ['0', '1', '2', '3', '4'])
+        self.assertEqual(list(df['b']), [False, False, False, True, True])
+        self.assertEqual(list(df['nested.l.contig']), ['1'] * 5)
+
+        df = t.select(t.s).to_pandas(flatten=False)
+        self.assertEqual(list(df.columns), ['idx', 's'])
+
+    def test_to_numpy(self):
+        t = hl.utils.range_table(4)
+        t = t.annotate(x=hl.float64(t.idx) * 2, y=hl.int64(t.idx))
+        a = t.to_numpy()
+        self.assertEqual(a.dtype, np.float64)
+        self.assertTrue(np.array_equal(a, np.array([[i, 2.0 * i, i] for i in range(4)])))
+
+        a = t.select(x=hl.or_missing(t.idx != 1, t.idx)).to_numpy()
+        self.assertTrue(np.isnan(a[1, 1]))
+
+        with self.assertRaises(ValueError):
+            t.annotate(s=hl.str(t.idx)).to_numpy()
+
     def test_rename(self):
         kt = hl.utils.range_table(10)
         kt = kt.annotate_globals(foo=5, fi=3)
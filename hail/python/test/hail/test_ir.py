@@ -214,6 +214,17 @@ class TableIRTests(unittest.TestCase):
         for x in self.table_irs():
             Env.spark_backend('TableIRTests.test_parses')._parse_table_ir(str(x))
 
+    def test_backend_type_cache(self):
+        path = new_temp_file(extension='ht')
+        hl.utils.range_table(5).write(path)
+        backend = Env.backend()
+        tir = ir.TableRead(ir.TableNativeReader(path, None, False), False)
+        typ = backend.table_type(tir)
+        assert typ == hl.utils.range_table(5)._type
+        assert backend.table_type(ir.TableRead(ir.TableNativeReader(path, None, False), False)) is typ
+        hl.utils.range_table(5).count()
+        assert backend._type_cache is None
+
 
 class MatrixIRTests(unittest.TestCase):
     def matrix_irs(self):
@@ -278,6 +289,13 @@ class MatrixIRTests(unittest.TestCase):
             except Exception as e:
                 raise ValueError(str(x)) from e
 
+    def test_range_reader_type(self):
+        mir = ir.MatrixRead(ir.MatrixRangeReader(10, 5, None))
+        assert mir.typ == hl.tmatrix(hl.tstruct(),
+                                     hl.tstruct(col_idx=hl.tint32), ['col_idx'],
+                                     hl.tstruct(row_idx=hl.tint32), ['row_idx'],
+                                     hl.tstruct())
+
     def test_highly_nested_ir(self):
         N = 10
         M = 250
@@ -505,3 +523,128 @@ class CSETests(unittest.TestCase):
                     ' (bar (GetField idx (Ref row)))))'
         )
         assert expected == CSERenderer()(x)
+
+    def test_render_cache(self):
+        cache = ir.RenderCache()
+        x = ir.GetField(ir.Ref('row'), 'idx')
+        t = ir.TableMapRows(ir.TableRange(10, 1),
+                            ir.InsertFields(ir.Ref('row'), [('x', ir.ApplyBinaryPrimOp('+', x, x))], None))
+        assert CSERenderer(cache=cache)(t) == CSERenderer()(t)
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        t2 = ir.TableFilter(t, ir.TrueIR())
+        assert CSERenderer(cache=cache)(t2) == CSERenderer()(t2)
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        count = ir.TableCount(t2)
+        assert CSERenderer(cache=cache)(count) == CSERenderer()(count)
+        assert CSERenderer(cache=cache)(count) == CSERenderer()(count)
+        assert (cache.hits, cache.misses) == (3, 3)
+
+    def test_render_cache_eviction(self):
+        cache = ir.RenderCache(max_chars=40)
+        tables = [ir.TableRange(n, 1) for n in range(5)]
+        for t in tables:
+            CSERenderer(cache=cache)(t)
+        assert cache.stats()['chars'] <= 40
+        assert cache.get(tables[0]) is None
+        assert cache.get(tables[-1]) == '(TableRange 4 1)'
+
+
+class StructuralHashTests(unittest.TestCase):
+    @staticmethod
+    def pipeline(n):
+        t = ir.TableRange(10, 1)
+        for i in range(n):
+            t = ir.TableMapRows(t, ir.InsertFields(ir.Ref('row'), [(f'f{i}', ir.I32(i))], None))
+        return t
+
+    def test_deep_equality(self):
+        x = self.pipeline(2000)
+        assert x == self.pipeline(2000)
+        assert hash(x) == hash(self.pipeline(2000))
+        assert x != self.pipeline(1999)
+        assert ir.MakeStruct([('a', ir.I32(1))]) != ir.MakeStruct([('b', ir.I32(1))])
+        # dies differ by the error they report
+        assert ir.Die(ir.Str('x'), hl.tint32, 1, '') == ir.Die(ir.Str('x'), hl.tint32, 1, '')
+        assert ir.Die(ir.Str('x'), hl.tint32, 1, '') != ir.Die(ir.Str('x'), hl.tint32, 2, '')
+
+    def test_base_search(self):
+        x = self.pipeline(2000)
+        found = x.base_search(lambda node: isinstance(node, ir.I32))
+        assert [node.x for node in found] == list(range(2000))
+
+    def test_hash_consing(self):
+        assert ir.hash_cons(ir.TableRange(5, 1)) is not ir.hash_cons(ir.TableRange(5, 1))
+        ir.set_hash_consing(True)
+        try:
+            x = ir.hash_cons(self.pipeline(10))
+            assert ir.hash_cons(self.pipeline(10)) is x
+            assert ir.hash_cons(ir.Ref('row')) is not ir.hash_cons(ir.Ref('row'))
+        finally:
+            ir.set_hash_consing(False)
+
+    @fails_service_backend()
+    def test_java_tables_compare_by_identity(self):
+        jir5 = Env.backend()._to_java_table_ir(ir.TableRange(5, 1))
+        jir6 = Env.backend()._to_java_table_ir(ir.TableRange(6, 1))
+        assert ir.JavaTable(jir5) == ir.JavaTable(jir5)
+        assert ir.JavaTable(jir5) != ir.JavaTable(jir6)
+
+        ir.set_hash_consing(True)
+        try:
+            t5 = ir.hash_cons(ir.JavaTable(jir5))
+            t6 = ir.hash_cons(ir.JavaTable(jir6))
+            assert t5 is not t6
+            assert hl.Table(t5).count() == 5
+            assert hl.Table(t6).count() == 6
+        finally:
+            ir.set_hash_consing(False)
+
+    def test_render_cache_is_structural(self):
+        cache = ir.RenderCache()
+        CSERenderer(cache=cache)(self.pipeline(100))
+        assert CSERenderer(cache=cache)(self.pipeline(100)) == CSERenderer()(self.pipeline(100))
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+class ResultCacheTests(unittest.TestCase):
+    def test_key_and_eviction(self):
+        import os
+        import tempfile
+        from hail.backend.result_cache import ResultCache
+        from hail.fs.local_fs import LocalFS
+
+        fs = LocalFS()
+        with tempfile.TemporaryDirectory() as d:
+            cache = ResultCache(os.path.join(d, 'cache'), max_bytes=1 << 20)
+            bm_path = os.path.join(d, 'bm')
+            os.mkdir(bm_path)
+            with open(os.path.join(bm_path, 'metadata.json'), 'w') as f:
+                f.write('{}')
+            count = ir.TableCount(ir.TableRead(ir.TableFromBlockMatrixNativeReader(bm_path, None, None)))
+            key = cache.key(count, fs)
+            assert key is not None
+            assert cache.key(count, fs) == key
+
+            assert cache.get(key, hl.tint64) == (False, None)
+            cache.put(key, hl.tint64, 5)
+            assert cache.get(key, hl.tint64) == (True, 5)
+            assert cache.stats() == {'hits': 1, 'misses': 1}
+
+            with open(os.path.join(bm_path, 'metadata.json'), 'w') as f:
+                f.write('{"changed": true}')
+            assert cache.key(count, fs) != key
+
+            assert cache.key(ir.TableCount(ir.TableRead(ir.TableFromBlockMatrixNativeReader(
+                os.path.join(d, 'missing'), None, None))), fs) is None
+            assert cache.key(ir.ApplySeeded('rand_bool', 0, hl.tbool, ir.F64(0.5)), fs) is None
+
+            typ = hl.tarray(hl.tstruct(x=hl.tint32, y=hl.tstr))
+            value = [hl.Struct(x=i, y=str(i)) for i in range(100)]
+            small = ResultCache(os.path.join(d, 'small'), max_bytes=4000)
+            small.put('a', typ, value)
+            os.utime(small._entry_path('a'), (0, 0))
+            small.put('b', typ, value)
+            assert small.get('a', typ) == (False, None)
+            assert small.get('b', typ) == (True, value)
@@ -6,3 +6,10 @@ from .helpers import *
 class Tests(unittest.TestCase):
     def test_get_reference_before_init(self):
         hl.get_reference('GRCh37') # Should be no error
+
+    def test_lazy_submodules(self):
+        assert 'experimental' in dir(hl)
+        assert hl.linalg.BlockMatrix is not None
+        assert hl.experimental.ld_score is not None
+        with self.assertRaises(AttributeError):
+            hl.not_a_submodule
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import hail as hl
+import hail.ir as ir
+from hail import profiling
+
+
+class Tests(unittest.TestCase):
+    def test_phases(self):
+        with hl.profile() as p:
+            with profiling.phase('execute', ir=ir.MakeStruct([('a', ir.I32(1))])):
+                with profiling.phase('render'):
+                    pass
+                with profiling.phase('decode'):
+                    pass
+            hl.tstruct(x=hl.tint32)
+        assert profiling._profiler is None
+        assert profiling.phase('execute') is profiling._no_phase
+
+        summary = p.summary()
+        assert summary['execute']['count'] == 1
+        assert summary['render']['count'] == 1
+        assert summary['typecheck']['count'] >= 1
+        assert p.spans[0].args == {'ir': 'MakeStruct', 'ir_size': 2}
+
+        stacks = [line.rsplit(' ', 1)[0] for line in p.folded_stacks()]
+        assert stacks == ['execute', 'execute;render', 'execute;decode']
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'trace.json')
+            p.write_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        assert [e['name'] for e in trace['traceEvents']] == ['execute', 'render', 'decode']
+        assert all(e['ph'] == 'X' for e in trace['traceEvents'])
+
+    def test_nested_profilers(self):
+        outer = hl.profile()
+        try:
+            with hl.profile() as inner:
+                assert profiling._profiler is inner
+            assert profiling._profiler is outer
+        finally:
+            outer.stop()
+        assert profiling._profiler is None
+
+    def test_phases_in_threads(self):
+        def run(name):
+            with profiling.phase(name):
+                with profiling.phase('decode'):
+                    barrier.wait()
+
+        barrier = threading.Barrier(2)
+        with hl.profile() as p:
+            threads = [threading.Thread(target=run, args=(name,)) for name in ['a', 'b']]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        stacks = sorted(line.rsplit(' ', 1)[0] for line in p.folded_stacks())
+        assert stacks == ['a', 'a;decode', 'b', 'b;decode']
+        assert len({e['tid'] for e in p.chrome_trace()['traceEvents']}) == 2
+
+    def test_phases_in_tasks(self):
+        async def run(name, delay):
+            with profiling.phase(name):
+                await asyncio.sleep(delay)
+                with profiling.phase('decode'):
+                    await asyncio.sleep(delay)
+
+        async def run_all():
+            await asyncio.gather(run('a', 0.02), run('b', 0.01))
+
+        with hl.profile() as p:
+            with profiling.phase('execute_many'):
+                asyncio.new_event_loop().run_until_complete(run_all())
+
+        stacks = sorted(line.rsplit(' ', 1)[0] for line in p.folded_stacks())
+        assert stacks == ['execute_many', 'execute_many;a', 'execute_many;a;decode',
+                          'execute_many;b', 'execute_many;b;decode']
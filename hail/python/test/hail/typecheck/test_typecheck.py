@@ -1,6 +1,7 @@
 import unittest
 
 from hail.typecheck.check import *
+from hail.typecheck.check import _set_typecheck_mode
 
 
 class Tests(unittest.TestCase):
@@ -277,3 +278,27 @@ class Tests(unittest.TestCase):
         f(1)
         with self.assertRaises(TypeError):
             f(1, 2)
+
+    def test_specialized_checks(self):
+        @typecheck(x=int, y=sequenceof(int), args=transformed((int, str)), kwargs=transformed((int, str)))
+        def f(x, y=(1, 2), *args, **kwargs):
+            return x, y, args, kwargs
+
+        self.assertEqual(f(1), (1, [1, 2], (), {}))
+        self.assertEqual(f(1, [3], 4, 5, b=6, a=7), (1, [3], ('4', '5'), {'b': '6', 'a': '7'}))
+        self.assertEqual(list(f(1, b=1, a=2)[3]), ['b', 'a'])
+        with self.assertRaisesRegex(TypeError, "parameter 'y'"):
+            f(1, 'ab')
+        with self.assertRaisesRegex(TypeError, r"parameter '\*args' \(arg 1 of 2\)"):
+            f(1, [], 2, 'x')
+
+        _set_typecheck_mode('off')
+        try:
+            # validation is skipped, conversion is not
+            self.assertEqual(f('1', [3], 4), ('1', [3], ('4',), {}))
+            with self.assertRaisesRegex(TypeError, r"parameter '\*args'"):
+                f(1, [], 'x')
+        finally:
+            _set_typecheck_mode('fast')
+        with self.assertRaises(TypeError):
+            f('1')
@@ -0,0 +1,93 @@
+import os
+import socket
+import struct
+import tempfile
+import threading
+import unittest
+
+from hail.fs.hadoop_fs import HadoopFS
+
+_int = struct.Struct('>i')
+
+
+def _recv_exactly(sock, n):
+    buf = b''
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise EOFError
+        buf += chunk
+    return buf
+
+
+class FakeUtils:
+    """Python stand-in for the JVM side of the socket transfer in
+    Py4jUtils.scala."""
+
+    def _connect(self, port, token):
+        s = socket.create_connection(('127.0.0.1', port))
+        s.sendall(token.encode('ascii'))
+        return s
+
+    def readFileToSocket(self, jfs, path, port, token, chunk_size):
+        f = open(path, 'rb')
+
+        def run():
+            with self._connect(port, token) as s, f:
+                while True:
+                    data = f.read(chunk_size)
+                    if not data:
+                        break
+                    s.sendall(_int.pack(len(data)) + data)
+                if path.endswith('.fail'):
+                    msg = b'disk on fire'
+                    s.sendall(_int.pack(-1) + _int.pack(len(msg)) + msg)
+                else:
+                    s.sendall(_int.pack(0))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def writeFileFromSocket(self, jfs, path, exclusive, port, token):
+        f = open(path, 'xb' if exclusive else 'wb')
+
+        def run():
+            with self._connect(port, token) as s, f:
+                while True:
+                    n = _int.unpack(_recv_exactly(s, 4))[0]
+                    if n > 0:
+                        f.write(_recv_exactly(s, n))
+                    else:
+                        f.flush()
+                        s.sendall(_int.pack(0))
+                        if n == 0:
+                            return
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+class Tests(unittest.TestCase):
+    def test_round_trip(self):
+        fs = HadoopFS(FakeUtils(), None)
+        data = os.urandom(3 * (1 << 20) + 17)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'data')
+            with fs.open(path, 'wb') as f:
+                f.write(data[:10])
+                f.flush()
+                f.write(data[10:])
+            with fs.open(path, 'rb') as f:
+                assert f.read(5) == data[:5]
+                assert f.read() == data[5:]
+            with fs.open(path, 'rb') as f:
+                f.read(1)  # close before reading everything
+
+            with fs.open(os.path.join(d, 'text'), 'w') as f:
+                f.write('hello\nworld\n')
+            with fs.open(os.path.join(d, 'text'), 'r') as f:
+                assert f.readlines() == ['hello\n', 'world\n']
+
+            with open(os.path.join(d, 'x.fail'), 'wb') as f:
+                f.write(b'abc')
+            with fs.open(os.path.join(d, 'x.fail'), 'rb') as f:
+                with self.assertRaisesRegex(OSError, 'disk on fire'):
+                    f.read()
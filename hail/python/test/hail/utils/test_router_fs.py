@@ -0,0 +1,81 @@
+import os
+import stat
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from hail.fs.local_fs import LocalFS
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.fs = LocalFS(parallelism=4)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        os.mkdir(os.path.join(self.dir, 'src'))
+        os.mkdir(os.path.join(self.dir, 'src', 'sub'))
+        for i in range(20):
+            with open(os.path.join(self.dir, 'src', f'f{i}'), 'w') as f:
+                f.write('x' * i)
+
+    def tearDown(self):
+        self.fs.close()
+        self.tmp.cleanup()
+
+    def test_ls_and_stat_many(self):
+        src = os.path.join(self.dir, 'src')
+        entries = {os.path.basename(e['path']): e for e in self.fs.ls(src)}
+        assert len(entries) == 21
+        assert entries['sub']['is_dir']
+        assert entries['f7']['size_bytes'] == 7 and not entries['f7']['is_dir']
+
+        paths = [os.path.join(src, f'f{i}') for i in range(20)] + ['file://' + os.path.join(src, 'sub')]
+        stats = self.fs.stat_many(paths)
+        assert [s['path'] for s in stats] == paths
+        assert [s['size_bytes'] for s in stats[:20]] == list(range(20))
+        assert stats[20]['is_dir']
+
+        with self.assertRaises(FileNotFoundError):
+            self.fs.stat_many([paths[0], os.path.join(src, 'missing')])
+
+    def test_copy_many_and_rmtree(self):
+        src = os.path.join(self.dir, 'src')
+        dest = os.path.join(self.dir, 'dest')
+        os.mkdir(dest)
+        self.fs.copy_many([os.path.join(src, 'f3'), os.path.join(src, 'f4')], dest)
+        self.fs.copy(os.path.join(src, 'f5'), dest)
+        assert sorted(os.listdir(dest)) == ['f3', 'f4', 'f5']
+        with self.fs.open(os.path.join(dest, 'f4')) as f:
+            assert f.read() == 'xxxx'
+
+        self.fs.rmtree(src)
+        assert not self.fs.exists(src)
+
+    def test_copy_keeps_mode(self):
+        src = os.path.join(self.dir, 'src', 'f3')
+        os.chmod(src, 0o750)
+        dest = os.path.join(self.dir, 'f3.copy')
+        self.fs.copy(src, dest)
+        assert stat.S_IMODE(os.stat(dest).st_mode) == 0o750
+        assert os.stat(dest).st_mtime == os.stat(src).st_mtime
+
+    def test_calls_from_threads(self):
+        def write_and_read(i):
+            path = 'file://' + os.path.join(self.dir, 'threads', str(i), 'f')
+            self.fs.mkdir(os.path.dirname(path))
+            with self.fs.open(path, 'w') as f:
+                f.write(str(i))
+            # routed through the file system's event loop
+            self.fs.stat_many([path])
+            with self.fs.open(path) as f:
+                return f.read()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assert list(pool.map(write_and_read, range(8))) == [str(i) for i in range(8)]
+
+    def test_close(self):
+        fs = LocalFS(parallelism=4)
+        assert fs.exists(self.dir)
+        fs.close()
+        assert not fs._loop_thread._thread.is_alive()
+        assert fs._loop_thread._loop.is_closed()
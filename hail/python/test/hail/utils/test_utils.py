@@ -1,3 +1,4 @@
+import os
 import unittest
 
 import hail as hl
@@ -57,6 +58,21 @@ class Tests(unittest.TestCase):
         with self.assertRaises(Exception):
             hadoop_open('/tmp/randomBytesOut', 'xb')
 
+    def test_hadoop_copy_many(self):
+        names = ['a', 'b']
+        srcs = [new_temp_file(prefix=name, extension='txt') for name in names]
+        for name, src in zip(names, srcs):
+            with hadoop_open(src, 'w') as f:
+                f.write(name)
+        dest = new_temp_file()
+        Env.fs().mkdir(dest)
+
+        hadoop_copy(srcs, dest)
+
+        for name, src in zip(names, srcs):
+            with hadoop_open(os.path.join(dest, os.path.basename(src))) as f:
+                self.assertEqual(f.read(), name)
+
     def test_hadoop_exists(self):
         self.assertTrue(hl.hadoop_exists(resource('ls_test')))
         self.assertFalse(hl.hadoop_exists(resource('doesnt.exist')))
@@ -180,6 +196,30 @@ class Tests(unittest.TestCase):
         self.assertEqual(s.annotate(**{'a': 5, 'x': 10, 'y': 15}),
                          Struct(a=5, b=2, c=3, x=10, y=15))
 
+    def test_tuple_struct(self):
+        import pickle
+        from hail.utils.struct import _tuple_struct_class
+
+        s = _tuple_struct_class(('a', 'b', '1kg', 'annotate'))((1, 'x', 3, 4))
+        plain = Struct(**{'a': 1, 'b': 'x', '1kg': 3, 'annotate': 4})
+        self.assertIsInstance(s, Struct)
+        self.assertEqual(s, plain)
+        self.assertEqual(plain, s)
+        self.assertEqual(hash(s), hash(plain))
+        self.assertEqual(str(s), str(plain))
+        self.assertEqual((s.a, s['b'], s['1kg'], s.annotate), (1, 'x', 3, 4))
+        self.assertEqual(list(s.items()), list(plain.items()))
+        self.assertEqual(s.drop('b'), plain.drop('b'))
+        self.assertEqual(pickle.loads(pickle.dumps(s)), s)
+        with self.assertRaises(AttributeError):
+            s.c
+        with self.assertRaises(KeyError):
+            s['c']
+
+        t = hl.utils.range_table(3).annotate(x=hl.str('a'))
+        self.assertEqual(t.collect(), [Struct(idx=i, x='a') for i in range(3)])
+        self.assertEqual(t.take(1), [Struct(idx=0, x='a')])
+
     def test_expr_exception_results_in_fatal_error(self):
         df = range_table(10)
         df = df.annotate(x=[1, 2])
@@ -0,0 +1,155 @@
+'''Throughput benchmarks for RouterAsyncFS.copy, listfiles and rmtree
+against the in-process fake Google Cloud Storage server in fake_gcs.
+
+Each distribution of file sizes is uploaded from local disk, downloaded,
+copied within the bucket, listed and removed, and the throughput and the
+number of requests of each kind are reported.  Run from hail/python:
+
+    python -m test.hailtop.aiotools.benchmark_copy --scale 0.1 --json results.json
+'''
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from hailtop.aiotools import LocalAsyncFS, RouterAsyncFS, Transfer, CopyTuner
+
+from .fake_gcs import FakeGCS
+
+# name -> (number of files, file size)
+DISTRIBUTIONS: Dict[str, Tuple[int, int]] = {
+    'small': (2000, 16 * 1024),
+    'medium': (64, 4 * 1024 * 1024),
+    'large': (2, 256 * 1024 * 1024),
+}
+
+OPERATIONS = ['upload', 'download', 'gs_to_gs', 'list', 'rmtree']
+
+
+class BenchmarkResult:
+    def __init__(self, distribution: str, operation: str, n_files: int, n_bytes: int,
+                 seconds: float, request_counts: Dict[str, int]):
+        self.distribution = distribution
+        self.operation = operation
+        self.n_files = n_files
+        self.n_bytes = n_bytes
+        self.seconds = seconds
+        self.request_counts = request_counts
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.n_bytes / 1e6 / self.seconds if self.seconds > 0 else float('inf')
+
+    @property
+    def n_requests(self) -> int:
+        return sum(self.request_counts.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            'distribution': self.distribution,
+            'operation': self.operation,
+            'files': self.n_files,
+            'bytes': self.n_bytes,
+            'seconds': self.seconds,
+            'mb_per_second': self.mb_per_second,
+            'requests': self.n_requests,
+            'request_counts': dict(sorted(self.request_counts.items())),
+        }
+
+
+def _write_files(path: str, n_files: int, file_size: int) -> None:
+    os.makedirs(path)
+    data = os.urandom(file_size)
+    for i in range(n_files):
+        with open(os.path.join(path, f'file-{i}'), 'wb') as f:
+            f.write(data)
+
+
+async def _benchmark_distribution(server: FakeGCS, fs: RouterAsyncFS, sema: asyncio.Semaphore, local_dir: str,
+                                  distribution: str, n_files: int, file_size: int,
+                                  tuner_factory) -> List[BenchmarkResult]:
+    src = os.path.join(local_dir, distribution, 'src')
+    dest = os.path.join(local_dir, distribution, 'dest')
+    gs_dir = f'gs://benchmark/{distribution}'
+    _write_files(src, n_files, file_size)
+    n_bytes = n_files * file_size
+
+    results = []
+
+    async def measure(operation, n_bytes, f):
+        server.reset_counts()
+        start = time.perf_counter()
+        await f()
+        seconds = time.perf_counter() - start
+        results.append(BenchmarkResult(distribution, operation, n_files, n_bytes, seconds, dict(server.request_counts)))
+
+    def copy(src_url, dest_url):
+        return fs.copy(sema, Transfer(src_url, dest_url, treat_dest_as=Transfer.DEST_IS_TARGET), tuner=tuner_factory())
+
+    async def listfiles():
+        n = 0
+        async for _ in await fs.listfiles(f'{gs_dir}/src', recursive=True):
+            n += 1
+        assert n == n_files, (n, n_files)
+
+    await measure('upload', n_bytes, lambda: copy(src, f'{gs_dir}/src'))
+    await measure('download', n_bytes, lambda: copy(f'{gs_dir}/src', dest))
+    await measure('gs_to_gs', n_bytes, lambda: copy(f'{gs_dir}/src', f'{gs_dir}/copy'))
+    await measure('list', 0, listfiles)
+    await measure('rmtree', 0, lambda: fs.rmtree(sema, f'{gs_dir}/'))
+    return results
+
+
+async def run_benchmarks(scale: float = 1.0,
+                         distributions: Optional[Dict[str, Tuple[int, int]]] = None,
+                         tuner_factory=CopyTuner) -> List[BenchmarkResult]:
+    '''Run the benchmarks, scaling the number of files of each distribution
+    by `scale`.'''
+    if distributions is None:
+        distributions = DISTRIBUTIONS
+    results = []
+    with ThreadPoolExecutor() as thread_pool, tempfile.TemporaryDirectory() as local_dir:
+        async with FakeGCS() as server:
+            async with RouterAsyncFS('file', [LocalAsyncFS(thread_pool), server.filesystem()]) as fs:
+                sema = asyncio.Semaphore(CopyTuner.MAX_PARALLELISM)
+                async with sema:
+                    for distribution, (n_files, file_size) in distributions.items():
+                        n_files = max(1, round(n_files * scale))
+                        results.extend(await _benchmark_distribution(
+                            server, fs, sema, local_dir, distribution, n_files, file_size, tuner_factory))
+    return results
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    lines = [f'{"distribution":<12} {"operation":<10} {"files":>6} {"MB":>9} {"seconds":>8} {"MB/s":>9} {"requests":>8}  request counts']
+    for r in results:
+        mb_per_second = f'{r.mb_per_second:9.1f}' if r.n_bytes else f'{"":>9}'
+        counts = ', '.join(f'{k}={v}' for k, v in sorted(r.request_counts.items()))
+        lines.append(f'{r.distribution:<12} {r.operation:<10} {r.n_files:>6} {r.n_bytes / 1e6:>9.1f} '
+                     f'{r.seconds:>8.2f} {mb_per_second} {r.n_requests:>8}  {counts}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hailtop.aiotools copies against a fake Google Cloud Storage.')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply the number of files of each distribution by this factor')
+    parser.add_argument('--distributions', nargs='+', choices=sorted(DISTRIBUTIONS), default=list(DISTRIBUTIONS),
+                        help='file size distributions to run')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON to PATH')
+    args = parser.parse_args()
+
+    distributions = {name: DISTRIBUTIONS[name] for name in args.distributions}
+    results = asyncio.run(run_benchmarks(args.scale, distributions))
+    print(format_results(results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([r.to_dict() for r in results], f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+'''Copy tuners for tests that need multi-part copies of small files.'''
+from hailtop.aiotools import CopyTuner
+
+
+class SmallPartsCopyTuner(CopyTuner):
+    MIN_PART_SIZE = 1024 * 1024
+    # 2MiB parts before any throughput is measured
+    INITIAL_STREAM_THROUGHPUT = 512 * 1024
@@ -0,0 +1,273 @@
+'''An in-process stand-in for the parts of the Google Cloud Storage JSON
+API used by hailtop.aiogoogle.StorageClient: simple and resumable
+uploads, ranged downloads, object metadata, listing, deletion and
+compose.
+
+    async with FakeGCS() as server:
+        async with server.filesystem() as fs:
+            ...
+
+Objects are kept in memory.  The server counts requests by kind, see
+FakeGCS.request_counts.
+'''
+import base64
+import collections
+import datetime
+import hashlib
+import secrets
+import socket
+import urllib.parse
+from typing import Dict, Optional
+
+from aiohttp import web
+try:
+    import google_crc32c
+except ImportError:
+    google_crc32c = None
+
+from hailtop.aiogoogle import GoogleStorageAsyncFS
+from hailtop.aiogoogle.auth import Credentials
+
+
+class FakeCredentials(Credentials):
+    async def get_access_token(self, session):
+        return {'access_token': 'fake', 'expires_in': 3600}
+
+
+class _Object:
+    def __init__(self, name: str, data: bytes, generation: int, composite: bool = False):
+        self.name = name
+        self.data = data
+        self.generation = generation
+        self.composite = composite
+        self.updated = datetime.datetime.now(datetime.timezone.utc)
+
+    def metadata(self, bucket: str) -> Dict[str, str]:
+        metadata = {
+            'kind': 'storage#object',
+            'bucket': bucket,
+            'name': self.name,
+            'size': str(len(self.data)),
+            'generation': str(self.generation),
+            'updated': self.updated.isoformat().replace('+00:00', 'Z'),
+        }
+        if google_crc32c is not None:
+            metadata['crc32c'] = base64.b64encode(google_crc32c.value(self.data).to_bytes(4, 'big')).decode()
+        # like Google Cloud Storage, composite objects have no MD5
+        if not self.composite:
+            metadata['md5Hash'] = base64.b64encode(hashlib.md5(self.data).digest()).decode()
+        return metadata
+
+
+class _Upload:
+    def __init__(self, bucket: str, name: str):
+        self.bucket = bucket
+        self.name = name
+        self.data = bytearray()
+
+
+class FakeGCS:
+    '''Serves the fake Storage API on a free local port.'''
+
+    PAGE_SIZE = 1000
+
+    def __init__(self):
+        self.buckets: Dict[str, Dict[str, _Object]] = collections.defaultdict(dict)
+        self.request_counts: Dict[str, int] = collections.Counter()
+        self._uploads: Dict[str, _Upload] = {}
+        # upload id -> metadata of the object it created
+        self._finished_uploads: Dict[str, Dict[str, str]] = {}
+        self._generation = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.endpoint: Optional[str] = None
+
+    async def start(self) -> None:
+        app = web.Application(client_max_size=1024 ** 4)
+        app.router.add_route('*', '/{tail:.*}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        site = web.SockSite(self._runner, sock)
+        await site.start()
+        self.endpoint = f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'FakeGCS':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    def filesystem(self, **kwargs) -> GoogleStorageAsyncFS:
+        '''A GoogleStorageAsyncFS talking to this server.'''
+        assert self.endpoint is not None
+        return GoogleStorageAsyncFS(endpoint=self.endpoint, credentials=FakeCredentials(), **kwargs)
+
+    def reset_counts(self) -> None:
+        self.request_counts.clear()
+
+    def _next_generation(self) -> int:
+        self._generation += 1
+        return self._generation
+
+    @staticmethod
+    def _error(status: int, message: str) -> web.Response:
+        return web.json_response({'error': {'code': status, 'message': message}}, status=status)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        # split the raw path so object names keep their encoded slashes
+        parts = [urllib.parse.unquote(p) for p in request.raw_path.split('?', 1)[0].split('/')[1:]]
+        method = request.method
+        query = request.query
+
+        if parts[:4] == ['upload', 'storage', 'v1', 'b'] and len(parts) == 6 and parts[5] == 'o':
+            bucket = parts[4]
+            if method == 'POST':
+                upload_type = query.get('uploadType', 'media')
+                if upload_type == 'media':
+                    self.request_counts['upload.media'] += 1
+                    return self._put_object(bucket, query['name'], await request.read())
+                if upload_type == 'resumable':
+                    self.request_counts['upload.resumable.start'] += 1
+                    upload_id = secrets.token_hex(16)
+                    self._uploads[upload_id] = _Upload(bucket, query['name'])
+                    location = f'{self.endpoint}/upload/storage/v1/b/{bucket}/o?uploadType=resumable&upload_id={upload_id}'
+                    return web.json_response({}, headers={'Location': location})
+                return self._error(400, f'unsupported uploadType {upload_type}')
+            if method == 'PUT' and 'upload_id' in query:
+                self.request_counts['upload.resumable.chunk'] += 1
+                return await self._upload_chunk(request, query['upload_id'])
+
+        if parts[:3] == ['storage', 'v1', 'b'] and len(parts) >= 5 and parts[4] == 'o':
+            bucket = parts[3]
+            objects = self.buckets[bucket]
+            if len(parts) == 5 and method == 'GET':
+                self.request_counts['list'] += 1
+                return self._list(bucket, query)
+            if len(parts) == 7 and parts[6] == 'compose' and method == 'POST':
+                self.request_counts['compose'] += 1
+                return self._compose(bucket, parts[5], await request.json())
+            if len(parts) == 6:
+                name = parts[5]
+                obj = objects.get(name)
+                if method == 'GET':
+                    if query.get('alt') == 'media':
+                        self.request_counts['get.media'] += 1
+                        if obj is None:
+                            return self._error(404, f'no such object: {bucket}/{name}')
+                        return self._media(request, obj)
+                    self.request_counts['get.metadata'] += 1
+                    if obj is None:
+                        return self._error(404, f'no such object: {bucket}/{name}')
+                    return web.json_response(obj.metadata(bucket))
+                if method == 'DELETE':
+                    self.request_counts['delete'] += 1
+                    if obj is None:
+                        return self._error(404, f'no such object: {bucket}/{name}')
+                    del objects[name]
+                    # an empty JSON response, as the client parses it
+                    return web.Response(status=204, content_type='application/json')
+
+        return self._error(400, f'unsupported request: {method} {request.raw_path}')
+
+    def _store(self, bucket: str, name: str, data: bytes, composite: bool = False) -> _Object:
+        obj = _Object(name, bytes(data), self._next_generation(), composite)
+        self.buckets[bucket][name] = obj
+        return obj
+
+    def _put_object(self, bucket: str, name: str, data: bytes, composite: bool = False) -> web.Response:
+        return web.json_response(self._store(bucket, name, data, composite).metadata(bucket))
+
+    async def _upload_chunk(self, request: web.Request, upload_id: str) -> web.Response:
+        if upload_id in self._finished_uploads:
+            return web.json_response(self._finished_uploads[upload_id])
+        upload = self._uploads.get(upload_id)
+        if upload is None:
+            return self._error(404, f'no such upload: {upload_id}')
+        data = await request.read()
+
+        # Content-Range is bytes first-last/total or bytes */total, where
+        # total is * until the last chunk
+        byte_range, total = request.headers['Content-Range'][len('bytes '):].split('/')
+        if byte_range != '*':
+            first = int(byte_range.split('-')[0])
+            offset = len(upload.data)
+            if first > offset:
+                return self._error(400, f'chunk starts at {first} past the {offset} bytes received')
+            upload.data += data[offset - first:]
+
+        if total != '*' and len(upload.data) == int(total):
+            del self._uploads[upload_id]
+            obj = self._store(upload.bucket, upload.name, upload.data)
+            self._finished_uploads[upload_id] = obj.metadata(upload.bucket)
+            return web.json_response(self._finished_uploads[upload_id])
+
+        headers = {}
+        if upload.data:
+            headers['Range'] = f'bytes=0-{len(upload.data) - 1}'
+        return web.Response(status=308, headers=headers)
+
+    @staticmethod
+    def _media(request: web.Request, obj: _Object) -> web.Response:
+        byte_range = request.headers.get('Range')
+        if byte_range is None:
+            return web.Response(body=obj.data, content_type='application/octet-stream')
+        first, last = byte_range[len('bytes='):].split('-')
+        start = int(first)
+        end = len(obj.data) if not last else min(int(last) + 1, len(obj.data))
+        if start >= len(obj.data) and len(obj.data) > 0:
+            return web.Response(status=416)
+        return web.Response(status=206, body=obj.data[start:end], content_type='application/octet-stream',
+                            headers={'Content-Range': f'bytes {start}-{end - 1}/{len(obj.data)}'})
+
+    def _list(self, bucket: str, query) -> web.Response:
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter')
+        include_trailing = query.get('includeTrailingDelimiter') == 'true'
+        page_size = min(int(query.get('maxResults', self.PAGE_SIZE)), self.PAGE_SIZE)
+
+        entries = []
+        seen_prefixes = set()
+        for name in sorted(self.buckets[bucket]):
+            if not name.startswith(prefix):
+                continue
+            if delimiter:
+                i = name.find(delimiter, len(prefix))
+                if i >= 0:
+                    sub_prefix = name[:i + len(delimiter)]
+                    if sub_prefix not in seen_prefixes:
+                        seen_prefixes.add(sub_prefix)
+                        entries.append(('prefix', sub_prefix))
+                    if not (include_trailing and name == sub_prefix):
+                        continue
+            entries.append(('item', name))
+
+        start = int(query.get('pageToken', 0))
+        page = entries[start:start + page_size]
+        result: Dict = {'kind': 'storage#objects'}
+        items = [self.buckets[bucket][name].metadata(bucket) for kind, name in page if kind == 'item']
+        prefixes = [p for kind, p in page if kind == 'prefix']
+        if items:
+            result['items'] = items
+        if prefixes:
+            result['prefixes'] = prefixes
+        if start + page_size < len(entries):
+            result['nextPageToken'] = str(start + page_size)
+        return web.json_response(result)
+
+    def _compose(self, bucket: str, destination: str, body) -> web.Response:
+        names = [source['name'] for source in body['sourceObjects']]
+        if not 0 < len(names) <= 32:
+            return self._error(400, f'compose takes 1 to 32 components, found {len(names)}')
+        objects = self.buckets[bucket]
+        missing = [name for name in names if name not in objects]
+        if missing:
+            return self._error(404, f'no such object: {bucket}/{missing[0]}')
+        data = b''.join(objects[name].data for name in names)
+        return self._put_object(bucket, destination, data, composite=True)
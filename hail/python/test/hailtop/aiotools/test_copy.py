@@ -4,13 +4,14 @@ from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import pytest
 from hailtop.utils import url_scheme, bounded_gather2
-from hailtop.aiotools import LocalAsyncFS, RouterAsyncFS, Transfer, FileAndDirectoryError
+from hailtop.aiotools import LocalAsyncFS, RouterAsyncFS, Transfer, FileAndDirectoryError, CopyTuner
 from hailtop.aiogoogle import StorageClient, GoogleStorageAsyncFS
 
 from .generate_copy_test_specs import (
     run_test_spec, create_test_file, create_test_dir)
 
 from .copy_test_specs import COPY_TEST_SPECS
+from .copy_tuners import SmallPartsCopyTuner
 
 
 @pytest.fixture(scope='module')
@@ -416,3 +417,119 @@ async def test_copy_src_parts(copy_test_context):
 
     await expect_file(fs, f'{dest_base}file1', 'src/a/file1')
     await expect_file(fs, f'{dest_base}subdir/file2', 'src/a/subdir/file2')
+
+
+@pytest.mark.asyncio
+async def test_copy_sync_skips_unchanged(copy_test_context):
+    sema, fs, src_base, dest_base = copy_test_context
+
+    await create_test_dir(fs, 'src', src_base, 'a/')
+
+    def sync():
+        return fs.copy(sema, Transfer(f'{src_base}a', f'{dest_base}a', treat_dest_as=Transfer.DEST_IS_TARGET), sync=True)
+
+    report = await sync()
+    assert report._transfer_report._source_report._skipped_files == 0
+
+    async with await fs.create(f'{dest_base}a/file1') as f:
+        # same size, different contents
+        await f.write(b'src/a/fileX')
+
+    report = await sync()
+    source_report = report._transfer_report._source_report
+    assert source_report._files == 2
+    assert source_report._skipped_files == 1
+    assert source_report._skipped_bytes == len('src/a/subdir/file2')
+    await expect_file(fs, f'{dest_base}a/file1', 'src/a/file1')
+
+
+def test_copy_tuner_part_size():
+    tuner = CopyTuner(parallelism=32)
+    mib = 1024 * 1024
+    # no throughput observed yet: 128MiB parts
+    assert tuner.part_size(200 * 1024 * mib) == 128 * mib
+    assert tuner.part_size(32 * 64 * mib) == 128 * mib
+    # once measured, spread a mid-sized file over all streams
+    tuner._throughput = 32 * 32 * mib
+    assert tuner.part_size(64 * 64 * mib) == 128 * mib
+    assert tuner.part_size(32 * 64 * mib) == 64 * mib
+    assert tuner.part_size(mib) == CopyTuner.MIN_PART_SIZE
+    # never more than MAX_PARTS parts
+    huge = 20 * 1024 * 1024 * mib
+    assert (huge + tuner.part_size(huge) - 1) // tuner.part_size(huge) <= CopyTuner.MAX_PARTS
+    assert tuner.buffer_size() == 256 * 1024
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+
+def fake_clock_tuner(clock, **kwargs):
+    class FakeClockCopyTuner(CopyTuner):
+        _clock = staticmethod(clock)
+    return FakeClockCopyTuner(**kwargs)
+
+
+async def run_tuning_intervals(tuner, clock, n_intervals, throughput):
+    '''Run `n_intervals` intervals, each with all slots in use and moving
+    `throughput(parallelism)` bytes.  Return the parallelism after each.'''
+    parallelism = []
+    for _ in range(n_intervals):
+        n = tuner.parallelism
+        for _ in range(n):
+            await tuner.__aenter__()
+        clock.now += CopyTuner.TUNING_INTERVAL
+        await tuner.transferred(int(throughput(n)))
+        for _ in range(n):
+            await tuner.__aexit__(None, None, None)
+        parallelism.append(tuner.parallelism)
+    return parallelism
+
+
+@pytest.mark.asyncio
+async def test_copy_tuner_grows_and_rolls_back():
+    clock = FakeClock()
+    tuner = fake_clock_tuner(clock, parallelism=4)
+    mib = 1024 * 1024
+    # throughput stops scaling at 16 streams
+    parallelism = await run_tuning_intervals(tuner, clock, 20, lambda n: min(n, 16) * mib)
+    assert parallelism[:8] == [5, 6, 7, 8, 10, 12, 15, 18]
+    # 22 streams are no faster than 18, so the increase is undone and held
+    assert parallelism[8:] == [22] + [18] * 11
+    assert tuner.throughput == 16 * mib
+
+
+@pytest.mark.asyncio
+async def test_copy_tuner_bandwidth_cap(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(asyncio, 'sleep', clock.sleep)
+    mib = 1024 * 1024
+    tuner = fake_clock_tuner(clock, parallelism=4, bandwidth=6 * mib)
+    parallelism = await run_tuning_intervals(tuner, clock, 20, lambda n: 2 * n * mib)
+    # throttled to the bandwidth, so more streams would not help
+    assert parallelism == [4] * 20
+    assert tuner.throughput == pytest.approx(6 * mib)
+    assert 20 * 8 * mib / clock.now == pytest.approx(6 * mib)
+
+
+@pytest.mark.asyncio
+async def test_copy_multi_part_with_tuner(copy_test_context):
+    sema, fs, src_base, dest_base = copy_test_context
+
+    data = secrets.token_bytes(5 * 1024 * 1024 + 17)
+    async with await fs.create(f'{src_base}a') as f:
+        await f.write(data)
+
+    tuner = SmallPartsCopyTuner(parallelism=2, bandwidth=1024 ** 3)
+    assert tuner.part_size(len(data)) == 2 * 1024 * 1024
+    await fs.copy(sema, Transfer(f'{src_base}a', f'{dest_base}a', treat_dest_as=Transfer.DEST_IS_TARGET), tuner=tuner)
+
+    async with await fs.open(f'{dest_base}a') as f:
+        assert await f.read() == data
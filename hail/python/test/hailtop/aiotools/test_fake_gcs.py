@@ -0,0 +1,147 @@
+import asyncio
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from hailtop.aiotools import fs as aiotools_fs
+from hailtop.aiotools import LocalAsyncFS, RouterAsyncFS, Transfer
+
+from .copy_tuners import SmallPartsCopyTuner
+from .fake_gcs import FakeGCS
+from .benchmark_copy import run_benchmarks, OPERATIONS
+
+
+@pytest.fixture
+async def fake_gcs():
+    async with FakeGCS() as server:
+        async with server.filesystem() as fs:
+            sema = asyncio.Semaphore(50)
+            async with sema:
+                yield (server, sema, fs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('retry_writes', [True, False])
+async def test_write_read(fake_gcs, retry_writes):
+    server, sema, fs = fake_gcs
+
+    data = secrets.token_bytes(1_000_000)
+    async with await fs.create('gs://bucket/a/b', retry_writes=retry_writes) as f:
+        await f.write(data[:300_000])
+        await f.write(data[300_000:])
+
+    async with await fs.open('gs://bucket/a/b') as f:
+        assert await f.read() == data
+    async with await fs.open_from('gs://bucket/a/b', 10, 20) as f:
+        assert await f.read() == data[10:20]
+
+    status = await fs.statfile('gs://bucket/a/b')
+    assert await status.size() == len(data)
+    assert await status.checksum('md5') is not None
+
+    if retry_writes:
+        assert server.request_counts['upload.resumable.start'] == 1
+        # 256KiB chunks
+        assert server.request_counts['upload.resumable.chunk'] == 4
+    else:
+        assert server.request_counts['upload.media'] == 1
+
+
+@pytest.mark.asyncio
+async def test_list_and_rmtree(fake_gcs):
+    server, sema, fs = fake_gcs
+
+    for name in ['a/x', 'a/y/z', 'b']:
+        async with await fs.create(f'gs://bucket/{name}') as f:
+            await f.write(name.encode())
+
+    entries = [entry.url_maybe_trailing_slash() async for entry in await fs.listfiles('gs://bucket/a/')]
+    assert sorted(entries) == ['gs://bucket/a/x', 'gs://bucket/a/y/']
+    assert await fs.isdir('gs://bucket/a/y/')
+    assert not await fs.isfile('gs://bucket/a/y')
+
+    await fs.rmtree(sema, 'gs://bucket/a/')
+    assert not await fs.isdir('gs://bucket/a/')
+    assert sorted(server.buckets['bucket']) == ['b']
+    with pytest.raises(FileNotFoundError):
+        await fs.statfile('gs://bucket/a/x')
+
+
+@pytest.mark.asyncio
+async def test_multi_part_create_compose(fake_gcs):
+    server, sema, fs = fake_gcs
+
+    # more than 32 parts are composed in a tree
+    n_parts = 40
+    async with await fs.multi_part_create(sema, 'gs://bucket/composed', n_parts) as part_creator:
+        for i in range(n_parts):
+            async with await part_creator.create_part(i, i * 3) as f:
+                await f.write(bytes([i]) * 3)
+
+    async with await fs.open('gs://bucket/composed') as f:
+        assert await f.read() == b''.join(bytes([i]) * 3 for i in range(n_parts))
+    assert server.request_counts['compose'] == 33
+    # the parts are removed, composite objects have no MD5
+    assert sorted(server.buckets['bucket']) == ['composed']
+    assert await (await fs.statfile('gs://bucket/composed')).checksum('md5') is None
+
+
+@pytest.mark.asyncio
+async def test_copy_round_trip(fake_gcs, tmp_path):
+    server, sema, _ = fake_gcs
+
+    data = secrets.token_bytes(5 * 1024 * 1024 + 17)
+    (tmp_path / 'src').write_bytes(data)
+
+    with ThreadPoolExecutor() as thread_pool:
+        async with RouterAsyncFS('file', [LocalAsyncFS(thread_pool), server.filesystem()]) as fs:
+            def copy(src, dest):
+                return fs.copy(sema, Transfer(src, dest, treat_dest_as=Transfer.DEST_IS_TARGET),
+                               tuner=SmallPartsCopyTuner(parallelism=4))
+
+            await copy(str(tmp_path / 'src'), 'gs://bucket/object')
+            assert server.request_counts['compose'] == 1
+            await copy('gs://bucket/object', str(tmp_path / 'dest'))
+            assert (tmp_path / 'dest').read_bytes() == data
+            # one ranged GET per part
+            assert server.request_counts['get.media'] == 3
+
+
+@pytest.mark.asyncio
+async def test_benchmark_copy():
+    results = await run_benchmarks(distributions={'small': (20, 1024), 'large': (1, 3 * 1024 * 1024)})
+    assert [(r.distribution, r.operation) for r in results] == [
+        (d, o) for d in ['small', 'large'] for o in OPERATIONS]
+    for r in results:
+        assert r.seconds > 0
+        assert r.n_requests > 0
+        if r.operation == 'upload':
+            assert r.n_bytes == r.n_files * (1024 if r.distribution == 'small' else 3 * 1024 * 1024)
+        if r.distribution == 'small' and r.operation == 'rmtree':
+            # the uploaded and the copied files
+            assert r.request_counts['delete'] == 40
+
+
+@pytest.mark.asyncio
+async def test_sync_without_common_checksum(fake_gcs, tmp_path, monkeypatch, caplog):
+    server, sema, _ = fake_gcs
+
+    data = secrets.token_bytes(3 * 1024 * 1024)
+    (tmp_path / 'src').write_bytes(data)
+
+    with ThreadPoolExecutor() as thread_pool:
+        async with RouterAsyncFS('file', [LocalAsyncFS(thread_pool), server.filesystem()]) as fs:
+            def sync(src, dest):
+                return fs.copy(sema, Transfer(src, dest, treat_dest_as=Transfer.DEST_IS_TARGET),
+                               sync=True, tuner=SmallPartsCopyTuner(parallelism=4))
+
+            # the composite object has a CRC32C checksum but no MD5
+            await sync(str(tmp_path / 'src'), 'gs://bucket/object')
+            assert server.request_counts['compose'] == 1
+            report = await sync(str(tmp_path / 'src'), 'gs://bucket/object')
+            assert report._transfer_report._source_report._skipped_files == 1
+
+            monkeypatch.setattr(aiotools_fs, 'google_crc32c', None)
+            caplog.clear()
+            report = await sync(str(tmp_path / 'src'), 'gs://bucket/object')
+            assert report._transfer_report._source_report._skipped_files == 0
+            assert 'install google-crc32c' in caplog.text
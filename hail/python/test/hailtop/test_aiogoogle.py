@@ -8,6 +8,7 @@ import pytest
 import concurrent
 from hailtop.utils import secret_alnum_string, bounded_gather2
 from hailtop.aiotools import LocalAsyncFS, RouterAsyncFS
+from hailtop.aiotools.fs import _FdCopier
 from hailtop.aiogoogle import StorageClient, GoogleStorageAsyncFS
 
 
@@ -96,6 +97,74 @@ async def test_open_from(filesystem):
         assert r == b'cde'
 
 
+@pytest.mark.asyncio
+async def test_open_from_range(filesystem):
+    sema, fs, base = filesystem
+
+    file = f'{base}foo'
+
+    async with await fs.create(file) as f:
+        await f.write(b'abcde')
+
+    async with await fs.open_from(file, 1, 3) as f:
+        assert await f.read() == b'bc'
+
+    async with await fs.open_from(file, 3, 5) as f:
+        buffer = bytearray(4)
+        assert await f.readinto(buffer) == 2
+        assert buffer[:2] == b'de'
+
+
+@pytest.mark.asyncio
+async def test_readinto(filesystem):
+    sema, fs, base = filesystem
+
+    file = f'{base}foo'
+
+    async with await fs.create(file) as f:
+        await f.write(b'abcde')
+
+    buffer = bytearray(3)
+    async with await fs.open(file) as f:
+        assert await f.readinto(buffer) == 3
+        assert buffer == b'abc'
+        assert await f.readinto(memoryview(buffer)[1:]) == 2
+        assert buffer == b'ade'
+        assert await f.readinto(buffer) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('methods', [None, ['_sendfile', '_readinto'], ['_readinto']])
+async def test_local_copy_file(local_filesystem, monkeypatch, methods):
+    sema, fs, base = local_filesystem
+
+    if methods is not None:
+        # disable reflinks and the faster copies to test the fallbacks
+        monkeypatch.setattr('hailtop.aiotools.fs._reflink', lambda src_fd, dest_fd: False)
+        init = _FdCopier.__init__
+
+        def restricted_init(self, src_fd, dest_fd):
+            init(self, src_fd, dest_fd)
+            self._methods = [getattr(self, m) for m in methods]
+
+        monkeypatch.setattr(_FdCopier, '__init__', restricted_init)
+    monkeypatch.setattr(LocalAsyncFS, 'COPY_CHUNK_SIZE', 300_000)
+
+    data = secrets.token_bytes(1_000_000)
+    async with await fs.create(f'{base}src') as f:
+        await f.write(data)
+
+    progress = []
+
+    async def record(n):
+        progress.append(n)
+
+    await fs.copy_file(f'{base}src', f'{base}dest', progress=record)
+    async with await fs.open(f'{base}dest') as f:
+        assert await f.read() == data
+    assert sum(progress) == len(data)
+
+
 @pytest.mark.asyncio
 async def test_isfile(filesystem):
     sema, fs, base = filesystem
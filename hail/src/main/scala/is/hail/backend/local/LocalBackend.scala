@@ -165,6 +165,22 @@ class LocalBackend(
     }
   }
 
+  def executeEncode(ir: IR, bufferSpecString: String): (String, Array[Byte], String) = {
+    val ((eTypeString, bytes), timer) = ExecutionTimer.time("LocalBackend.executeEncode") { timer =>
+      val bs = BufferSpec.parseOrDefault(bufferSpecString)
+      withExecuteContext(timer) { ctx =>
+        _execute(ctx, ir) match {
+          case (None, _) => throw new RuntimeException("expression returned void")
+          case (Some(PTypeReferenceSingleCodeType(pt: PTuple)), a) =>
+            val eType = EType.defaultFromPType(pt)
+            val codec = TypedCodecSpec(eType, pt.virtualType, bs)
+            (eType.parsableString(), codec.encode(ctx, pt, a))
+        }
+      }
+    }
+    (eTypeString, bytes, Serialization.write(timer.toMap)(new DefaultFormats {}))
+  }
+
   def encodeToBytes(ir: IR, bufferSpecString: String): (String, Array[Byte]) = {
     ExecutionTimer.logTime("LocalBackend.encodeToBytes") { timer =>
       val bs = BufferSpec.parseOrDefault(bufferSpecString)
@@ -406,6 +406,23 @@ class SparkBackend(
     Serialization.write(Map("value" -> jsonValue, "timings" -> timer.toMap))(new DefaultFormats {})
   }
 
+  // Called from python
+  def executeEncode(ir: IR, bufferSpecString: String): (String, Array[Byte], String) = {
+    val ((eTypeString, bytes), timer) = ExecutionTimer.time("SparkBackend.executeEncode") { timer =>
+      val bs = BufferSpec.parseOrDefault(bufferSpecString)
+      withExecuteContext(timer) { ctx =>
+        _execute(ctx, ir, true) match {
+          case Left(_) => throw new RuntimeException("expression returned void")
+          case Right((t, off)) =>
+            val eType = EType.defaultFromPType(t)
+            val codec = TypedCodecSpec(eType, t.virtualType, bs)
+            (eType.parsableString(), codec.encode(ctx, t, off))
+        }
+      }
+    }
+    (eTypeString, bytes, Serialization.write(timer.toMap)(new DefaultFormats {}))
+  }
+
   // Called from python
   def encodeToBytes(ir: IR, bufferSpecString: String): (String, Array[Byte]) = {
     ExecutionTimer.logTime("SparkBackend.encodeToBytes") { timer =>
@@ -1,6 +1,8 @@
 package is.hail.utils
 
-import java.io.{InputStream, OutputStream}
+import java.io.{BufferedInputStream, BufferedOutputStream, DataInputStream, DataOutputStream, IOException, InputStream, OutputStream}
+import java.net.Socket
+import java.nio.charset.StandardCharsets
 
 import is.hail.HailContext
 import is.hail.expr.JSONAnnotationImpex
@@ -110,6 +112,18 @@ trait Py4jUtils {
     new HadoopPyWriter(fs.create(path))
   }
 
+  // Stream `path` to Python over a loopback socket in chunks of up to
+  // `chunkSize` bytes, see HadoopSocketTransfer. The file is opened before
+  // returning so errors opening it are raised to the caller.
+  def readFileToSocket(fs: FS, path: String, port: Int, token: String, chunkSize: Int): Unit =
+    HadoopSocketTransfer.serveRead(fs.open(path), s"reader for $path", port, token, chunkSize)
+
+  def writeFileFromSocket(fs: FS, path: String, exclusive: Boolean, port: Int, token: String): Unit = {
+    if (exclusive && fs.exists(path))
+      fatal(s"a file already exists at '$path'")
+    HadoopSocketTransfer.serveWrite(fs.create(path), s"writer for $path", port, token)
+  }
+
   def addSocketAppender(hostname: String, port: Int) {
     val app = new StringSocketAppender(hostname, port, HailContext.logFormat)
     consoleLog.addAppender(app)
@@ -133,6 +147,153 @@ trait Py4jUtils {
   }
 }
 
+// Bulk transfer of file contents between the JVM and Python over a loopback
+// socket, instead of marshalling byte arrays through Py4J call by call.
+//
+// Python listens on a loopback port and the JVM connects from a daemon
+// thread, first sending the token Python passed to it. The stream is then a
+// sequence of frames, each starting with a big-endian int:
+//   n > 0: n bytes of data follow
+//   EOF: end of data
+//   FLUSH: (Python to JVM) flush the output stream
+//   ERROR: a length-prefixed UTF-8 error message follows
+// After FLUSH or EOF from Python, the JVM replies with EOF on success or with
+// ERROR.
+object HadoopSocketTransfer {
+  val EOF: Int = 0
+  val ERROR: Int = -1
+  val FLUSH: Int = -2
+
+  private def connect(port: Int, token: String): Socket = {
+    val socket = new Socket("127.0.0.1", port)
+    val out = socket.getOutputStream
+    out.write(token.getBytes(StandardCharsets.US_ASCII))
+    out.flush()
+    socket
+  }
+
+  private def writeError(out: DataOutputStream, e: Throwable) {
+    val msg = Option(e.getMessage).getOrElse(e.getClass.getName).getBytes(StandardCharsets.UTF_8)
+    out.writeInt(ERROR)
+    out.writeInt(msg.length)
+    out.write(msg)
+  }
+
+  private def startDaemon(name: String)(body: => Unit) {
+    val t = new Thread(name) {
+      override def run() {
+        body
+      }
+    }
+    t.setDaemon(true)
+    t.start()
+  }
+
+  def serveRead(in: InputStream, name: String, port: Int, token: String, chunkSize: Int): Unit =
+    startDaemon(name) {
+      try {
+        val socket = connect(port, token)
+        try {
+          val out = new DataOutputStream(new BufferedOutputStream(socket.getOutputStream, chunkSize + 4))
+          val buf = new Array[Byte](chunkSize)
+          try {
+            var n = in.read(buf)
+            while (n >= 0) {
+              if (n > 0) {
+                out.writeInt(n)
+                out.write(buf, 0, n)
+              }
+              n = in.read(buf)
+            }
+            out.writeInt(EOF)
+          } catch {
+            case e: Exception =>
+              writeError(out, e)
+          }
+          out.flush()
+        } finally {
+          socket.close()
+        }
+      } catch {
+        case e: IOException =>
+          // Python closed the file before reading all of it
+          log.info(s"$name: ${ e.getMessage }")
+      } finally {
+        in.close()
+      }
+    }
+
+  def serveWrite(os: OutputStream, name: String, port: Int, token: String): Unit =
+    startDaemon(name) {
+      // set once os.close() has been called, even if it failed
+      var osClosed = false
+      try {
+        val socket = connect(port, token)
+        try {
+          val in = new DataInputStream(new BufferedInputStream(socket.getInputStream))
+          val out = new DataOutputStream(socket.getOutputStream)
+          val buf = new Array[Byte](1 << 16)
+          // after a write fails, data is discarded until Python asks for a
+          // status, which reports the failure
+          var failure: Throwable = null
+          var eof = false
+          while (!eof) {
+            val n = in.readInt()
+            if (n > 0) {
+              var remaining = n
+              while (remaining > 0) {
+                val k = math.min(remaining, buf.length)
+                in.readFully(buf, 0, k)
+                if (failure == null) {
+                  try {
+                    os.write(buf, 0, k)
+                  } catch {
+                    case e: Exception => failure = e
+                  }
+                }
+                remaining -= k
+              }
+            } else {
+              if (n == EOF) {
+                eof = true
+                osClosed = true
+                try {
+                  os.close()
+                } catch {
+                  // an earlier write failure is the one reported
+                  case e: Exception => if (failure == null) failure = e
+                }
+              } else if (failure == null) {
+                try {
+                  os.flush()
+                } catch {
+                  case e: Exception => failure = e
+                }
+              }
+              if (failure == null)
+                out.writeInt(EOF)
+              else
+                writeError(out, failure)
+              out.flush()
+            }
+          }
+        } finally {
+          socket.close()
+        }
+      } catch {
+        case e: IOException =>
+          log.info(s"$name: ${ e.getMessage }")
+      } finally {
+        if (!osClosed)
+          try {
+            os.close()
+          } catch {
+            case _: Exception =>
+          }
+      }
+    }
+}
+
 class HadoopPyReader(in: InputStream, buffSize: Int) {
   var eof = false
 